@@ -0,0 +1,46 @@
+"""Track when feed items were first seen.
+
+Revision ID: 0002_feed_item_first_seen
+Revises: 0001_initial_schema
+Create Date: 2026-10-17 00:00:00.000000
+"""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0002_feed_item_first_seen"
+down_revision = "0001_initial_schema"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "feed_items",
+        sa.Column("first_seen_at", sa.DateTime(timezone=True), nullable=True),
+    )
+    # Existing rows are history, not new arrivals: date them by publication,
+    # or the epoch when unknown, so "seen since" windows do not pick them up.
+    op.execute(
+        "UPDATE feed_items SET first_seen_at ="
+        " COALESCE(published_at, TIMESTAMP WITH TIME ZONE '1970-01-01 00:00:00+00')"
+    )
+    op.alter_column(
+        "feed_items",
+        "first_seen_at",
+        nullable=False,
+        server_default=sa.text("now()"),
+    )
+    op.create_index(
+        "ix_feed_items_source_seen",
+        "feed_items",
+        ["feed_source_id", "first_seen_at"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_feed_items_source_seen", table_name="feed_items")
+    op.drop_column("feed_items", "first_seen_at")
@@ -0,0 +1,29 @@
+"""Adaptive polling schedule for feed sources.
+
+Revision ID: 0003_feed_polling
+Revises: 0002_feed_item_first_seen
+Create Date: 2026-10-17 00:00:00.000000
+"""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0003_feed_polling"
+down_revision = "0002_feed_item_first_seen"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("feed_sources", sa.Column("poll_interval_seconds", sa.Integer()))
+    op.add_column(
+        "feed_sources", sa.Column("next_fetch_after", sa.DateTime(timezone=True))
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("feed_sources", "next_fetch_after")
+    op.drop_column("feed_sources", "poll_interval_seconds")
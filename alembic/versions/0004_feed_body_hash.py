@@ -0,0 +1,25 @@
+"""Remember the digest of the last feed body.
+
+Revision ID: 0004_feed_body_hash
+Revises: 0003_feed_polling
+Create Date: 2026-10-17 00:00:00.000000
+"""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0004_feed_body_hash"
+down_revision = "0003_feed_polling"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("feed_sources", sa.Column("body_sha256", sa.String(length=64)))
+
+
+def downgrade() -> None:
+    op.drop_column("feed_sources", "body_sha256")
@@ -0,0 +1,25 @@
+"""Remember whether a feed lists its newest entries first.
+
+Revision ID: 0005_feed_entry_order
+Revises: 0004_feed_body_hash
+Create Date: 2026-10-17 00:00:00.000000
+"""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0005_feed_entry_order"
+down_revision = "0004_feed_body_hash"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("feed_sources", sa.Column("entries_newest_first", sa.Boolean()))
+
+
+def downgrade() -> None:
+    op.drop_column("feed_sources", "entries_newest_first")
@@ -0,0 +1,48 @@
+"""Store GUID and canonical URL hashes as 32-byte binary digests.
+
+Revision ID: 0006_binary_hash_keys
+Revises: 0005_feed_entry_order
+Create Date: 2026-10-17 00:00:00.000000
+"""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0006_binary_hash_keys"
+down_revision = "0005_feed_entry_order"
+branch_labels = None
+depends_on = None
+
+_COLUMNS = (
+    ("feed_items", "guid_hash"),
+    ("feed_items", "canonical_url_hash"),
+    ("items", "canonical_url_hash"),
+)
+
+
+def upgrade() -> None:
+    # The unique indexes on these columns are rebuilt by the type change.
+    for table, column in _COLUMNS:
+        op.alter_column(
+            table,
+            column,
+            type_=sa.LargeBinary(length=32),
+            existing_type=sa.String(length=128),
+            existing_nullable=False,
+            postgresql_using=f"decode({column}, 'hex')",
+        )
+
+
+def downgrade() -> None:
+    for table, column in _COLUMNS:
+        op.alter_column(
+            table,
+            column,
+            type_=sa.String(length=128),
+            existing_type=sa.LargeBinary(length=32),
+            existing_nullable=False,
+            postgresql_using=f"encode({column}, 'hex')",
+        )
@@ -0,0 +1,47 @@
+"""Share summaries between groups through a content-addressed cache.
+
+Revision ID: 0007_summary_cache
+Revises: 0006_binary_hash_keys
+Create Date: 2026-10-17 00:00:00.000000
+"""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+revision = "0007_summary_cache"
+down_revision = "0006_binary_hash_keys"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "summary_cache",
+        sa.Column(
+            "id",
+            postgresql.UUID(as_uuid=True),
+            primary_key=True,
+            server_default=sa.text("gen_random_uuid()"),
+        ),
+        sa.Column("canonical_url_hash", sa.LargeBinary(length=32), nullable=False),
+        sa.Column("summarizer", sa.String(length=128), nullable=False),
+        sa.Column("prompt_hash", sa.String(length=64), nullable=False, server_default=""),
+        sa.Column("summary_md", sa.Text(), nullable=False),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            nullable=False,
+            server_default=sa.text("now()"),
+        ),
+        sa.UniqueConstraint(
+            "canonical_url_hash", "summarizer", "prompt_hash", name="uq_summary_cache_key"
+        ),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("summary_cache")
@@ -0,0 +1,45 @@
+"""Store extracted article text once per canonical URL.
+
+Revision ID: 0008_article_contents
+Revises: 0007_summary_cache
+Create Date: 2026-10-17 00:00:00.000000
+"""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+revision = "0008_article_contents"
+down_revision = "0007_summary_cache"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "article_contents",
+        sa.Column(
+            "id",
+            postgresql.UUID(as_uuid=True),
+            primary_key=True,
+            server_default=sa.text("gen_random_uuid()"),
+        ),
+        sa.Column("canonical_url_hash", sa.LargeBinary(length=32), nullable=False),
+        sa.Column("text_zlib", sa.LargeBinary(), nullable=False),
+        sa.Column("etag", sa.Text(), nullable=True),
+        sa.Column("last_modified", sa.Text(), nullable=True),
+        sa.Column(
+            "fetched_at",
+            sa.DateTime(timezone=True),
+            nullable=False,
+            server_default=sa.text("now()"),
+        ),
+        sa.UniqueConstraint("canonical_url_hash", name="uq_article_contents_url"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("article_contents")
@@ -0,0 +1,39 @@
+"""Track which evaluations a scheduled run has reported.
+
+Evaluations made in the background stay unreported until the group's next
+scheduled run puts them in a digest. Existing rows count as reported.
+
+Revision ID: 0009_evaluation_reported_at
+Revises: 0008_article_contents
+Create Date: 2026-10-17 00:00:00.000000
+"""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0009_evaluation_reported_at"
+down_revision = "0008_article_contents"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "item_evaluations",
+        sa.Column("reported_at", sa.DateTime(timezone=True), nullable=True),
+    )
+    op.execute("UPDATE item_evaluations SET reported_at = now()")
+    op.create_index(
+        "ix_item_evaluations_unreported",
+        "item_evaluations",
+        ["group_id"],
+        postgresql_where=sa.text("reported_at IS NULL"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_item_evaluations_unreported", table_name="item_evaluations")
+    op.drop_column("item_evaluations", "reported_at")
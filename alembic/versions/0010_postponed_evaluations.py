@@ -0,0 +1,27 @@
+"""Store budget overflow as "postponed" instead of the cascade's "defer".
+
+Rows still marked "defer" were either left over by a budget or written by
+an evaluator that had no later stage; both are re-evaluated by the next run.
+
+Revision ID: 0010_postponed_evaluations
+Revises: 0009_evaluation_reported_at
+Create Date: 2026-10-17 00:00:00.000000
+"""
+
+from __future__ import annotations
+
+from alembic import op
+
+
+revision = "0010_postponed_evaluations"
+down_revision = "0009_evaluation_reported_at"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute("UPDATE item_evaluations SET decision = 'postponed' WHERE decision = 'defer'")
+
+
+def downgrade() -> None:
+    op.execute("UPDATE item_evaluations SET decision = 'defer' WHERE decision = 'postponed'")
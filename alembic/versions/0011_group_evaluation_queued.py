@@ -0,0 +1,31 @@
+"""Remember when a background evaluation of a group was queued.
+
+Fetches that link new items to a group within the same window queue one
+evaluation between them instead of one each.
+
+Revision ID: 0011_group_evaluation_queued
+Revises: 0010_postponed_evaluations
+Create Date: 2026-10-17 00:00:00.000000
+"""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0011_group_evaluation_queued"
+down_revision = "0010_postponed_evaluations"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "groups",
+        sa.Column("evaluation_queued_at", sa.DateTime(timezone=True), nullable=True),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("groups", "evaluation_queued_at")
@@ -0,0 +1,141 @@
+"""Shared helpers for the benchmark scripts.
+
+Benchmarks run against an in-memory SQLite database and local stand-in
+servers so they can be executed without network access:
+
+    PYTHONPATH=src python benchmarks/<script>.py
+"""
+
+from __future__ import annotations
+
+import json
+import threading
+import time
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from rss_digest.db.base import Base
+from rss_digest.repository import Repositories
+
+
+def in_memory_repositories() -> Repositories:
+    engine = create_engine(
+        "sqlite+pysqlite:///:memory:",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+        future=True,
+    )
+    Base.metadata.create_all(engine)
+    session_factory = sessionmaker(bind=engine, expire_on_commit=False, class_=Session)
+    return Repositories.build(session=session_factory())
+
+
+def rss_document(feed_id: str, entries: int) -> bytes:
+    items = "".join(
+        f"<item><guid>{feed_id}-{index}</guid>"
+        f"<link>https://news.example.com/{feed_id}/{index}</link>"
+        f"<pubDate>Mon, 01 Jan 2024 00:{index % 60:02d}:00 GMT</pubDate></item>"
+        for index in range(entries)
+    )
+    return (
+        '<?xml version="1.0"?><rss version="2.0"><channel>'
+        f"<title>{feed_id}</title>{items}</channel></rss>"
+    ).encode("utf-8")
+
+
+Handler = Callable[[BaseHTTPRequestHandler], None]
+
+
+@contextmanager
+def feed_server(
+    delay: Callable[[str], float] = lambda path: 0.0,
+    entries: int = 20,
+    handler: Handler | None = None,
+) -> Iterator[str]:
+    """Serve a synthetic RSS document per path; yields the base URL."""
+
+    class _FeedHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        disable_nagle_algorithm = True
+
+        def do_GET(self) -> None:  # noqa: N802 - http.server API
+            if handler is not None:
+                handler(self)
+                return
+            time.sleep(delay(self.path))
+            body = rss_document(self.path.strip("/").replace("/", "-"), entries)
+            self.send_response(200)
+            self.send_header("Content-Type", "application/rss+xml")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format: str, *args) -> None:  # noqa: A002
+            return
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _FeedHandler)
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f"http://127.0.0.1:{server.server_address[1]}"
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+@contextmanager
+def llm_server(
+    base_latency: float = 0.05,
+    per_item_latency: float = 0.002,
+    keyword: str = "important",
+) -> Iterator[str]:
+    """Stand-in for a hosted relevance model; yields the endpoint URL.
+
+    ``POST`` a JSON body ``{"urls": [...]}`` and the server answers after
+    ``base_latency + per_item_latency * len(urls)`` seconds with one
+    ``{"score", "decision", "reason"}`` object per URL, including URLs that
+    contain ``keyword``.
+    """
+
+    class _LlmHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        disable_nagle_algorithm = True
+
+        def do_POST(self) -> None:  # noqa: N802 - http.server API
+            length = int(self.headers.get("Content-Length", "0"))
+            urls = json.loads(self.rfile.read(length))["urls"]
+            time.sleep(base_latency + per_item_latency * len(urls))
+            body = json.dumps(
+                {
+                    "results": [
+                        {"score": 0.9, "decision": "include", "reason": "llm"}
+                        if keyword in url
+                        else {"score": 0.1, "decision": "exclude", "reason": "llm"}
+                        for url in urls
+                    ]
+                }
+            ).encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format: str, *args) -> None:  # noqa: A002
+            return
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _LlmHandler)
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f"http://127.0.0.1:{server.server_address[1]}/evaluate"
+    finally:
+        server.shutdown()
+        server.server_close()
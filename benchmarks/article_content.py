@@ -0,0 +1,90 @@
+"""Cold, warm and revalidating article prefetch against a local site.
+
+Each of the 100 article pages is ~60 KB of HTML, served after 50 ms with an
+ETag. Cold runs download and extract every page, serially and with 8
+concurrent requests. A second group then prefetches the same items (cache
+hits), and after the entries expire a third run revalidates them with
+conditional GETs.
+"""
+
+from __future__ import annotations
+
+import time
+from datetime import timedelta
+from http.server import BaseHTTPRequestHandler
+
+from _support import feed_server, in_memory_repositories
+
+from rss_digest.db.models import Item
+from rss_digest.dedup import canonicalize
+from rss_digest.services.content.service import ArticleContentConfig, ArticleContentService
+from rss_digest.services.rss.http_pool import HttpPoolConfig, configure_pool
+from rss_digest.services.rss.politeness import PolitenessConfig, configure_host_scheduler
+
+ARTICLES = 100
+LATENCY = 0.05
+PARAGRAPH = "<p>" + "Lorem ipsum dolor sit amet, consectetur adipiscing elit. " * 8 + "</p>"
+PAGE = (
+    "<html><head><script>" + "var x = 1;" * 2000 + "</script></head><body>"
+    "<nav>" + "<a href='/'>Section</a>" * 200 + "</nav>"
+    "<article><h1>Headline of the benchmark article</h1>" + PARAGRAPH * 40 + "</article>"
+    "<footer>Copyright Example News, all rights reserved</footer></body></html>"
+).encode("utf-8")
+
+
+def _serve(request: BaseHTTPRequestHandler) -> None:
+    time.sleep(LATENCY)
+    etag = f'"{request.path}"'
+    if request.headers.get("If-None-Match") == etag:
+        request.send_response(304)
+        request.send_header("ETag", etag)
+        request.send_header("Content-Length", "0")
+        request.end_headers()
+        return
+    request.send_response(200)
+    request.send_header("Content-Type", "text/html; charset=utf-8")
+    request.send_header("Content-Length", str(len(PAGE)))
+    request.send_header("ETag", etag)
+    request.end_headers()
+    request.wfile.write(PAGE)
+
+
+def _timed(service: ArticleContentService, items: list[Item]) -> float:
+    started = time.perf_counter()
+    service.prefetch(items)
+    return time.perf_counter() - started
+
+
+def main() -> None:
+    pool = configure_pool(HttpPoolConfig(max_connections=64, max_keepalive_connections=64))
+    configure_host_scheduler(PolitenessConfig(rate=1000.0, burst=1000))
+    with feed_server(handler=_serve) as base_url:
+        print(f"{'run':>22} {'wall_s':>8} {'hit_rate':>9}")
+        for concurrency in (1, 8):
+            repos = in_memory_repositories()
+            items = []
+            for index in range(ARTICLES):
+                url, url_hash = canonicalize(f"{base_url}/article/{index}")
+                items.append(repos.items.add(Item(canonical_url=url, canonical_url_hash=url_hash)))
+
+            def service(max_age: timedelta = timedelta(days=1)) -> ArticleContentService:
+                return ArticleContentService(
+                    repos.article_contents,
+                    config=ArticleContentConfig(max_concurrency=concurrency, max_age=max_age),
+                    loop_runner=pool.run,
+                )
+
+            for name, run in (
+                (f"cold c={concurrency}", service()),
+                (f"warm c={concurrency}", service()),
+                (f"revalidate c={concurrency}", service(max_age=timedelta(0))),
+            ):
+                elapsed = _timed(run, items)
+                print(f"{name:>22} {elapsed:>8.2f} {run.stats.hit_rate:>9.2f}")
+        stored = repos.article_contents.get_many(item.canonical_url_hash for item in items)
+        stored_bytes = sum(len(entry.text_zlib) for entry in stored.values())
+        print(f"html_bytes={len(PAGE) * ARTICLES} stored_bytes={stored_bytes}")
+
+
+if __name__ == "__main__":
+    main()
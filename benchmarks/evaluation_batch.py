@@ -0,0 +1,90 @@
+"""Batch size vs. wall time of ``EvaluationService.evaluate_since``.
+
+The evaluator posts to a local stub of an LLM endpoint whose latency is a
+fixed per-request cost plus a small per-item cost, so batching amortizes
+the round trip the way a hosted model would.
+"""
+
+from __future__ import annotations
+
+import time
+from collections.abc import Sequence
+from datetime import datetime, timezone
+
+import httpx
+from _support import in_memory_repositories, llm_server
+
+from rss_digest.db.models import FeedItem, FeedSource, Group, User
+from rss_digest.services.evaluation.relevance import EvaluationResult, RelevanceEvaluator
+from rss_digest.services.evaluation.service import EvaluationService
+from rss_digest.services.evaluation.summarizer import SimpleSummarizer
+from rss_digest.services.materialize.service import MaterializeService
+
+ITEMS = 200
+BATCH_SIZES = (1, 5, 20, 50)
+SINCE = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+class HttpBatchEvaluator(RelevanceEvaluator):
+    def __init__(self, client: httpx.Client, endpoint: str) -> None:
+        self._client = client
+        self._endpoint = endpoint
+        self.requests = 0
+
+    def evaluate(self, url: str) -> EvaluationResult:
+        return self.evaluate_batch([url])[0]
+
+    def evaluate_batch(self, urls: Sequence[str]) -> list[EvaluationResult]:
+        self.requests += 1
+        response = self._client.post(self._endpoint, json={"urls": list(urls)})
+        response.raise_for_status()
+        return [EvaluationResult(**result) for result in response.json()["results"]]
+
+
+def _run(endpoint: str, batch_size: int) -> tuple[float, int]:
+    repos = in_memory_repositories()
+    user = repos.users.add(User(email="bench@example.com", timezone="UTC"))
+    group = repos.groups.add(Group(user_id=user.id, name="bench"))
+    source = repos.feed_sources.add(FeedSource(url="https://news.example.com/rss"))
+    MaterializeService(repos.items, repos.group_items).materialize(
+        group.id,
+        [
+            FeedItem(
+                feed_source_id=source.id,
+                guid_hash=b"",
+                url=f"https://news.example.com/{'important-' if index % 10 == 0 else ''}{index}",
+                canonical_url_hash=b"",
+            )
+            for index in range(ITEMS)
+        ],
+    )
+    with httpx.Client() as client:
+        evaluator = HttpBatchEvaluator(client, endpoint)
+        service = EvaluationService(
+            repos.items,
+            repos.group_items,
+            repos.evaluations,
+            repos.summaries,
+            evaluator,
+            SimpleSummarizer(),
+            batch_size=batch_size,
+        )
+        started = time.perf_counter()
+        result = service.evaluate_since(group.id, SINCE)
+        elapsed = time.perf_counter() - started
+    assert len(result.evaluations) == ITEMS
+    return elapsed, evaluator.requests
+
+
+def main() -> None:
+    with llm_server() as endpoint:
+        print(f"{'batch':>6} {'requests':>9} {'wall_s':>8} {'ms_per_item':>12}")
+        for batch_size in BATCH_SIZES:
+            elapsed, requests = _run(endpoint, batch_size)
+            print(
+                f"{batch_size:>6} {requests:>9} {elapsed:>8.2f} {elapsed / ITEMS * 1000:>12.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""Unbounded vs. budgeted evaluation of a 2,000 item backlog.
+
+Simulates a group whose feeds dump a large backlog after an outage. The
+judge is the local LLM stub from ``_support``; the budgeted run takes the
+best 200 candidates by a keyword pre-score and postpones the rest.
+"""
+
+from __future__ import annotations
+
+import time
+from datetime import datetime, timezone
+
+import httpx
+from _support import in_memory_repositories, llm_server
+from evaluation_batch import HttpBatchEvaluator
+
+from rss_digest.db.models import FeedItem, FeedSource, Group, User
+from rss_digest.services.evaluation.budget import EvaluationBudget
+from rss_digest.services.evaluation.relevance import KeywordRelevanceEvaluator
+from rss_digest.services.evaluation.service import EvaluationService
+from rss_digest.services.evaluation.summarizer import SimpleSummarizer
+from rss_digest.services.materialize.service import MaterializeService
+
+ITEMS = 2000
+SINCE = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+def _run(endpoint: str, budget: EvaluationBudget | None) -> None:
+    repos = in_memory_repositories()
+    user = repos.users.add(User(email="bench@example.com", timezone="UTC"))
+    group = repos.groups.add(Group(user_id=user.id, name="bench"))
+    source = repos.feed_sources.add(FeedSource(url="https://news.example.com/rss"))
+    MaterializeService(repos.items, repos.group_items).materialize(
+        group.id,
+        [
+            FeedItem(
+                feed_source_id=source.id,
+                guid_hash=b"",
+                url=f"https://news.example.com/{'important-' if index % 20 == 0 else ''}{index}",
+                canonical_url_hash=b"",
+            )
+            for index in range(ITEMS)
+        ],
+    )
+    with httpx.Client() as client:
+        judge = HttpBatchEvaluator(client, endpoint)
+        service = EvaluationService(
+            repos.items,
+            repos.group_items,
+            repos.evaluations,
+            repos.summaries,
+            judge,
+            SimpleSummarizer(),
+            budget=budget,
+            prescorer=KeywordRelevanceEvaluator(include_keywords=["important"]),
+        )
+        started = time.perf_counter()
+        result = service.evaluate_since(group.id, SINCE)
+        elapsed = time.perf_counter() - started
+    usage = result.budget
+    included = sum(evaluation.decision == "include" for evaluation in result.evaluations)
+    mode = "budgeted" if budget else "unbounded"
+    print(
+        f"{mode:>10} {judge.requests:>15} {usage.items:>9} {included:>9}"
+        f" {usage.overflow:>9} {elapsed:>8.2f}"
+    )
+
+
+def main() -> None:
+    with llm_server() as endpoint:
+        print(
+            f"{'mode':>10} {'judge_requests':>15} {'evaluated':>9} {'included':>9}"
+            f" {'overflow':>9} {'wall_s':>8}"
+        )
+        _run(endpoint, None)
+        _run(endpoint, EvaluationBudget(max_items=200))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""Database cost of ``EvaluationService.evaluate_since`` with 5k candidates.
+
+The evaluator and summarizer are trivial local ones, so the timing is
+dominated by loading candidates and persisting evaluations and summaries.
+Every tenth item is included and summarized.
+"""
+
+from __future__ import annotations
+
+import time
+from datetime import datetime, timezone
+
+from _support import in_memory_repositories
+
+from rss_digest.db.models import FeedItem, FeedSource, Group, User
+from rss_digest.services.evaluation.relevance import KeywordRelevanceEvaluator
+from rss_digest.services.evaluation.service import EvaluationService
+from rss_digest.services.evaluation.summarizer import SimpleSummarizer
+from rss_digest.services.materialize.service import MaterializeService
+
+CANDIDATES = 5000
+SINCE = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+def main() -> None:
+    repos = in_memory_repositories()
+    user = repos.users.add(User(email="bench@example.com", timezone="UTC"))
+    group = repos.groups.add(Group(user_id=user.id, name="bench"))
+    source = repos.feed_sources.add(FeedSource(url="https://news.example.com/rss"))
+    MaterializeService(repos.items, repos.group_items).materialize(
+        group.id,
+        [
+            FeedItem(
+                feed_source_id=source.id,
+                guid_hash=b"",
+                url=f"https://news.example.com/{'important-' if index % 10 == 0 else ''}{index}",
+                canonical_url_hash=b"",
+            )
+            for index in range(CANDIDATES)
+        ],
+    )
+    service = EvaluationService(
+        repos.items,
+        repos.group_items,
+        repos.evaluations,
+        repos.summaries,
+        KeywordRelevanceEvaluator(include_keywords=["important"]),
+        SimpleSummarizer(),
+    )
+    started = time.perf_counter()
+    result = service.evaluate_since(group.id, SINCE)
+    first = time.perf_counter() - started
+    started = time.perf_counter()
+    service.evaluate_since(group.id, SINCE)
+    again = time.perf_counter() - started
+    assert len(result.evaluations) == CANDIDATES
+    assert len(result.summaries) == CANDIDATES // 10
+    print(f"candidates={CANDIDATES} evaluate_s={first:.3f} nothing_new_s={again:.3f}")
+
+
+if __name__ == "__main__":
+    main()
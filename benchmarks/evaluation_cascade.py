@@ -0,0 +1,88 @@
+"""Judge-only evaluation vs. a keyword stage in front of the judge.
+
+The judge is the local LLM stub from ``_support``. A third of the URLs are
+listing pages (obvious junk), a tenth contain the include keyword and the
+rest are ambiguous. The cascade decides the first two groups locally and
+only sends the ambiguous ones to the judge.
+"""
+
+from __future__ import annotations
+
+import time
+from datetime import datetime, timezone
+
+import httpx
+from _support import in_memory_repositories, llm_server
+from evaluation_batch import HttpBatchEvaluator
+
+from rss_digest.db.models import FeedItem, FeedSource, Group, User
+from rss_digest.services.evaluation.cascade import CascadeEvaluator, CascadeStage
+from rss_digest.services.evaluation.relevance import KeywordRelevanceEvaluator
+from rss_digest.services.evaluation.service import EvaluationService
+from rss_digest.services.evaluation.summarizer import SimpleSummarizer
+from rss_digest.services.materialize.service import MaterializeService
+
+ITEMS = 300
+SINCE = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+def _url(index: int) -> str:
+    if index % 3 == 0:
+        return f"https://news.example.com/tag/page-{index}"
+    if index % 10 == 1:
+        return f"https://news.example.com/important-{index}"
+    return f"https://news.example.com/story-{index}"
+
+
+def _run(endpoint: str, cascade: bool) -> tuple[float, int, int, str]:
+    repos = in_memory_repositories()
+    user = repos.users.add(User(email="bench@example.com", timezone="UTC"))
+    group = repos.groups.add(Group(user_id=user.id, name="bench"))
+    source = repos.feed_sources.add(FeedSource(url="https://news.example.com/rss"))
+    MaterializeService(repos.items, repos.group_items).materialize(
+        group.id,
+        [
+            FeedItem(feed_source_id=source.id, guid_hash=b"", url=_url(index), canonical_url_hash=b"")
+            for index in range(ITEMS)
+        ],
+    )
+    with httpx.Client() as client:
+        judge = HttpBatchEvaluator(client, endpoint)
+        evaluator = judge
+        if cascade:
+            keyword = KeywordRelevanceEvaluator(
+                include_keywords=["important"], exclude_keywords=["/tag/"], defer_unmatched=True
+            )
+            evaluator = CascadeEvaluator(
+                [CascadeStage("keyword", keyword), CascadeStage("judge", judge)]
+            )
+        service = EvaluationService(
+            repos.items,
+            repos.group_items,
+            repos.evaluations,
+            repos.summaries,
+            evaluator,
+            SimpleSummarizer(),
+        )
+        started = time.perf_counter()
+        result = service.evaluate_since(group.id, SINCE)
+        elapsed = time.perf_counter() - started
+    assert len(result.evaluations) == ITEMS
+    if not cascade:
+        return elapsed, judge.requests, ITEMS, ""
+    hit_rates = " ".join(f"{name}={stats.hit_rate:.2f}" for name, stats in evaluator.stats.items())
+    return elapsed, judge.requests, evaluator.stats["judge"].seen, hit_rates
+
+
+def main() -> None:
+    # Per-item cost dominates, as with token-priced hosted models.
+    with llm_server(per_item_latency=0.01) as endpoint:
+        print(f"{'mode':>10} {'judge_requests':>15} {'judge_urls':>11} {'wall_s':>8}  hit_rates")
+        for cascade in (False, True):
+            elapsed, requests, judged, hit_rates = _run(endpoint, cascade)
+            mode = "cascade" if cascade else "judge_only"
+            print(f"{mode:>10} {requests:>15} {judged:>11} {elapsed:>8.2f}  {hit_rates}")
+
+
+if __name__ == "__main__":
+    main()
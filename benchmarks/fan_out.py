@@ -0,0 +1,71 @@
+"""Per-group materialization vs. fan-out for a feed shared by many groups.
+
+For each subscriber count, materializes the same batch of new feed items
+once per group (what each ``GroupPipeline.run`` did) and, on a fresh
+database, once through ``MaterializeService.fan_out``. The canonical URL
+cache is cleared before each timing.
+"""
+
+from __future__ import annotations
+
+import time
+
+from _support import in_memory_repositories
+
+from rss_digest.db.models import FeedItem, FeedSource, Group, GroupFeed, User
+from rss_digest.dedup import canonicalize
+from rss_digest.services.materialize.service import MaterializeService
+
+ITEMS = 1000
+SUBSCRIBERS = (1, 10, 50)
+
+
+def _setup(subscribers: int):
+    repos = in_memory_repositories()
+    user = repos.users.add(User(email="bench@example.com", timezone="UTC"))
+    source = repos.feed_sources.add(FeedSource(url="https://news.example.com/rss"))
+    groups = []
+    for index in range(subscribers):
+        group = repos.groups.add(Group(user_id=user.id, name=f"group-{index}"))
+        repos.group_feeds.add(GroupFeed(group_id=group.id, feed_source_id=source.id))
+        groups.append(group)
+    feed_items = [
+        FeedItem(
+            feed_source_id=source.id,
+            guid_hash=b"",
+            url=f"https://news.example.com/story/{index}?utm_source=rss",
+            canonical_url_hash=b"",
+        )
+        for index in range(ITEMS)
+    ]
+    service = MaterializeService(repos.items, repos.group_items, group_feeds=repos.group_feeds)
+    return repos, groups, feed_items, service
+
+
+def _per_group(subscribers: int) -> float:
+    _, groups, feed_items, service = _setup(subscribers)
+    canonicalize.cache_clear()
+    started = time.perf_counter()
+    for group in groups:
+        service.materialize(group.id, feed_items)
+    return time.perf_counter() - started
+
+
+def _fan_out(subscribers: int) -> float:
+    repos, _, feed_items, service = _setup(subscribers)
+    canonicalize.cache_clear()
+    started = time.perf_counter()
+    service.fan_out(feed_items)
+    elapsed = time.perf_counter() - started
+    assert len(repos.group_items.list_all()) == ITEMS * subscribers
+    return elapsed
+
+
+def main() -> None:
+    print(f"{'groups':>7} {'per_group_s':>12} {'fan_out_s':>10}")
+    for subscribers in SUBSCRIBERS:
+        print(f"{subscribers:>7} {_per_group(subscribers):>12.3f} {_fan_out(subscribers):>10.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""CPU time and peak memory: feedparser vs. the lite streaming parser.
+
+Peak memory is measured with tracemalloc and covers parsing plus the
+resulting ``FeedEntry`` list, starting from the raw response bytes.
+"""
+
+from __future__ import annotations
+
+import time
+import tracemalloc
+from collections.abc import Callable
+
+import feedparser
+
+from rss_digest.services.rss.http_client import _to_entry
+from rss_digest.services.rss.lite_parser import parse_lite
+
+SIZES = (100, 1000, 5000)
+DESCRIPTION = "Lorem ipsum dolor sit amet, <b>consectetur</b> adipiscing elit. " * 25
+
+
+def _rss(entries: int) -> bytes:
+    items = "".join(
+        "<item>"
+        f"<title>Story {index}</title>"
+        f"<guid>https://news.example.com/story/{index}</guid>"
+        f"<link>https://news.example.com/story/{index}?utm_source=rss</link>"
+        f"<pubDate>Mon, 01 Jan 2024 00:{index % 60:02d}:00 GMT</pubDate>"
+        f"<description><![CDATA[{DESCRIPTION}]]></description>"
+        "</item>"
+        for index in range(entries)
+    )
+    return (
+        '<?xml version="1.0" encoding="utf-8"?><rss version="2.0"><channel>'
+        f"<title>Bench</title>{items}</channel></rss>"
+    ).encode("utf-8")
+
+
+def _with_feedparser(body: bytes) -> int:
+    parsed = feedparser.parse(body.decode("utf-8"))
+    return len([_to_entry(entry) for entry in parsed.entries])
+
+
+def _with_lite(body: bytes) -> int:
+    return len(parse_lite(body, max_entries=len(body)).entries)
+
+
+def _measure(parse: Callable[[bytes], int], body: bytes) -> tuple[float, float, int]:
+    tracemalloc.start()
+    started = time.process_time()
+    count = parse(body)
+    cpu = time.process_time() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return cpu, peak / 1024 / 1024, count
+
+
+def main() -> None:
+    print(
+        f"{'entries':>8} {'body_mb':>8} {'fp_cpu_s':>9} {'lite_cpu_s':>10}"
+        f" {'fp_peak_mb':>10} {'lite_peak_mb':>12}"
+    )
+    for size in SIZES:
+        body = _rss(size)
+        fp_cpu, fp_peak, fp_count = _measure(_with_feedparser, body)
+        lite_cpu, lite_peak, lite_count = _measure(_with_lite, body)
+        assert fp_count == lite_count == size
+        print(
+            f"{size:>8} {len(body) / 1024 / 1024:>8.1f} {fp_cpu:>9.2f} {lite_cpu:>10.3f}"
+            f" {fp_peak:>10.1f} {lite_peak:>12.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""Wall time of serial vs. concurrent ``RssFetcher.fetch_group``.
+
+Four local stand-in hosts serve synthetic feeds with 50 ms latency; one feed
+in ten is a "slow host" answer taking 500 ms. Both modes share the process-wide
+connection pool; its opened/reused counters are printed per run.
+"""
+
+from __future__ import annotations
+
+import time
+from contextlib import ExitStack
+
+from _support import feed_server, in_memory_repositories
+
+from rss_digest.db.models import FeedSource
+from rss_digest.services.rss.fetcher import RssFetcher
+from rss_digest.services.rss.http_client import fetch_feed, fetch_feed_async
+from rss_digest.services.rss.http_pool import HttpPoolConfig, configure_pool
+
+HOSTS = 4
+FEED_COUNTS = (10, 50, 200)
+
+
+def _delay(path: str) -> float:
+    return 0.5 if path.endswith("0") else 0.05
+
+
+def _run(base_urls: list[str], feed_count: int, concurrent: bool) -> tuple[float, str]:
+    pool = configure_pool(HttpPoolConfig(max_connections=64, max_keepalive_connections=64))
+    repos = in_memory_repositories()
+    sources = [
+        repos.feed_sources.add(
+            FeedSource(url=f"{base_urls[index % len(base_urls)]}/feed/{index}")
+        )
+        for index in range(feed_count)
+    ]
+    fetcher = RssFetcher(
+        repos.feed_sources,
+        repos.feed_items,
+        fetch_feed,
+        fetch_feed_async if concurrent else None,
+        max_concurrency=64,
+        per_host_limit=16,
+        loop_runner=pool.run,
+    )
+    started = time.perf_counter()
+    fetcher.fetch_group(sources)
+    elapsed = time.perf_counter() - started
+    return elapsed, f"{pool.stats.connections_opened}/{pool.stats.connections_reused}"
+
+
+def main() -> None:
+    with ExitStack() as stack:
+        base_urls = [stack.enter_context(feed_server(_delay)) for _ in range(HOSTS)]
+        print(
+            f"{'feeds':>6} {'serial_s':>10} {'async_s':>10} {'speedup':>8}"
+            f" {'serial_open/reuse':>18} {'async_open/reuse':>17}"
+        )
+        for feed_count in FEED_COUNTS:
+            serial, serial_pool = _run(base_urls, feed_count, concurrent=False)
+            concurrent, async_pool = _run(base_urls, feed_count, concurrent=True)
+            print(
+                f"{feed_count:>6} {serial:>10.2f} {concurrent:>10.2f} "
+                f"{serial / concurrent:>7.1f}x {serial_pool:>18} {async_pool:>17}"
+            )
+
+
+if __name__ == "__main__":
+    main()
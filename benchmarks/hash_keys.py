@@ -0,0 +1,138 @@
+"""Index size and lookup latency: hex-string vs. binary hash keys.
+
+Builds two copies of the ``feed_items`` unique key ``(feed_source_id,
+guid_hash)``, one storing 64-char hex in ``VARCHAR(128)`` and one storing
+32-byte digests, then times ``existing_guids``-style IN lookups (50 hashes,
+half present) against each.
+
+    BENCH_DATABASE_URL=postgresql+psycopg://... BENCH_ROWS=10000000 \\
+        PYTHONPATH=src python benchmarks/hash_keys.py
+
+Without ``BENCH_DATABASE_URL`` it runs on a temporary SQLite file (index
+size from ``dbstat``), where feed source ids are stored as 32-char text.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import random
+import statistics
+import tempfile
+import time
+import uuid
+
+import sqlalchemy as sa
+
+ROWS = int(os.getenv("BENCH_ROWS", "10000000"))
+FEEDS = 5000
+BATCH = 20000
+LOOKUPS = 500
+PER_LOOKUP = 50
+
+metadata = sa.MetaData()
+TABLES = {
+    "hex": sa.Table(
+        "bench_feed_items_hex",
+        metadata,
+        sa.Column("feed_source_id", sa.Uuid(), nullable=False),
+        sa.Column("guid_hash", sa.String(128), nullable=False),
+        sa.UniqueConstraint("feed_source_id", "guid_hash", name="uq_bench_hex"),
+    ),
+    "binary": sa.Table(
+        "bench_feed_items_bin",
+        metadata,
+        sa.Column("feed_source_id", sa.Uuid(), nullable=False),
+        sa.Column("guid_hash", sa.LargeBinary(32), nullable=False),
+        sa.UniqueConstraint("feed_source_id", "guid_hash", name="uq_bench_bin"),
+    ),
+}
+
+
+def _digest(feed_index: int, row: int) -> bytes:
+    return hashlib.sha256(f"{feed_index}:{row}".encode()).digest()
+
+
+def _key(kind: str, digest: bytes) -> str | bytes:
+    return digest.hex() if kind == "hex" else digest
+
+
+def _load(engine: sa.Engine, feeds: list[uuid.UUID]) -> None:
+    for kind, table in TABLES.items():
+        with engine.begin() as connection:
+            for start in range(0, ROWS, BATCH):
+                connection.execute(
+                    table.insert(),
+                    [
+                        {
+                            "feed_source_id": feeds[row % FEEDS],
+                            "guid_hash": _key(kind, _digest(row % FEEDS, row)),
+                        }
+                        for row in range(start, min(start + BATCH, ROWS))
+                    ],
+                )
+        print(f"loaded {kind}")
+
+
+def _index_bytes(connection: sa.Connection, name: str) -> int:
+    if connection.dialect.name == "postgresql":
+        return connection.execute(sa.text(f"SELECT pg_relation_size('{name}')")).scalar()
+    # SQLite names unique-constraint indexes after their table.
+    table = {"uq_bench_hex": "bench_feed_items_hex", "uq_bench_bin": "bench_feed_items_bin"}[name]
+    return connection.execute(
+        sa.text(
+            "SELECT sum(pgsize) FROM dbstat WHERE name LIKE :pattern"
+        ),
+        {"pattern": f"sqlite_autoindex_{table}_%"},
+    ).scalar()
+
+
+def _lookup_latencies(
+    connection: sa.Connection, kind: str, feeds: list[uuid.UUID]
+) -> list[float]:
+    table = TABLES[kind]
+    rng = random.Random(11)
+    timings = []
+    for _ in range(LOOKUPS):
+        feed_index = rng.randrange(FEEDS)
+        present = [
+            _digest(feed_index, feed_index + FEEDS * k)
+            for k in rng.sample(range(ROWS // FEEDS), PER_LOOKUP // 2)
+        ]
+        absent = [_digest(-1, rng.randrange(10**9)) for _ in range(PER_LOOKUP // 2)]
+        keys = [_key(kind, digest) for digest in present + absent]
+        stmt = sa.select(table.c.guid_hash).where(
+            table.c.feed_source_id == feeds[feed_index], table.c.guid_hash.in_(keys)
+        )
+        started = time.perf_counter()
+        found = connection.execute(stmt).all()
+        timings.append(time.perf_counter() - started)
+        assert len(found) == PER_LOOKUP // 2
+    return timings
+
+
+def main() -> None:
+    url = os.getenv("BENCH_DATABASE_URL")
+    if url is None:
+        url = f"sqlite:///{tempfile.mkdtemp()}/hash_keys.db"
+    engine = sa.create_engine(url)
+    metadata.drop_all(engine)
+    metadata.create_all(engine)
+    feeds = [uuid.UUID(int=index + 1) for index in range(FEEDS)]
+    _load(engine, feeds)
+    print(f"{engine.dialect.name}, {ROWS} rows")
+    print(f"{'key':>7} {'index_mb':>9} {'p50_ms':>7} {'p95_ms':>7}")
+    with engine.connect() as connection:
+        if engine.dialect.name == "postgresql":
+            connection.execute(sa.text("ANALYZE"))
+        for kind, index in (("hex", "uq_bench_hex"), ("binary", "uq_bench_bin")):
+            size = _index_bytes(connection, index) / 1024 / 1024
+            timings = sorted(_lookup_latencies(connection, kind, feeds))
+            p50 = statistics.median(timings) * 1000
+            p95 = timings[int(len(timings) * 0.95)] * 1000
+            print(f"{kind:>7} {size:>9.1f} {p50:>7.2f} {p95:>7.2f}")
+    metadata.drop_all(engine)
+
+
+if __name__ == "__main__":
+    main()
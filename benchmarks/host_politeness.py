@@ -0,0 +1,114 @@
+"""Unpaced vs. per-host paced fetching against rate-limited hosts.
+
+Four local stand-in hosts each allow 10 requests per second (burst 5) and
+answer 429 with ``Retry-After: 1`` beyond that. Feeds are skewed: half of
+them live on the first host, like a news site with many category feeds.
+The paced mode stays 10% under the host limit to absorb arrival jitter.
+Each mode runs the concurrent fetcher once over all feeds and reports wall
+time, feeds fetched, 429s served and feeds deferred for a later run.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from contextlib import ExitStack
+from http.server import BaseHTTPRequestHandler
+
+from _support import feed_server, in_memory_repositories, rss_document
+
+from rss_digest.db.models import FeedSource
+from rss_digest.ratelimit import TokenBucket
+from rss_digest.services.rss.fetcher import RssFetcher
+from rss_digest.services.rss.http_client import fetch_feed, fetch_feed_async
+from rss_digest.services.rss.http_pool import HttpPoolConfig, configure_pool
+from rss_digest.services.rss.politeness import PolitenessConfig, configure_host_scheduler
+
+HOSTS = 4
+FEEDS = 120
+HOST_RATE = 10.0
+HOST_BURST = 5
+LATENCY = 0.05
+MODES = {
+    "unpaced": PolitenessConfig(rate=1e9, burst=10**9),
+    "paced": PolitenessConfig(rate=HOST_RATE * 0.9, burst=HOST_BURST, max_wait=30.0),
+}
+
+
+class _RateLimitedHost:
+    def __init__(self) -> None:
+        self.bucket = TokenBucket(HOST_RATE, HOST_BURST)
+        self.lock = threading.Lock()
+        self.rejected = 0
+
+    def __call__(self, request: BaseHTTPRequestHandler) -> None:
+        with self.lock:
+            allowed = self.bucket.reserve(max_wait=0.0) is not None
+            if not allowed:
+                self.rejected += 1
+        if not allowed:
+            request.send_response(429)
+            request.send_header("Retry-After", "1")
+            request.send_header("Content-Length", "0")
+            request.end_headers()
+            return
+        time.sleep(LATENCY)
+        body = rss_document(request.path.strip("/").replace("/", "-"), 20)
+        request.send_response(200)
+        request.send_header("Content-Length", str(len(body)))
+        request.end_headers()
+        request.wfile.write(body)
+
+
+def _feed_urls(base_urls: list[str]) -> list[str]:
+    urls = []
+    for index in range(FEEDS):
+        host = 0 if index % 2 == 0 else 1 + index % (len(base_urls) - 1)
+        urls.append(f"{base_urls[host]}/feed/{index}")
+    return urls
+
+
+def _run(urls: list[str], hosts: list[_RateLimitedHost], config: PolitenessConfig) -> str:
+    time.sleep(1.0)  # let every host's bucket refill between modes
+    for host in hosts:
+        host.rejected = 0
+    pool = configure_pool(HttpPoolConfig(max_connections=64, max_keepalive_connections=64))
+    configure_host_scheduler(config)
+    repos = in_memory_repositories()
+    sources = [repos.feed_sources.add(FeedSource(url=url)) for url in urls]
+    fetcher = RssFetcher(
+        repos.feed_sources,
+        repos.feed_items,
+        fetch_feed,
+        fetch_feed_async,
+        max_concurrency=64,
+        per_host_limit=8,
+        loop_runner=pool.run,
+    )
+    started = time.perf_counter()
+    fetcher.fetch_group(sources)
+    elapsed = time.perf_counter() - started
+    fetched = sum(
+        1
+        for source in sources
+        if repos.feed_sources.get(source.id).body_sha256 is not None
+    )
+    rejected = sum(host.rejected for host in hosts)
+    return (
+        f"{elapsed:>8.2f} {fetched:>8} {rejected:>6} {fetcher.stats.deferred:>9}"
+        f" {fetcher.stats.failures:>9}"
+    )
+
+
+def main() -> None:
+    with ExitStack() as stack:
+        hosts = [_RateLimitedHost() for _ in range(HOSTS)]
+        base_urls = [stack.enter_context(feed_server(handler=host)) for host in hosts]
+        urls = _feed_urls(base_urls)
+        print(f"{'mode':>8} {'wall_s':>8} {'fetched':>8} {'429s':>6} {'deferred':>9} {'failures':>9}")
+        for mode, config in MODES.items():
+            print(f"{mode:>8} {_run(urls, hosts, config)}")
+
+
+if __name__ == "__main__":
+    main()
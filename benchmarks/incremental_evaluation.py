@@ -0,0 +1,80 @@
+"""Scheduled-run evaluation time with and without background evaluation.
+
+200 new items reach a group before its scheduled run. The relevance judge
+is the local LLM stub from ``_support``. Synchronously, the run evaluates
+all of them; incrementally, a background pass already did while the items
+arrived (in four waves), and the run only collects the finished rows plus
+the one wave that arrived just before it.
+"""
+
+from __future__ import annotations
+
+import time
+from datetime import datetime, timedelta, timezone
+
+import httpx
+from _support import in_memory_repositories, llm_server
+from evaluation_batch import HttpBatchEvaluator
+
+from rss_digest.db.models import FeedItem, FeedSource, Group, User
+from rss_digest.services.evaluation.service import EvaluationService
+from rss_digest.services.evaluation.summarizer import SimpleSummarizer
+from rss_digest.services.materialize.service import MaterializeService
+
+ITEMS = 200
+WAVES = 5
+
+
+def _run(endpoint: str, incremental: bool) -> tuple[float, float, int]:
+    repos = in_memory_repositories()
+    user = repos.users.add(User(email="bench@example.com", timezone="UTC"))
+    group = repos.groups.add(Group(user_id=user.id, name="bench"))
+    source = repos.feed_sources.add(FeedSource(url="https://news.example.com/rss"))
+    since = datetime.now(timezone.utc) - timedelta(hours=1)
+    with httpx.Client() as client:
+        service = EvaluationService(
+            repos.items,
+            repos.group_items,
+            repos.evaluations,
+            repos.summaries,
+            HttpBatchEvaluator(client, endpoint),
+            SimpleSummarizer(),
+        )
+        materializer = MaterializeService(repos.items, repos.group_items)
+        background = 0.0
+        per_wave = ITEMS // WAVES
+        for wave in range(WAVES):
+            materializer.materialize(
+                group.id,
+                [
+                    FeedItem(
+                        feed_source_id=source.id,
+                        guid_hash=b"",
+                        url=f"https://news.example.com/{'important-' if i % 10 == 0 else ''}{i}",
+                        canonical_url_hash=b"",
+                    )
+                    for i in range(wave * per_wave, (wave + 1) * per_wave)
+                ],
+            )
+            if incremental and wave < WAVES - 1:
+                started = time.perf_counter()
+                service.evaluate_since(group.id, since)
+                background += time.perf_counter() - started
+        started = time.perf_counter()
+        result = service.collect_since(group.id, since)
+        at_run = time.perf_counter() - started
+    assert len(result.evaluations) == ITEMS
+    return at_run, background, len(result.summaries)
+
+
+def main() -> None:
+    with llm_server() as endpoint:
+        print(f"{'mode':>12} {'run_eval_s':>11} {'background_s':>13} {'summaries':>10}")
+        for incremental in (False, True):
+            at_run, background, summaries = _run(endpoint, incremental)
+            mode = "incremental" if incremental else "sync"
+            print(f"{mode:>12} {at_run:>11.2f} {background:>13.2f} {summaries:>10}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""Keyword relevance at 1k keywords x 100k URLs.
+
+Compares the previous per-keyword ``in`` scan with the Aho-Corasick
+automaton behind ``KeywordRelevanceEvaluator`` and checks that both make
+the same include/exclude decisions.
+"""
+
+from __future__ import annotations
+
+import random
+import time
+
+from rss_digest.services.evaluation.matching import compile_keywords
+from rss_digest.services.evaluation.relevance import KeywordRelevanceEvaluator
+
+KEYWORDS = 1000
+URLS = 100_000
+INCLUDE_SHARE = 0.05
+SEED = 7
+
+
+def _word(rng: random.Random, length: int) -> str:
+    return "".join(rng.choice("abcdefghijklmnopqrstuvwxyz") for _ in range(length))
+
+
+def _data() -> tuple[list[str], list[str]]:
+    rng = random.Random(SEED)
+    keywords = [_word(rng, rng.randint(6, 10)) for _ in range(KEYWORDS)]
+    urls = []
+    for index in range(URLS):
+        slug = "-".join(_word(rng, rng.randint(3, 5)) for _ in range(6))
+        if rng.random() < INCLUDE_SHARE:
+            slug += "-" + rng.choice(keywords)
+        urls.append(f"https://news.example.com/2024/{index}/{slug}")
+    return keywords, urls
+
+
+def _naive_includes(keywords: list[str], urls: list[str]) -> list[bool]:
+    lowered_keywords = [keyword.lower() for keyword in keywords]
+    decisions = []
+    for url in urls:
+        lowered = url.lower()
+        decisions.append(any(keyword in lowered for keyword in lowered_keywords))
+    return decisions
+
+
+def main() -> None:
+    keywords, urls = _data()
+
+    started = time.perf_counter()
+    naive = _naive_includes(keywords, urls)
+    naive_s = time.perf_counter() - started
+
+    started = time.perf_counter()
+    compile_keywords(keywords)
+    compile_s = time.perf_counter() - started
+
+    evaluator = KeywordRelevanceEvaluator(include_keywords=keywords)
+    started = time.perf_counter()
+    results = evaluator.evaluate_batch(urls)
+    automaton_s = time.perf_counter() - started
+
+    assert [result.decision == "include" for result in results] == naive
+    print(f"keywords={KEYWORDS} urls={URLS} included={sum(naive)}")
+    print(f"per-keyword scan: {naive_s:.2f}s")
+    print(f"automaton:        {automaton_s:.2f}s (+{compile_s * 1000:.0f} ms to compile, cached)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""Wall time of ``MaterializeService.materialize`` on SQLite.
+
+Materializes N new feed items into one group, then the same feed items
+into a second group (all items exist, only group items are new), then
+re-runs the first group (nothing new). The first pass starts with a cold
+canonicalization cache; ``new_warm_s`` repeats it on a fresh database
+with the cache warm, as in a worker where the fetcher has already
+canonicalized each new entry.
+"""
+
+from __future__ import annotations
+
+import time
+
+from _support import in_memory_repositories
+
+from rss_digest.dedup import canonicalize
+from rss_digest.db.models import FeedItem, FeedSource, Group, User
+from rss_digest.services.materialize.service import MaterializeService
+
+SIZES = (1000, 10_000)
+
+
+def _run(size: int, warm: bool = False) -> tuple[float, float, float]:
+    if not warm:
+        canonicalize.cache_clear()
+    repos = in_memory_repositories()
+    user = repos.users.add(User(email="bench@example.com", timezone="UTC"))
+    first = repos.groups.add(Group(user_id=user.id, name="first"))
+    second = repos.groups.add(Group(user_id=user.id, name="second"))
+    source = repos.feed_sources.add(FeedSource(url="https://news.example.com/rss"))
+    feed_items = [
+        FeedItem(
+            feed_source_id=source.id,
+            guid_hash=b"",
+            url=f"https://news.example.com/story/{index}?utm_source=rss",
+            canonical_url_hash=b"",
+        )
+        for index in range(size)
+    ]
+    service = MaterializeService(repos.items, repos.group_items)
+    timings = []
+    for group in (first, second, first):
+        started = time.perf_counter()
+        service.materialize(group.id, feed_items)
+        timings.append(time.perf_counter() - started)
+    return timings[0], timings[1], timings[2]
+
+
+def main() -> None:
+    print(
+        f"{'items':>7} {'new_s':>8} {'new_warm_s':>11} {'new_group_s':>12} {'repeat_s':>9}"
+    )
+    for size in SIZES:
+        new, new_group, repeat = _run(size)
+        new_warm = _run(size, warm=True)[0]
+        print(
+            f"{size:>7} {new:>8.3f} {new_warm:>11.3f} {new_group:>12.3f} {repeat:>9.3f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+"""Wall time of the summarization stage vs. concurrency.
+
+Summarizes 60 included items with a stand-in summarizer that takes
+``CALL_SECONDS`` per call (a scaled-down LLM round trip), sequentially and
+with increasing ``max_concurrency``, under a requests-per-minute limit.
+"""
+
+from __future__ import annotations
+
+import time
+
+from rss_digest.services.evaluation.summarizer import Summarizer
+from rss_digest.services.evaluation.summary_runner import SummaryLimits, SummaryRunner
+
+ITEMS = 60
+CALL_SECONDS = 0.3
+REQUESTS_PER_MINUTE = 3000
+CONCURRENCY = (1, 4, 8, 16)
+
+
+class SleepingSummarizer(Summarizer):
+    def summarize(self, url: str) -> str:
+        time.sleep(CALL_SECONDS)
+        return f"Summary for {url}"
+
+
+def main() -> None:
+    urls = [f"https://news.example.com/story/{index}" for index in range(ITEMS)]
+    print(f"{'workers':>8} {'wall_s':>7} {'mean_s':>7} {'p95_le_s':>9}")
+    for workers in CONCURRENCY:
+        runner = SummaryRunner(
+            SleepingSummarizer(),
+            SummaryLimits(max_concurrency=workers, requests_per_minute=REQUESTS_PER_MINUTE),
+        )
+        started = time.perf_counter()
+        runner.summarize_all(urls)
+        elapsed = time.perf_counter() - started
+        latency = runner.stats.latency
+        print(
+            f"{workers:>8} {elapsed:>7.2f} {latency.mean:>7.2f} {latency.percentile(0.95):>9.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""URL canonicalization cost for 100k URLs.
+
+Models one run: every entry URL is hashed when fetched and canonicalized
+again when materialized, with 25k distinct URLs among the 100k (feeds are
+re-read and shared across groups). ``before`` replays the previous call
+pattern: ``canonical_url_hash`` at fetch, then ``normalize_url`` plus
+``canonical_url_hash`` of the result at materialization, nothing cached.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import random
+import time
+
+from rss_digest.dedup import canonicalize, canonicalize_many, normalize_url
+
+TOTAL = 100_000
+DISTINCT = 25_000
+
+
+def _urls() -> list[str]:
+    rng = random.Random(7)
+    distinct = [
+        f"https://News{index % 40}.example.com/section/{index}/story-{index * 7}/"
+        f"?utm_source=rss&utm_medium=feed&id={index}&ref=home#comments"
+        for index in range(DISTINCT)
+    ]
+    return [rng.choice(distinct) for _ in range(TOTAL)]
+
+
+def _uncached_hash(url: str) -> str:
+    return hashlib.sha256(normalize_url(url).encode("utf-8")).hexdigest()
+
+
+def _before(urls: list[str]) -> None:
+    for url in urls:
+        _uncached_hash(url)
+    for url in urls:
+        canonical = normalize_url(url)
+        _uncached_hash(canonical)
+
+
+def _after(urls: list[str]) -> None:
+    for url in urls:
+        canonicalize(url)
+    canonicalize_many(urls)
+
+
+def _time(label: str, run, urls: list[str]) -> float:
+    canonicalize.cache_clear()
+    started = time.perf_counter()
+    run(urls)
+    elapsed = time.perf_counter() - started
+    print(f"{label:>22} {elapsed:>8.3f}s {TOTAL / elapsed / 1000:>8.0f}k urls/s")
+    return elapsed
+
+
+def main() -> None:
+    urls = _urls()
+    before = _time("before (3 parses/url)", _before, urls)
+    after = _time("canonicalize (cached)", _after, urls)
+    print(f"{'speedup':>22} {before / after:>8.1f}x  cache={canonicalize.cache_info()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+"""Bloom filters over stored hash keys."""
+
+from __future__ import annotations
+
+import hashlib
+import math
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+from uuid import UUID
+
+CAPACITY_DEFAULT = 2_000_000
+ERROR_RATE_DEFAULT = 0.01
+# Filters sized from a row count leave room for this many times the rows,
+# and never hold fewer than ``CAPACITY_MIN`` keys.
+HEADROOM_DEFAULT = 2.0
+CAPACITY_MIN = 100_000
+
+
+@dataclass
+class BloomStats:
+    checks: int = 0
+    definite_misses: int = 0
+    false_positives: int = 0
+
+    @property
+    def observed_false_positive_rate(self) -> float:
+        """Share of absent keys the filter reported as possibly present."""
+        absent = self.definite_misses + self.false_positives
+        return self.false_positives / absent if absent else 0.0
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter sized for ``capacity`` keys at ``error_rate``.
+
+    Keys of 16 bytes or more (such as SHA-256 digests) are used as their own
+    hash; shorter keys are hashed with BLAKE2b first. The filter never
+    forgets a key, so it only answers "definitely absent" or "maybe".
+    """
+
+    def __init__(self, capacity: int, error_rate: float = ERROR_RATE_DEFAULT) -> None:
+        if capacity <= 0 or not 0 < error_rate < 1:
+            raise ValueError("capacity must be positive and error_rate in (0, 1)")
+        self._size = math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2)
+        self._hash_count = max(1, round(self._size / capacity * math.log(2)))
+        self._bits = bytearray((self._size + 7) // 8)
+        self.count = 0
+        self.stats = BloomStats()
+
+    @property
+    def memory_bytes(self) -> int:
+        return len(self._bits)
+
+    def expected_false_positive_rate(self) -> float:
+        fill = 1 - math.exp(-self._hash_count * self.count / self._size)
+        return fill**self._hash_count
+
+    def add(self, key: bytes) -> None:
+        for position in self._positions(key):
+            self._bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def add_many(self, keys: Iterable[bytes]) -> None:
+        for key in keys:
+            self.add(key)
+
+    def __contains__(self, key: bytes) -> bool:
+        return all(
+            self._bits[position >> 3] & (1 << (position & 7))
+            for position in self._positions(key)
+        )
+
+    def check(self, key: bytes) -> bool:
+        """Membership test that is counted in ``stats``."""
+        self.stats.checks += 1
+        if key in self:
+            return True
+        self.stats.definite_misses += 1
+        return False
+
+    def record_false_positives(self, count: int = 1) -> None:
+        self.stats.false_positives += count
+
+    def _positions(self, key: bytes) -> list[int]:
+        if len(key) < 16:
+            key = hashlib.blake2b(key, digest_size=16).digest()
+        first = int.from_bytes(key[:8], "little")
+        step = int.from_bytes(key[8:16], "little") | 1
+        return [(first + index * step) % self._size for index in range(self._hash_count)]
+
+
+@dataclass
+class KnownHashes:
+    """Per-process filters over ``items.canonical_url_hash`` and feed item GUIDs.
+
+    GUID keys combine the feed source id with ``guid_hash`` because GUIDs are
+    only unique per feed. Other processes insert rows this filter never sees,
+    so a definite miss must still be written with a conflict-tolerant insert.
+    """
+
+    items: BloomFilter
+    guids: BloomFilter
+    ready: bool = field(default=False)
+
+    @classmethod
+    def with_capacity(
+        cls, capacity: int = CAPACITY_DEFAULT, error_rate: float = ERROR_RATE_DEFAULT
+    ) -> "KnownHashes":
+        return cls(BloomFilter(capacity, error_rate), BloomFilter(capacity, error_rate))
+
+    @classmethod
+    def for_counts(
+        cls,
+        item_count: int,
+        guid_count: int,
+        error_rate: float = ERROR_RATE_DEFAULT,
+        headroom: float = HEADROOM_DEFAULT,
+    ) -> "KnownHashes":
+        """Filters sized for tables of the given row counts plus ``headroom``."""
+        return cls(
+            BloomFilter(capacity_for(item_count, headroom), error_rate),
+            BloomFilter(capacity_for(guid_count, headroom), error_rate),
+        )
+
+    def warm(
+        self,
+        item_hashes: Iterable[bytes],
+        guid_hashes: Iterable[tuple[UUID, bytes]],
+    ) -> None:
+        self.items.add_many(item_hashes)
+        self.guids.add_many(guid_key(feed_id, guid_hash) for feed_id, guid_hash in guid_hashes)
+        self.ready = True
+
+
+def capacity_for(count: int, headroom: float = HEADROOM_DEFAULT) -> int:
+    return max(CAPACITY_MIN, math.ceil(count * headroom))
+
+
+def guid_key(feed_source_id: UUID, guid_hash: bytes) -> bytes:
+    return hashlib.blake2b(feed_source_id.bytes + guid_hash, digest_size=16).digest()
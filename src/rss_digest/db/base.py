@@ -1,8 +1,17 @@
 """SQLAlchemy declarative base for database models."""
 
+from sqlalchemy.dialects.postgresql import UUID as PG_UUID
+from sqlalchemy.ext.compiler import compiles
 from sqlalchemy.orm import DeclarativeBase
 
 
 class Base(DeclarativeBase):
     """Base class for all ORM models."""
 
+
+@compiles(PG_UUID, "sqlite")
+def _uuid_as_char(type_, compiler, **kw) -> str:
+    # SQLite gives a column declared UUID numeric affinity, so a hex id like
+    # "1234...e678..." would be stored as a REAL. UUIDs are stored as 32 hex
+    # characters there, so declare them as text.
+    return "CHAR(32)"
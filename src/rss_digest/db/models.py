@@ -6,7 +6,15 @@ from datetime import datetime, timezone
 from uuid import UUID
 from uuid import uuid4
 
-from sqlalchemy import DateTime, ForeignKey, String, Text, UniqueConstraint
+from sqlalchemy import (
+    DateTime,
+    ForeignKey,
+    Index,
+    LargeBinary,
+    String,
+    Text,
+    UniqueConstraint,
+)
 from sqlalchemy.dialects.postgresql import UUID as PG_UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -47,6 +55,8 @@ class Group(Base):
     is_enabled: Mapped[bool] = mapped_column(default=True, nullable=False)
     last_run_started_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
     last_run_completed_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
+    # Set while a background evaluation of the group is queued.
+    evaluation_queued_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
 
     user: Mapped["User"] = relationship(back_populates="groups")
     schedules: Mapped[list["GroupSchedule"]] = relationship(back_populates="group")
@@ -112,6 +122,10 @@ class FeedSource(Base):
     last_fetch_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
     health_status: Mapped[str] = mapped_column(String(32), nullable=False, default="healthy")
     consecutive_failures: Mapped[int] = mapped_column(default=0, nullable=False)
+    poll_interval_seconds: Mapped[int | None] = mapped_column()
+    next_fetch_after: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
+    body_sha256: Mapped[str | None] = mapped_column(String(64))
+    entries_newest_first: Mapped[bool | None] = mapped_column()
 
     group_feeds: Mapped[list["GroupFeed"]] = relationship(back_populates="feed_source")
     feed_items: Mapped[list["FeedItem"]] = relationship(back_populates="feed_source")
@@ -145,6 +159,7 @@ class FeedItem(Base):
     __tablename__ = "feed_items"
     __table_args__ = (
         UniqueConstraint("feed_source_id", "guid_hash", name="uq_feed_items_guid"),
+        Index("ix_feed_items_source_seen", "feed_source_id", "first_seen_at"),
     )
 
     id: Mapped[UUID] = mapped_column(
@@ -156,10 +171,15 @@ class FeedItem(Base):
     feed_source_id: Mapped[UUID] = mapped_column(
         PG_UUID(as_uuid=True), ForeignKey("feed_sources.id"), nullable=False
     )
-    guid_hash: Mapped[str] = mapped_column(String(128), nullable=False)
+    guid_hash: Mapped[bytes] = mapped_column(LargeBinary(32), nullable=False)
     url: Mapped[str] = mapped_column(Text, nullable=False)
     published_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
-    canonical_url_hash: Mapped[str] = mapped_column(String(128), nullable=False)
+    canonical_url_hash: Mapped[bytes] = mapped_column(LargeBinary(32), nullable=False)
+    first_seen_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        nullable=False,
+        default=lambda: datetime.now(timezone.utc),
+    )
 
     feed_source: Mapped["FeedSource"] = relationship(back_populates="feed_items")
 
@@ -175,7 +195,7 @@ class Item(Base):
         server_default="gen_random_uuid()",
     )
     canonical_url: Mapped[str] = mapped_column(Text, nullable=False)
-    canonical_url_hash: Mapped[str] = mapped_column(String(128), nullable=False)
+    canonical_url_hash: Mapped[bytes] = mapped_column(LargeBinary(32), nullable=False)
     first_seen_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True),
         nullable=False,
@@ -236,6 +256,8 @@ class ItemEvaluation(Base):
     relevance_score: Mapped[float] = mapped_column(nullable=False, default=0.0)
     decision: Mapped[str] = mapped_column(String(32), nullable=False, default="exclude")
     reason: Mapped[str] = mapped_column(Text, nullable=False, default="")
+    # Set when a scheduled run put the evaluation into a digest.
+    reported_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
 
     item: Mapped["Item"] = relationship(back_populates="evaluations")
 
@@ -263,6 +285,56 @@ class ItemSummary(Base):
     item: Mapped["Item"] = relationship(back_populates="summaries")
 
 
+class SummaryCacheEntry(Base):
+    """A summary shared by every group, keyed by content and summarizer."""
+
+    __tablename__ = "summary_cache"
+    __table_args__ = (
+        UniqueConstraint(
+            "canonical_url_hash", "summarizer", "prompt_hash", name="uq_summary_cache_key"
+        ),
+    )
+
+    id: Mapped[UUID] = mapped_column(
+        PG_UUID(as_uuid=True),
+        primary_key=True,
+        default=uuid4,
+        server_default="gen_random_uuid()",
+    )
+    canonical_url_hash: Mapped[bytes] = mapped_column(LargeBinary(32), nullable=False)
+    summarizer: Mapped[str] = mapped_column(String(128), nullable=False)
+    prompt_hash: Mapped[str] = mapped_column(String(64), nullable=False, default="")
+    summary_md: Mapped[str] = mapped_column(Text, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        nullable=False,
+        default=lambda: datetime.now(timezone.utc),
+    )
+
+
+class ArticleContent(Base):
+    """Extracted article text shared by every group, zlib-compressed."""
+
+    __tablename__ = "article_contents"
+    __table_args__ = (UniqueConstraint("canonical_url_hash", name="uq_article_contents_url"),)
+
+    id: Mapped[UUID] = mapped_column(
+        PG_UUID(as_uuid=True),
+        primary_key=True,
+        default=uuid4,
+        server_default="gen_random_uuid()",
+    )
+    canonical_url_hash: Mapped[bytes] = mapped_column(LargeBinary(32), nullable=False)
+    text_zlib: Mapped[bytes] = mapped_column(LargeBinary, nullable=False)
+    etag: Mapped[str | None] = mapped_column(Text)
+    last_modified: Mapped[str | None] = mapped_column(Text)
+    fetched_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        nullable=False,
+        default=lambda: datetime.now(timezone.utc),
+    )
+
+
 class Digest(Base):
     __tablename__ = "digests"
 
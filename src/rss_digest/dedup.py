@@ -3,10 +3,13 @@
 from __future__ import annotations
 
 import hashlib
+from collections.abc import Iterable
+from functools import lru_cache
 from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
 
 TRACKING_PARAMS = {"ref", "fbclid", "gclid"}
 TRACKING_PREFIXES = ("utm_",)
+CANONICAL_CACHE_SIZE = 65536
 
 
 def _is_tracking_param(key: str) -> bool:
@@ -44,7 +47,23 @@ def normalize_url(url: str) -> str:
     return urlunsplit((scheme, netloc, path, query, ""))
 
 
+@lru_cache(maxsize=CANONICAL_CACHE_SIZE)
+def canonicalize(url: str) -> tuple[str, bytes]:
+    """Return ``(normalized_url, canonical_url_digest)``, memoized per process."""
+    normalized = normalize_url(url)
+    return normalized, hashlib.sha256(normalized.encode("utf-8")).digest()
+
+
+def canonicalize_many(urls: Iterable[str]) -> list[tuple[str, bytes]]:
+    """``canonicalize`` for each URL, in order."""
+    return [canonicalize(url) for url in urls]
+
+
+def canonical_url_digest(url: str) -> bytes:
+    """Return the 32-byte SHA-256 digest of the normalized URL (the stored key)."""
+    return canonicalize(url)[1]
+
+
 def canonical_url_hash(url: str) -> str:
     """Return SHA-256 hash for the normalized URL."""
-    normalized = normalize_url(url)
-    return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+    return canonicalize(url)[1].hex()
@@ -29,6 +29,7 @@ class Group:
     is_enabled: bool = True
     last_run_started_at: datetime | None = None
     last_run_completed_at: datetime | None = None
+    evaluation_queued_at: datetime | None = None
 
 
 @dataclass
@@ -59,6 +60,10 @@ class FeedSource:
     last_fetch_at: datetime | None = None
     health_status: str = "healthy"
     consecutive_failures: int = 0
+    poll_interval_seconds: int | None = None
+    next_fetch_after: datetime | None = None
+    body_sha256: str | None = None
+    entries_newest_first: bool | None = None
 
 
 @dataclass
@@ -73,17 +78,18 @@ class GroupFeed:
 class FeedItem:
     id: UUID = field(default_factory=new_id)
     feed_source_id: UUID | None = None
-    guid_hash: str = ""
+    guid_hash: bytes = b""
     url: str = ""
     published_at: datetime | None = None
-    canonical_url_hash: str = ""
+    canonical_url_hash: bytes = b""
+    first_seen_at: datetime = field(default_factory=datetime.utcnow)
 
 
 @dataclass
 class Item:
     id: UUID = field(default_factory=new_id)
     canonical_url: str = ""
-    canonical_url_hash: str = ""
+    canonical_url_hash: bytes = b""
     first_seen_at: datetime = field(default_factory=datetime.utcnow)
 
 
@@ -103,6 +109,7 @@ class ItemEvaluation:
     relevance_score: float = 0.0
     decision: str = "exclude"
     reason: str = ""
+    reported_at: datetime | None = None
 
 
 @dataclass
@@ -113,6 +120,26 @@ class ItemSummary:
     summary_md: str = ""
 
 
+@dataclass
+class SummaryCacheEntry:
+    id: UUID = field(default_factory=new_id)
+    canonical_url_hash: bytes = b""
+    summarizer: str = ""
+    prompt_hash: str = ""
+    summary_md: str = ""
+    created_at: datetime = field(default_factory=datetime.utcnow)
+
+
+@dataclass
+class ArticleContent:
+    id: UUID = field(default_factory=new_id)
+    canonical_url_hash: bytes = b""
+    text_zlib: bytes = b""
+    etag: str | None = None
+    last_modified: str | None = None
+    fetched_at: datetime = field(default_factory=datetime.utcnow)
+
+
 @dataclass
 class Digest:
     id: UUID = field(default_factory=new_id)
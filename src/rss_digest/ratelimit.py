@@ -0,0 +1,67 @@
+"""Token bucket rate limiting shared by sync and async callers."""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from collections.abc import Callable
+from dataclasses import dataclass, field
+
+
+@dataclass
+class TokenBucket:
+    """Allows ``rate`` operations per second with bursts of up to ``capacity``.
+
+    Callers reserve a token and are told how long to wait before using it, so
+    the bucket never blocks by itself and one instance can serve threads and
+    event loops alike. Reservations queue up: a caller that reserves while the
+    bucket is empty waits behind everyone who reserved before it.
+    """
+
+    rate: float
+    capacity: float = 1.0
+    clock: Callable[[], float] = time.monotonic
+    _tokens: float = field(init=False)
+    _updated: float = field(init=False)
+    _lock: threading.Lock = field(init=False, repr=False, default_factory=threading.Lock)
+
+    def __post_init__(self) -> None:
+        if self.rate <= 0:
+            raise ValueError("rate must be positive")
+        self._tokens = self.capacity
+        self._updated = self.clock()
+
+    def reserve(self, tokens: float = 1.0, max_wait: float | None = None) -> float | None:
+        """Take ``tokens`` and return the wait in seconds before using them.
+
+        Returns None and takes nothing when the wait would exceed ``max_wait``.
+        """
+        with self._lock:
+            self._refill()
+            wait = max(tokens - self._tokens, 0.0) / self.rate
+            if max_wait is not None and wait > max_wait:
+                return None
+            self._tokens -= tokens
+            return wait
+
+    def pause(self, seconds: float) -> None:
+        """Hold back every reservation for at least ``seconds`` from now."""
+        with self._lock:
+            self._refill()
+            self._tokens = min(self._tokens, -seconds * self.rate)
+
+    def acquire(self, tokens: float = 1.0) -> None:
+        wait = self.reserve(tokens)
+        if wait:
+            time.sleep(wait)
+
+    async def acquire_async(self, tokens: float = 1.0) -> None:
+        wait = self.reserve(tokens)
+        if wait:
+            await asyncio.sleep(wait)
+
+    def _refill(self) -> None:
+        now = self.clock()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
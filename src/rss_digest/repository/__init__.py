@@ -9,16 +9,18 @@ from uuid import UUID
 from sqlalchemy.orm import Session
 
 from rss_digest.db.session import build_session_factory
-from rss_digest.repository.base import RepositoryError, utc_now
+from rss_digest.repository.base import RepositoryError, as_utc, utc_now
 from rss_digest.repository.destinations import GroupDestinationsRepo
 from rss_digest.repository.digests import DeliveriesRepo, DigestsRepo
 from rss_digest.repository.feeds import FeedItemsRepo, FeedSourcesRepo, GroupFeedsRepo
 from rss_digest.repository.groups import GroupsRepo
 from rss_digest.repository.items import (
+    ArticleContentsRepo,
     GroupItemsRepo,
     ItemEvaluationsRepo,
     ItemSummariesRepo,
     ItemsRepo,
+    SummaryCacheRepo,
 )
 from rss_digest.repository.schedules import GroupSchedulesRepo
 from rss_digest.repository.users import UsersRepo
@@ -37,6 +39,8 @@ class Repositories:
     group_items: GroupItemsRepo
     evaluations: ItemEvaluationsRepo
     summaries: ItemSummariesRepo
+    summary_cache: SummaryCacheRepo
+    article_contents: ArticleContentsRepo
     digests: DigestsRepo
     deliveries: DeliveriesRepo
     session: Session
@@ -57,6 +61,8 @@ class Repositories:
             group_items=GroupItemsRepo(session),
             evaluations=ItemEvaluationsRepo(session),
             summaries=ItemSummariesRepo(session),
+            summary_cache=SummaryCacheRepo(session),
+            article_contents=ArticleContentsRepo(session),
             digests=DigestsRepo(session),
             deliveries=DeliveriesRepo(session),
             session=session,
@@ -75,6 +81,7 @@ def ensure_unique(values: Iterable[UUID]) -> Sequence[UUID]:
 
 
 __all__ = [
+    "ArticleContentsRepo",
     "DeliveriesRepo",
     "DigestsRepo",
     "FeedItemsRepo",
@@ -86,10 +93,12 @@ __all__ = [
     "ItemEvaluationsRepo",
     "ItemSummariesRepo",
     "ItemsRepo",
+    "SummaryCacheRepo",
     "Repositories",
     "RepositoryError",
     "UsersRepo",
     "GroupsRepo",
+    "as_utc",
     "ensure_unique",
     "utc_now",
 ]
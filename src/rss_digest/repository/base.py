@@ -2,15 +2,35 @@
 
 from __future__ import annotations
 
+from collections.abc import Iterable, Iterator, Sequence
 from datetime import datetime, timezone
-from typing import Dict
+from typing import Any, Dict, TypeVar
 from uuid import UUID, uuid4
 
+from sqlalchemy import Table, insert
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+T = TypeVar("T")
+
+# Keeps bound parameters per statement well below SQLite's limit.
+CHUNK_SIZE = 500
+# Rows fetched per round trip when streaming whole columns.
+HASH_SCAN_BATCH = 10000
+
 
 def utc_now() -> datetime:
     return datetime.now(timezone.utc)
 
 
+def as_utc(value: datetime) -> datetime:
+    """Attach UTC to naive datetimes read back from backends without tz support."""
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value
+
+
 class RepositoryError(RuntimeError):
     """Base error for repository operations."""
 
@@ -20,6 +40,68 @@ def ensure_id(record: object) -> None:
         setattr(record, "id", uuid4())
 
 
+def chunked(values: Iterable[T], size: int = CHUNK_SIZE) -> Iterator[list[T]]:
+    chunk: list[T] = []
+    for value in values:
+        chunk.append(value)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def column_values(record: object) -> dict[str, Any]:
+    """Return a full column->value row for ``record``, applying Python-side defaults."""
+    table: Table = record.__table__  # type: ignore[attr-defined]
+    row: dict[str, Any] = {}
+    for column in table.columns:
+        value = getattr(record, column.key)
+        if value is None and column.default is not None:
+            default = column.default
+            value = default.arg(None) if default.is_callable else default.arg
+            setattr(record, column.key, value)
+        row[column.key] = value
+    return row
+
+
+def insert_ignoring_conflicts(
+    session: Session,
+    table: Table,
+    rows: Sequence[dict[str, Any]],
+    index_elements: Sequence[str],
+) -> set[UUID]:
+    """Batched INSERT that skips rows violating the given unique key.
+
+    Returns the ids of the rows actually inserted. Uses ``ON CONFLICT DO
+    NOTHING`` on PostgreSQL and SQLite and a savepoint per row elsewhere.
+    Does not commit.
+    """
+    if not rows:
+        return set()
+    dialect = session.get_bind().dialect.name
+    if dialect in {"postgresql", "sqlite"}:
+        dialect_insert = postgresql.insert if dialect == "postgresql" else sqlite.insert
+        stmt = (
+            dialect_insert(table)
+            .on_conflict_do_nothing(index_elements=list(index_elements))
+            .returning(table.c.id)
+        )
+        # An executemany with RETURNING is batched into multi-row INSERTs by
+        # SQLAlchemy ("insertmanyvalues") while the statement stays cached.
+        return set(session.execute(stmt, list(rows)).scalars())
+
+    inserted = set()
+    for row in rows:
+        try:
+            with session.begin_nested():
+                session.execute(insert(table).values(row))
+        except IntegrityError:
+            continue
+        inserted.add(row["id"])
+    return inserted
+
+
 class InMemoryRepository:
     def __init__(self) -> None:
         self._records: Dict[UUID, object] = {}
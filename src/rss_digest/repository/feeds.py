@@ -2,15 +2,23 @@
 
 from __future__ import annotations
 
+from collections.abc import Iterable, Iterator
 from datetime import datetime
 from typing import Optional
 from uuid import UUID
 
-from sqlalchemy import exists, select
+from sqlalchemy import exists, func, or_, select, update
 from sqlalchemy.orm import Session
 
-from rss_digest.db.models import FeedItem, FeedSource, GroupFeed
-from rss_digest.repository.base import RepositoryError, ensure_id
+from rss_digest.db.models import FeedItem, FeedSource, Group, GroupFeed, GroupItem, Item
+from rss_digest.repository.base import (
+    HASH_SCAN_BATCH,
+    RepositoryError,
+    chunked,
+    column_values,
+    ensure_id,
+    insert_ignoring_conflicts,
+)
 
 
 class FeedSourcesRepo:
@@ -32,6 +40,38 @@ class FeedSourcesRepo:
     def find_by_url(self, url: str) -> FeedSource | None:
         return self._session.scalars(select(FeedSource).where(FeedSource.url == url)).first()
 
+    def list_due(self, now: datetime, limit: int) -> list[FeedSource]:
+        """Subscribed feeds whose polling schedule is due, most overdue first."""
+        stmt = (
+            select(FeedSource)
+            .where(
+                or_(
+                    FeedSource.next_fetch_after.is_(None),
+                    FeedSource.next_fetch_after <= now,
+                ),
+                exists().where(
+                    GroupFeed.feed_source_id == FeedSource.id,
+                    GroupFeed.enabled.is_(True),
+                ),
+            )
+            .order_by(FeedSource.next_fetch_after.nulls_first())
+            .limit(limit)
+        )
+        return list(self._session.scalars(stmt))
+
+    def list_for_groups(self, group_ids: Iterable[UUID]) -> list[FeedSource]:
+        ids = list(group_ids)
+        if not ids:
+            return []
+        stmt = select(FeedSource).where(
+            exists().where(
+                GroupFeed.feed_source_id == FeedSource.id,
+                GroupFeed.group_id.in_(ids),
+                GroupFeed.enabled.is_(True),
+            )
+        )
+        return list(self._session.scalars(stmt))
+
     def update_fetch_meta(
         self,
         feed_source_id: UUID,
@@ -41,6 +81,10 @@ class FeedSourcesRepo:
         fetched_at: datetime,
         failures: int,
         status: str,
+        poll_interval_seconds: Optional[int] = None,
+        next_fetch_after: Optional[datetime] = None,
+        body_sha256: Optional[str] = None,
+        entries_newest_first: Optional[bool] = None,
     ) -> None:
         feed = self.get(feed_source_id)
         if feed is None:
@@ -50,8 +94,38 @@ class FeedSourcesRepo:
         feed.last_fetch_at = fetched_at
         feed.consecutive_failures = failures
         feed.health_status = status
+        if poll_interval_seconds is not None:
+            feed.poll_interval_seconds = poll_interval_seconds
+        if next_fetch_after is not None:
+            feed.next_fetch_after = next_fetch_after
+        if body_sha256 is not None:
+            feed.body_sha256 = body_sha256
+        if entries_newest_first is not None:
+            feed.entries_newest_first = entries_newest_first
         self._session.commit()
 
+    def claim_fetch(
+        self, feed_source_id: UUID, *, claimed_at: datetime, stale_before: datetime
+    ) -> bool:
+        """Atomically mark a stale feed as being fetched.
+
+        Returns False when another run fetched it after ``stale_before``.
+        """
+        stmt = (
+            update(FeedSource)
+            .where(
+                FeedSource.id == feed_source_id,
+                or_(
+                    FeedSource.last_fetch_at.is_(None),
+                    FeedSource.last_fetch_at < stale_before,
+                ),
+            )
+            .values(last_fetch_at=claimed_at)
+        )
+        claimed = self._session.execute(stmt).rowcount == 1
+        self._session.commit()
+        return claimed
+
 
 class GroupFeedsRepo:
     def __init__(self, session: Session) -> None:
@@ -86,6 +160,23 @@ class GroupFeedsRepo:
         stmt = select(GroupFeed).where(GroupFeed.group_id == group_id)
         return list(self._session.scalars(stmt))
 
+    def subscribers(self, feed_source_ids: Iterable[UUID]) -> dict[UUID, list[UUID]]:
+        """Enabled groups with an enabled subscription, per feed source id."""
+        groups: dict[UUID, list[UUID]] = {}
+        for chunk in chunked(feed_source_ids):
+            stmt = (
+                select(GroupFeed.feed_source_id, GroupFeed.group_id)
+                .join(Group, Group.id == GroupFeed.group_id)
+                .where(
+                    GroupFeed.feed_source_id.in_(chunk),
+                    GroupFeed.enabled.is_(True),
+                    Group.is_enabled.is_(True),
+                )
+            )
+            for feed_source_id, group_id in self._session.execute(stmt):
+                groups.setdefault(feed_source_id, []).append(group_id)
+        return groups
+
 
 class FeedItemsRepo:
     def __init__(self, session: Session) -> None:
@@ -107,9 +198,81 @@ class FeedItemsRepo:
         stmt = select(FeedItem).where(FeedItem.feed_source_id == feed_source_id)
         return list(self._session.scalars(stmt))
 
-    def exists_guid(self, feed_source_id: UUID, guid_hash: str) -> bool:
+    def list_seen_since(
+        self, feed_source_ids: Iterable[UUID], since: datetime
+    ) -> list[FeedItem]:
+        items: list[FeedItem] = []
+        for chunk in chunked(feed_source_ids):
+            stmt = select(FeedItem).where(
+                FeedItem.feed_source_id.in_(chunk), FeedItem.first_seen_at >= since
+            )
+            items.extend(self._session.scalars(stmt))
+        return items
+
+    def list_unlinked_since(
+        self, group_id: UUID, feed_source_ids: Iterable[UUID], since: datetime
+    ) -> list[FeedItem]:
+        """Like ``list_seen_since`` minus items already linked to ``group_id``."""
+        linked = (
+            select(Item.id)
+            .join(GroupItem, GroupItem.item_id == Item.id)
+            .where(
+                Item.canonical_url_hash == FeedItem.canonical_url_hash,
+                GroupItem.group_id == group_id,
+            )
+        )
+        items: list[FeedItem] = []
+        for chunk in chunked(feed_source_ids):
+            stmt = select(FeedItem).where(
+                FeedItem.feed_source_id.in_(chunk),
+                FeedItem.first_seen_at >= since,
+                ~linked.exists(),
+            )
+            items.extend(self._session.scalars(stmt))
+        return items
+
+    def exists_guid(self, feed_source_id: UUID, guid_hash: bytes) -> bool:
         stmt = select(exists().where(
             FeedItem.feed_source_id == feed_source_id,
             FeedItem.guid_hash == guid_hash,
         ))
         return bool(self._session.execute(stmt).scalar())
+
+    def existing_guids(
+        self, feed_source_id: UUID, guid_hashes: Iterable[bytes]
+    ) -> set[bytes]:
+        found: set[bytes] = set()
+        for chunk in chunked(guid_hashes):
+            stmt = select(FeedItem.guid_hash).where(
+                FeedItem.feed_source_id == feed_source_id,
+                FeedItem.guid_hash.in_(chunk),
+            )
+            found.update(self._session.scalars(stmt))
+        return found
+
+    def count(self) -> int:
+        return self._session.scalar(select(func.count()).select_from(FeedItem)) or 0
+
+    def iter_guid_hashes(self) -> Iterator[tuple[UUID, bytes]]:
+        stmt = select(FeedItem.feed_source_id, FeedItem.guid_hash).execution_options(
+            yield_per=HASH_SCAN_BATCH
+        )
+        for feed_source_id, guid_hash in self._session.execute(stmt):
+            yield feed_source_id, guid_hash
+
+    def add_many(self, records: Iterable[FeedItem]) -> list[FeedItem]:
+        """Insert records in bulk, skipping ``uq_feed_items_guid`` conflicts.
+
+        Returns the records that were actually inserted.
+        """
+        records = list(records)
+        for record in records:
+            ensure_id(record)
+        inserted_ids = insert_ignoring_conflicts(
+            self._session,
+            FeedItem.__table__,
+            [column_values(record) for record in records],
+            ["feed_source_id", "guid_hash"],
+        )
+        self._session.commit()
+        return [record for record in records if record.id in inserted_ids]
@@ -5,7 +5,7 @@ from __future__ import annotations
 from datetime import datetime
 from uuid import UUID
 
-from sqlalchemy import select
+from sqlalchemy import or_, select, update
 from sqlalchemy.orm import Session
 
 from rss_digest.db.models import Group
@@ -47,3 +47,32 @@ class GroupsRepo:
         group.last_run_started_at = started_at
         group.last_run_completed_at = completed_at
         self._session.commit()
+
+    def claim_evaluation(
+        self, group_id: UUID, *, claimed_at: datetime, stale_before: datetime
+    ) -> bool:
+        """Atomically mark a background evaluation of the group as queued.
+
+        Returns False when one was queued after ``stale_before`` and has
+        not started yet.
+        """
+        stmt = (
+            update(Group)
+            .where(
+                Group.id == group_id,
+                or_(
+                    Group.evaluation_queued_at.is_(None),
+                    Group.evaluation_queued_at < stale_before,
+                ),
+            )
+            .values(evaluation_queued_at=claimed_at)
+        )
+        claimed = self._session.execute(stmt).rowcount == 1
+        self._session.commit()
+        return claimed
+
+    def release_evaluation(self, group_id: UUID) -> None:
+        self._session.execute(
+            update(Group).where(Group.id == group_id).values(evaluation_queued_at=None)
+        )
+        self._session.commit()
@@ -2,14 +2,29 @@
 
 from __future__ import annotations
 
+from collections.abc import Iterable, Iterator
 from datetime import datetime
-from uuid import UUID
+from uuid import UUID, uuid4
 
-from sqlalchemy import select
+from sqlalchemy import delete, func, select, update
 from sqlalchemy.orm import Session
 
-from rss_digest.db.models import GroupItem, Item, ItemEvaluation, ItemSummary
-from rss_digest.repository.base import ensure_id
+from rss_digest.db.models import (
+    ArticleContent,
+    GroupItem,
+    Item,
+    ItemEvaluation,
+    ItemSummary,
+    SummaryCacheEntry,
+)
+from rss_digest.repository.base import (
+    HASH_SCAN_BATCH,
+    chunked,
+    column_values,
+    ensure_id,
+    insert_ignoring_conflicts,
+    utc_now,
+)
 
 
 class ItemsRepo:
@@ -28,10 +43,75 @@ class ItemsRepo:
     def list_all(self) -> list[Item]:
         return list(self._session.scalars(select(Item)))
 
-    def find_by_hash(self, canonical_url_hash: str) -> Item | None:
+    def find_by_hash(self, canonical_url_hash: bytes) -> Item | None:
         stmt = select(Item).where(Item.canonical_url_hash == canonical_url_hash)
         return self._session.scalars(stmt).first()
 
+    def ids_by_hashes(self, canonical_url_hashes: Iterable[bytes]) -> dict[bytes, UUID]:
+        found: dict[bytes, UUID] = {}
+        for chunk in chunked(canonical_url_hashes):
+            stmt = select(Item.canonical_url_hash, Item.id).where(
+                Item.canonical_url_hash.in_(chunk)
+            )
+            for url_hash, item_id in self._session.execute(stmt):
+                found[url_hash] = item_id
+        return found
+
+    def add_new(
+        self, urls_by_hash: dict[bytes, str], first_seen_at: datetime, *, commit: bool = True
+    ) -> dict[bytes, UUID]:
+        """Insert items in bulk from ``canonical_url_hash -> canonical_url``.
+
+        Hashes that conflict on ``uq_items_canonical`` are skipped; returns
+        the hash -> id mapping of the rows actually inserted.
+        """
+        ids = {url_hash: uuid4() for url_hash in urls_by_hash}
+        rows = [
+            {
+                "id": ids[url_hash],
+                "canonical_url": url,
+                "canonical_url_hash": url_hash,
+                "first_seen_at": first_seen_at,
+            }
+            for url_hash, url in urls_by_hash.items()
+        ]
+        inserted_ids = insert_ignoring_conflicts(
+            self._session, Item.__table__, rows, ["canonical_url_hash"]
+        )
+        if commit:
+            self._session.commit()
+        return {url_hash: item_id for url_hash, item_id in ids.items() if item_id in inserted_ids}
+
+    def list_unevaluated(self, group_id: UUID, since: datetime) -> list[Item]:
+        """Items linked to the group since ``since`` that it has not evaluated yet.
+
+        Items whose evaluation was deferred are included whenever they were
+        linked, so a deferral is picked up by the next run.
+        """
+        stmt = (
+            select(Item)
+            .join(GroupItem, GroupItem.item_id == Item.id)
+            .outerjoin(
+                ItemEvaluation,
+                (ItemEvaluation.group_id == GroupItem.group_id)
+                & (ItemEvaluation.item_id == GroupItem.item_id),
+            )
+            .where(
+                GroupItem.group_id == group_id,
+                ((ItemEvaluation.id.is_(None)) & (GroupItem.first_seen_at >= since))
+                | (ItemEvaluation.decision == "postponed"),
+            )
+            .order_by(GroupItem.first_seen_at, Item.id)
+        )
+        return list(self._session.scalars(stmt))
+
+    def count(self) -> int:
+        return self._session.scalar(select(func.count()).select_from(Item)) or 0
+
+    def iter_hashes(self) -> Iterator[bytes]:
+        stmt = select(Item.canonical_url_hash).execution_options(yield_per=HASH_SCAN_BATCH)
+        yield from self._session.scalars(stmt)
+
 
 class GroupItemsRepo:
     def __init__(self, session: Session) -> None:
@@ -43,6 +123,25 @@ class GroupItemsRepo:
         self._session.commit()
         return merged
 
+    def add_links(
+        self, links: Iterable[tuple[UUID, UUID]], first_seen_at: datetime
+    ) -> dict[UUID, UUID]:
+        """Link items to groups in bulk from ``(group_id, item_id)`` pairs.
+
+        Pairs already linked (``uq_group_items_item``) are skipped; returns
+        the group items actually created as ``{group_item_id: group_id}``.
+        Commits.
+        """
+        rows = [
+            {"id": uuid4(), "group_id": group_id, "item_id": item_id, "first_seen_at": first_seen_at}
+            for group_id, item_id in links
+        ]
+        inserted_ids = insert_ignoring_conflicts(
+            self._session, GroupItem.__table__, rows, ["group_id", "item_id"]
+        )
+        self._session.commit()
+        return {row["id"]: row["group_id"] for row in rows if row["id"] in inserted_ids}
+
     def add_if_new(self, record: GroupItem) -> bool:
         existing = self._session.scalars(
             select(GroupItem).where(
@@ -99,6 +198,73 @@ class ItemEvaluationsRepo:
         stmt = select(ItemEvaluation).where(ItemEvaluation.group_id == group_id)
         return list(self._session.scalars(stmt))
 
+    def add_many(
+        self, records: Iterable[ItemEvaluation], *, commit: bool = True
+    ) -> list[ItemEvaluation]:
+        """Insert records in bulk, skipping ``uq_item_evaluations_item`` conflicts.
+
+        Returns the records that were actually inserted.
+        """
+        records = list(records)
+        for record in records:
+            ensure_id(record)
+        inserted_ids = insert_ignoring_conflicts(
+            self._session,
+            ItemEvaluation.__table__,
+            [column_values(record) for record in records],
+            ["group_id", "item_id"],
+        )
+        if commit:
+            self._session.commit()
+        return [record for record in records if record.id in inserted_ids]
+
+    def list_unreported(self, group_id: UUID) -> list[ItemEvaluation]:
+        """Final evaluations not yet put in a digest, oldest links first.
+
+        Not limited to a window: an item postponed by one run and evaluated
+        by a later one is reported then, however long ago it was linked.
+        Postponed evaluations are left for the run that replaces them.
+        """
+        stmt = (
+            select(ItemEvaluation)
+            .join(
+                GroupItem,
+                (GroupItem.group_id == ItemEvaluation.group_id)
+                & (GroupItem.item_id == ItemEvaluation.item_id),
+            )
+            .where(
+                ItemEvaluation.group_id == group_id,
+                ItemEvaluation.reported_at.is_(None),
+                ItemEvaluation.decision != "postponed",
+            )
+            .order_by(GroupItem.first_seen_at, ItemEvaluation.item_id)
+        )
+        return list(self._session.scalars(stmt))
+
+    def mark_reported(self, evaluation_ids: Iterable[UUID], reported_at: datetime) -> None:
+        for chunk in chunked(evaluation_ids):
+            self._session.execute(
+                update(ItemEvaluation)
+                .where(ItemEvaluation.id.in_(chunk))
+                .values(reported_at=reported_at)
+            )
+        self._session.commit()
+
+    def delete_postponed(
+        self, group_id: UUID, item_ids: Iterable[UUID], *, commit: bool = True
+    ) -> None:
+        """Drop postponed evaluations of ``item_ids`` so they can be re-evaluated."""
+        for chunk in chunked(item_ids):
+            self._session.execute(
+                delete(ItemEvaluation).where(
+                    ItemEvaluation.group_id == group_id,
+                    ItemEvaluation.item_id.in_(chunk),
+                    ItemEvaluation.decision == "postponed",
+                )
+            )
+        if commit:
+            self._session.commit()
+
 
 class ItemSummariesRepo:
     def __init__(self, session: Session) -> None:
@@ -126,3 +292,119 @@ class ItemSummariesRepo:
     def list_by_group(self, group_id: UUID) -> list[ItemSummary]:
         stmt = select(ItemSummary).where(ItemSummary.group_id == group_id)
         return list(self._session.scalars(stmt))
+
+    def find_many(self, group_id: UUID, item_ids: Iterable[UUID]) -> dict[UUID, ItemSummary]:
+        found: dict[UUID, ItemSummary] = {}
+        for chunk in chunked(item_ids):
+            stmt = select(ItemSummary).where(
+                ItemSummary.group_id == group_id, ItemSummary.item_id.in_(chunk)
+            )
+            for summary in self._session.scalars(stmt):
+                found[summary.item_id] = summary
+        return found
+
+    def add_many(
+        self, records: Iterable[ItemSummary], *, commit: bool = True
+    ) -> list[ItemSummary]:
+        """Insert records in bulk, skipping ``uq_item_summaries_item`` conflicts.
+
+        Returns the records that were actually inserted.
+        """
+        records = list(records)
+        for record in records:
+            ensure_id(record)
+        inserted_ids = insert_ignoring_conflicts(
+            self._session,
+            ItemSummary.__table__,
+            [column_values(record) for record in records],
+            ["group_id", "item_id"],
+        )
+        if commit:
+            self._session.commit()
+        return [record for record in records if record.id in inserted_ids]
+
+
+class SummaryCacheRepo:
+    def __init__(self, session: Session) -> None:
+        self._session = session
+
+    def get_many(
+        self, canonical_url_hashes: Iterable[bytes], summarizer: str, prompt_hash: str = ""
+    ) -> dict[bytes, str]:
+        found: dict[bytes, str] = {}
+        for chunk in chunked(canonical_url_hashes):
+            stmt = select(
+                SummaryCacheEntry.canonical_url_hash, SummaryCacheEntry.summary_md
+            ).where(
+                SummaryCacheEntry.canonical_url_hash.in_(chunk),
+                SummaryCacheEntry.summarizer == summarizer,
+                SummaryCacheEntry.prompt_hash == prompt_hash,
+            )
+            for url_hash, summary_md in self._session.execute(stmt):
+                found[url_hash] = summary_md
+        return found
+
+    def put_many(
+        self, summaries: dict[bytes, str], summarizer: str, prompt_hash: str = ""
+    ) -> None:
+        """Store summaries by canonical URL hash; existing entries are kept."""
+        now = utc_now()
+        insert_ignoring_conflicts(
+            self._session,
+            SummaryCacheEntry.__table__,
+            [
+                {
+                    "id": uuid4(),
+                    "canonical_url_hash": url_hash,
+                    "summarizer": summarizer,
+                    "prompt_hash": prompt_hash,
+                    "summary_md": summary_md,
+                    "created_at": now,
+                }
+                for url_hash, summary_md in summaries.items()
+            ],
+            ["canonical_url_hash", "summarizer", "prompt_hash"],
+        )
+        self._session.commit()
+
+
+class ArticleContentsRepo:
+    def __init__(self, session: Session) -> None:
+        self._session = session
+
+    def get_many(self, canonical_url_hashes: Iterable[bytes]) -> dict[bytes, ArticleContent]:
+        found: dict[bytes, ArticleContent] = {}
+        for chunk in chunked(canonical_url_hashes):
+            stmt = select(ArticleContent).where(ArticleContent.canonical_url_hash.in_(chunk))
+            for content in self._session.scalars(stmt):
+                found[content.canonical_url_hash] = content
+        return found
+
+    def put_many(self, records: Iterable[ArticleContent]) -> None:
+        """Store records by canonical URL hash, replacing older entries."""
+        records = list(records)
+        if not records:
+            return
+        for chunk in chunked([record.canonical_url_hash for record in records]):
+            self._session.execute(
+                delete(ArticleContent).where(ArticleContent.canonical_url_hash.in_(chunk))
+            )
+        for record in records:
+            ensure_id(record)
+        insert_ignoring_conflicts(
+            self._session,
+            ArticleContent.__table__,
+            [column_values(record) for record in records],
+            ["canonical_url_hash"],
+        )
+        self._session.commit()
+
+    def touch_many(self, canonical_url_hashes: Iterable[bytes], fetched_at: datetime) -> None:
+        """Mark entries as revalidated at ``fetched_at`` (a 304 answer)."""
+        for chunk in chunked(canonical_url_hashes):
+            self._session.execute(
+                update(ArticleContent)
+                .where(ArticleContent.canonical_url_hash.in_(chunk))
+                .values(fetched_at=fetched_at)
+            )
+        self._session.commit()
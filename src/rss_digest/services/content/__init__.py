@@ -0,0 +1 @@
+"""Article content fetching and extraction."""
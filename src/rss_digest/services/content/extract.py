@@ -0,0 +1,130 @@
+"""Main-text extraction from article HTML."""
+
+from __future__ import annotations
+
+import re
+from html.parser import HTMLParser
+
+# Elements whose text is never part of the article body.
+SKIPPED_TAGS = frozenset(
+    "script style noscript template svg nav header footer aside form".split()
+)
+# Elements that end a paragraph of extracted text.
+BLOCK_TAGS = frozenset(
+    "p div section article main br li h1 h2 h3 h4 h5 h6 blockquote pre tr td th"
+    " figcaption".split()
+)
+VOID_TAGS = frozenset("area base br col embed hr img input link meta source wbr".split())
+MAIN_TAGS = frozenset(("article", "main"))
+# Start tags that close an open <p>, as HTML's implied end tags do.
+P_CLOSING_TAGS = frozenset(
+    "address article aside blockquote div dl fieldset figcaption figure footer form"
+    " h1 h2 h3 h4 h5 h6 header hr li main nav ol p pre section table ul".split()
+)
+# Start tag -> (open elements it closes, elements that stop the search).
+IMPLIED_END_TAGS = {
+    "li": (frozenset(("li",)), frozenset(("ul", "ol"))),
+    "dt": (frozenset(("dt", "dd")), frozenset(("dl",))),
+    "dd": (frozenset(("dt", "dd")), frozenset(("dl",))),
+    "tr": (frozenset(("tr", "td", "th")), frozenset(("table", "thead", "tbody", "tfoot"))),
+    "td": (frozenset(("td", "th")), frozenset(("tr", "table"))),
+    "th": (frozenset(("td", "th")), frozenset(("tr", "table"))),
+}
+_P_SCOPE = (frozenset(("p",)), frozenset(("button", "caption", "table", "td", "th", "template")))
+# Lines shorter than this are usually menus, bylines or buttons.
+MIN_LINE_CHARS = 25
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+class _TextCollector(HTMLParser):
+    """Collects text lines, tracking open elements the way HTML nests them.
+
+    Pages routinely leave ``<li>``, ``<p>`` and table cells unclosed, so
+    elements are kept on a stack that applies the implied end tags and
+    closes unclosed children when an ancestor ends.
+    """
+
+    def __init__(self) -> None:
+        super().__init__(convert_charrefs=True)
+        self.body: list[str] = []
+        # Text inside <article>/<main>, preferred over the whole body.
+        self.main: list[str] = []
+        self._open: list[str] = []
+        # Open skipped and article/main elements on the stack.
+        self._skip_depth = 0
+        self._main_depth = 0
+        self._line: list[str] = []
+
+    def handle_starttag(self, tag: str, attrs) -> None:
+        if tag in VOID_TAGS:
+            if tag == "br":
+                self._end_line()
+            return
+        if tag in P_CLOSING_TAGS:
+            self._close_implied(*_P_SCOPE)
+        if tag in IMPLIED_END_TAGS:
+            self._close_implied(*IMPLIED_END_TAGS[tag])
+        if tag in BLOCK_TAGS:
+            self._end_line()
+        self._open.append(tag)
+        if tag in SKIPPED_TAGS:
+            self._skip_depth += 1
+        if tag in MAIN_TAGS:
+            self._main_depth += 1
+
+    def handle_endtag(self, tag: str) -> None:
+        # End tags without a matching open element are ignored.
+        if tag in self._open:
+            self._pop_to(len(self._open) - 1 - self._open[::-1].index(tag))
+
+    def _close_implied(self, closes: frozenset[str], boundaries: frozenset[str]) -> None:
+        for index in range(len(self._open) - 1, -1, -1):
+            tag = self._open[index]
+            if tag in closes:
+                self._pop_to(index)
+                return
+            if tag in boundaries:
+                return
+
+    def _pop_to(self, index: int) -> None:
+        """Close the element at ``index`` and everything opened inside it."""
+        while len(self._open) > index:
+            tag = self._open.pop()
+            if tag in BLOCK_TAGS:
+                self._end_line()
+            if tag in SKIPPED_TAGS:
+                self._skip_depth -= 1
+            if tag in MAIN_TAGS:
+                self._main_depth -= 1
+
+    def handle_data(self, data: str) -> None:
+        if not self._skip_depth:
+            self._line.append(data)
+
+    def close(self) -> None:
+        super().close()
+        self._end_line()
+
+    def _end_line(self) -> None:
+        line = _WHITESPACE.sub(" ", "".join(self._line)).strip()
+        self._line = []
+        if len(line) < MIN_LINE_CHARS:
+            return
+        self.body.append(line)
+        if self._main_depth:
+            self.main.append(line)
+
+
+def extract_main_text(html: str, max_chars: int | None = None) -> str:
+    """Readable text of an article page, one paragraph per line.
+
+    Scripts, navigation, headers, footers and asides are dropped, as are
+    short lines. Text inside ``<article>`` or ``<main>`` is preferred when
+    the page has any.
+    """
+    collector = _TextCollector()
+    collector.feed(html)
+    collector.close()
+    text = "\n".join(collector.main or collector.body)
+    return text[:max_chars] if max_chars is not None else text
@@ -0,0 +1,70 @@
+"""HTTP fetcher for article pages with ETag/Last-Modified."""
+
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass
+from datetime import datetime, timezone
+
+from rss_digest.services.rss.http_pool import get_pool
+from rss_digest.services.rss.politeness import get_host_scheduler, retry_after_seconds
+
+HTML_CONTENT_TYPES = ("text/html", "application/xhtml+xml")
+
+
+@dataclass
+class ArticleResponse:
+    status_code: int
+    html: str = ""
+    etag: str | None = None
+    last_modified: str | None = None
+    # The body was larger than the caller's ``max_bytes`` and was not read.
+    too_large: bool = False
+
+
+async def fetch_article_async(
+    url: str,
+    etag: str | None = None,
+    last_modified: str | None = None,
+    max_bytes: int | None = None,
+) -> ArticleResponse:
+    """GET ``url`` conditionally, reading at most ``max_bytes`` of HTML.
+
+    Non-HTML answers come back as 415 with no body. The host scheduler
+    spaces requests per host like feed fetches; a request it would hold
+    too long comes back as 429 without being sent.
+    """
+    wait = get_host_scheduler().reserve(url)
+    if wait is None:
+        return ArticleResponse(status_code=429)
+    if wait:
+        await asyncio.sleep(wait)
+    headers: dict[str, str] = {}
+    if etag:
+        headers["If-None-Match"] = etag
+    if last_modified:
+        headers["If-Modified-Since"] = last_modified
+    client = get_pool().async_client
+    async with client.stream("GET", url, headers=headers, follow_redirects=True) as response:
+        retry_after = retry_after_seconds(response.headers, datetime.now(timezone.utc))
+        if retry_after is not None and response.status_code in (429, 503):
+            get_host_scheduler().pause(url, retry_after)
+        if response.status_code != 200:
+            return ArticleResponse(status_code=response.status_code)
+        content_type = response.headers.get("Content-Type", "").split(";")[0].strip().lower()
+        if content_type and content_type not in HTML_CONTENT_TYPES:
+            return ArticleResponse(status_code=415)
+        declared = response.headers.get("Content-Length", "")
+        if max_bytes is not None and declared.isdigit() and int(declared) > max_bytes:
+            return ArticleResponse(status_code=200, too_large=True)
+        body = bytearray()
+        async for chunk in response.aiter_bytes():
+            body += chunk
+            if max_bytes is not None and len(body) > max_bytes:
+                return ArticleResponse(status_code=200, too_large=True)
+        return ArticleResponse(
+            status_code=200,
+            html=body.decode(response.encoding or "utf-8", errors="replace"),
+            etag=response.headers.get("ETag"),
+            last_modified=response.headers.get("Last-Modified"),
+        )
@@ -0,0 +1,170 @@
+"""Fetch, extract and cache article text for evaluators and summarizers."""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import zlib
+from collections.abc import Awaitable, Callable, Sequence
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any, Coroutine
+
+from rss_digest.db.models import ArticleContent, Item
+from rss_digest.repository import ArticleContentsRepo, as_utc, utc_now
+from rss_digest.services.content.extract import extract_main_text
+from rss_digest.services.content.http_client import ArticleResponse, fetch_article_async
+
+ArticleFetchFunc = Callable[
+    [str, str | None, str | None, int | None], Awaitable[ArticleResponse]
+]
+LoopRunner = Callable[[Coroutine[Any, Any, Any]], Any]
+
+
+@dataclass(frozen=True)
+class ArticleContentConfig:
+    max_concurrency: int = 8
+    # Larger pages are not downloaded; their text stays unknown.
+    max_bytes: int = 2_000_000
+    # Extracted text is cut to this many characters before it is stored.
+    max_chars: int = 100_000
+    # Older entries are revalidated with a conditional GET before use.
+    max_age: timedelta = timedelta(days=1)
+
+    @classmethod
+    def from_env(cls) -> "ArticleContentConfig":
+        return cls(
+            max_concurrency=int(os.getenv("ARTICLE_FETCH_CONCURRENCY", cls.max_concurrency)),
+            max_bytes=int(os.getenv("ARTICLE_MAX_BYTES", cls.max_bytes)),
+            max_chars=int(os.getenv("ARTICLE_MAX_CHARS", cls.max_chars)),
+            max_age=timedelta(
+                seconds=int(
+                    os.getenv("ARTICLE_MAX_AGE_SECONDS", cls.max_age.total_seconds())
+                )
+            ),
+        )
+
+
+@dataclass
+class ContentStats:
+    # Fresh cache entries used without a request.
+    hits: int = 0
+    # Stale entries confirmed unchanged by a 304.
+    revalidated: int = 0
+    # Pages downloaded and extracted.
+    fetched: int = 0
+    # Errors, non-HTML or oversized pages, pages with no extractable text and
+    # requests the host scheduler held back. None of these are cached.
+    failures: int = 0
+
+    @property
+    def lookups(self) -> int:
+        return self.hits + self.revalidated + self.fetched + self.failures
+
+    @property
+    def hit_rate(self) -> float:
+        """Share of lookups answered without downloading the page."""
+        return (self.hits + self.revalidated) / self.lookups if self.lookups else 0.0
+
+
+class ArticleContentService:
+    """Makes the main text of items' articles available locally.
+
+    ``prefetch`` loads the cached text of a set of items, downloads the
+    missing ones concurrently and revalidates stale ones with a conditional
+    GET, storing extracted text zlib-compressed once per canonical URL hash.
+    Evaluators and summarizers then call ``text`` with the item's canonical
+    URL instead of downloading the article themselves. If a stale entry
+    cannot be revalidated its old text is still served.
+    """
+
+    def __init__(
+        self,
+        contents: ArticleContentsRepo,
+        fetch_func: ArticleFetchFunc = fetch_article_async,
+        config: ArticleContentConfig | None = None,
+        *,
+        loop_runner: LoopRunner = asyncio.run,
+        clock: Callable[[], datetime] = utc_now,
+    ) -> None:
+        self._contents = contents
+        self._fetch_func = fetch_func
+        self._config = config or ArticleContentConfig()
+        self._loop_runner = loop_runner
+        self._clock = clock
+        self._texts: dict[str, str] = {}
+        self.stats = ContentStats()
+
+    def text(self, canonical_url: str) -> str | None:
+        """Text of an article from the last ``prefetch``, if it has any."""
+        return self._texts.get(canonical_url)
+
+    def prefetch(self, items: Sequence[Item]) -> None:
+        now = self._clock()
+        cached = self._contents.get_many(item.canonical_url_hash for item in items)
+        texts: dict[str, str] = {}
+        to_fetch: list[tuple[Item, ArticleContent | None]] = []
+        for item in items:
+            entry = cached.get(item.canonical_url_hash)
+            if entry is not None and now - as_utc(entry.fetched_at) < self._config.max_age:
+                self.stats.hits += 1
+                texts[item.canonical_url] = _decompress(entry)
+            else:
+                to_fetch.append((item, entry))
+
+        responses = self._loop_runner(self._fetch_all(to_fetch)) if to_fetch else []
+        revalidated: list[bytes] = []
+        fresh: list[ArticleContent] = []
+        for (item, entry), response in zip(to_fetch, responses):
+            if isinstance(response, ArticleResponse) and response.status_code == 304 and entry:
+                self.stats.revalidated += 1
+                revalidated.append(item.canonical_url_hash)
+                texts[item.canonical_url] = _decompress(entry)
+                continue
+            text = (
+                extract_main_text(response.html, self._config.max_chars)
+                if isinstance(response, ArticleResponse) and response.html
+                else ""
+            )
+            if text:
+                self.stats.fetched += 1
+                fresh.append(
+                    ArticleContent(
+                        canonical_url_hash=item.canonical_url_hash,
+                        text_zlib=zlib.compress(text.encode("utf-8")),
+                        etag=response.etag,
+                        last_modified=response.last_modified,
+                        fetched_at=now,
+                    )
+                )
+                texts[item.canonical_url] = text
+            else:
+                self.stats.failures += 1
+                if entry is not None:
+                    texts[item.canonical_url] = _decompress(entry)
+        if revalidated:
+            self._contents.touch_many(revalidated, now)
+        self._contents.put_many(fresh)
+        self._texts = texts
+
+    async def _fetch_all(
+        self, to_fetch: list[tuple[Item, ArticleContent | None]]
+    ) -> list[ArticleResponse | BaseException]:
+        limit = asyncio.Semaphore(self._config.max_concurrency)
+
+        async def fetch_one(item: Item, entry: ArticleContent | None) -> ArticleResponse:
+            async with limit:
+                return await self._fetch_func(
+                    item.canonical_url,
+                    entry.etag if entry else None,
+                    entry.last_modified if entry else None,
+                    self._config.max_bytes,
+                )
+
+        return await asyncio.gather(
+            *(fetch_one(item, entry) for item, entry in to_fetch), return_exceptions=True
+        )
+
+
+def _decompress(entry: ArticleContent) -> str:
+    return zlib.decompress(entry.text_zlib).decode("utf-8")
@@ -0,0 +1,67 @@
+"""Per-run limits on how much evaluation work one group may trigger."""
+
+from __future__ import annotations
+
+import os
+from dataclasses import dataclass
+
+# Stored for candidates left over by a budget. Unlike the cascade's "defer"
+# it is never an evaluator's answer, only "evaluate this again next run".
+POSTPONED = "postponed"
+OVERFLOW_DECISIONS = (POSTPONED, "exclude")
+
+
+@dataclass(frozen=True)
+class EvaluationBudget:
+    # Unset limits are not enforced.
+    max_items: int | None = None
+    max_tokens: int | None = None
+    max_seconds: float | None = None
+    # Estimated tokens charged against ``max_tokens``.
+    tokens_per_evaluation: int = 200
+    tokens_per_summary: int = 1000
+    # Decision recorded for candidates over budget. Postponed ones are
+    # picked up again by the next run; excluded ones never are.
+    overflow: str = POSTPONED
+
+    def __post_init__(self) -> None:
+        if self.overflow not in OVERFLOW_DECISIONS:
+            raise ValueError(f"overflow must be one of {OVERFLOW_DECISIONS}")
+
+    @classmethod
+    def from_env(cls) -> "EvaluationBudget":
+        max_items = os.getenv("EVALUATION_MAX_ITEMS")
+        max_tokens = os.getenv("EVALUATION_MAX_TOKENS")
+        max_seconds = os.getenv("EVALUATION_MAX_SECONDS")
+        return cls(
+            max_items=int(max_items) if max_items else None,
+            max_tokens=int(max_tokens) if max_tokens else None,
+            max_seconds=float(max_seconds) if max_seconds else None,
+            tokens_per_evaluation=int(
+                os.getenv("EVALUATION_TOKENS_PER_ITEM", cls.tokens_per_evaluation)
+            ),
+            tokens_per_summary=int(
+                os.getenv("SUMMARY_TOKENS_PER_CALL", cls.tokens_per_summary)
+            ),
+            overflow=os.getenv("EVALUATION_OVERFLOW", cls.overflow),
+        )
+
+    @property
+    def limited(self) -> bool:
+        return any(
+            limit is not None for limit in (self.max_items, self.max_tokens, self.max_seconds)
+        )
+
+
+@dataclass
+class BudgetUsage:
+    """What one ``evaluate_since`` run consumed of its budget."""
+
+    items: int = 0
+    summaries: int = 0
+    tokens: int = 0
+    seconds: float = 0.0
+    # Candidates given the budget's overflow decision instead of evaluated.
+    overflow: int = 0
+    # The first limit that stopped the run, e.g. "max_items".
+    exhausted: str | None = None
@@ -0,0 +1,232 @@
+"""Chains of relevance evaluators, cheapest first."""
+
+from __future__ import annotations
+
+import os
+import time
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass, field
+
+from rss_digest.metrics import LatencyHistogram
+from rss_digest.services.content.service import ArticleContentService
+from rss_digest.services.evaluation.judge import (
+    JUDGE_TIMEOUT_SECONDS_DEFAULT,
+    HttpJudgeEvaluator,
+)
+from rss_digest.services.evaluation.relevance import (
+    DEFER,
+    EvaluationResult,
+    KeywordRelevanceEvaluator,
+    RegexRelevanceEvaluator,
+    RelevanceEvaluator,
+    TermWeightScorer,
+)
+
+
+@dataclass(frozen=True)
+class CascadeStage:
+    name: str
+    evaluator: RelevanceEvaluator
+    # Optional confidence band on the evaluator's score: at or above
+    # ``include_at`` includes, at or below ``exclude_at`` excludes, anything
+    # in between defers. Without a band the evaluator's decision stands.
+    include_at: float | None = None
+    exclude_at: float | None = None
+
+    def decide(self, result: EvaluationResult) -> str:
+        if result.decision == DEFER or (self.include_at is None and self.exclude_at is None):
+            return result.decision
+        if self.include_at is not None and result.score >= self.include_at:
+            return "include"
+        if self.exclude_at is not None and result.score <= self.exclude_at:
+            return "exclude"
+        return DEFER
+
+
+@dataclass
+class StageStats:
+    seen: int = 0
+    decided: int = 0
+    # Seconds per stage call, covering the whole batch passed to the stage.
+    latency: LatencyHistogram = field(default_factory=LatencyHistogram)
+
+    @property
+    def passed_on(self) -> int:
+        """Items this stage deferred to the next one."""
+        return self.seen - self.decided
+
+    @property
+    def hit_rate(self) -> float:
+        return self.decided / self.seen if self.seen else 0.0
+
+
+class CascadeEvaluator(RelevanceEvaluator):
+    """Runs each URL through ``stages`` until one of them decides.
+
+    Every stage gets one ``evaluate_batch`` call with the URLs the earlier
+    stages deferred, so an expensive last stage only sees ambiguous items.
+    URLs no stage decides get the ``undecided`` decision. Each result's
+    reason names the deciding stage and lists the stages the URL went
+    through with their decision and per-item latency, e.g.
+    ``judge:relevant [keyword=defer/0.0ms, judge=include/812.5ms]``.
+    """
+
+    def __init__(
+        self,
+        stages: Sequence[CascadeStage],
+        undecided: str = "exclude",
+        *,
+        clock: Callable[[], float] = time.perf_counter,
+    ) -> None:
+        if not stages:
+            raise ValueError("a cascade needs at least one stage")
+        if undecided == DEFER:
+            raise ValueError("undecided items need a final decision")
+        self._stages = tuple(stages)
+        self._undecided = undecided
+        self._clock = clock
+        self.stats = {stage.name: StageStats() for stage in self._stages}
+
+    def evaluate(self, url: str) -> EvaluationResult:
+        return self.evaluate_batch([url])[0]
+
+    def evaluate_batch(self, urls: Sequence[str]) -> list[EvaluationResult]:
+        results: list[EvaluationResult | None] = [None] * len(urls)
+        trails: list[list[str]] = [[] for _ in urls]
+        last: list[EvaluationResult | None] = [None] * len(urls)
+        pending = list(range(len(urls)))
+        for stage in self._stages:
+            if not pending:
+                break
+            stats = self.stats[stage.name]
+            started = self._clock()
+            stage_results = stage.evaluator.evaluate_batch([urls[index] for index in pending])
+            elapsed = self._clock() - started
+            if len(stage_results) != len(pending):
+                raise ValueError(
+                    f"stage {stage.name} returned {len(stage_results)} results"
+                    f" for {len(pending)} items"
+                )
+            stats.seen += len(pending)
+            stats.latency.observe(elapsed)
+            per_item_ms = elapsed * 1000 / len(pending)
+            deferred = []
+            for index, result in zip(pending, stage_results):
+                decision = stage.decide(result)
+                trails[index].append(f"{stage.name}={decision}/{per_item_ms:.1f}ms")
+                last[index] = result
+                if decision == DEFER:
+                    deferred.append(index)
+                    continue
+                stats.decided += 1
+                results[index] = EvaluationResult(
+                    score=result.score,
+                    decision=decision,
+                    reason=f"{stage.name}:{result.reason} [{', '.join(trails[index])}]",
+                )
+            pending = deferred
+        for index in pending:
+            results[index] = EvaluationResult(
+                score=last[index].score,
+                decision=self._undecided,
+                reason=f"undecided [{', '.join(trails[index])}]",
+            )
+        return results
+
+
+@dataclass(frozen=True)
+class CascadeConfig:
+    """Which cascade stages run, cheapest first; unset stages are left out.
+
+    ``keyword`` and ``regex`` decide on a match and defer the rest,
+    ``scorer`` decides outside its ``scorer_exclude_at``..``scorer_include_at``
+    band and ``judge`` decides what is left. Items still undecided at the
+    end are excluded.
+    """
+
+    include_keywords: tuple[str, ...] = ()
+    exclude_keywords: tuple[str, ...] = ()
+    include_patterns: tuple[str, ...] = ()
+    exclude_patterns: tuple[str, ...] = ()
+    # Term -> weight of the local scorer.
+    term_weights: tuple[tuple[str, float], ...] = ()
+    term_bias: float = 0.0
+    scorer_include_at: float = 0.8
+    scorer_exclude_at: float = 0.2
+    judge_url: str | None = None
+    judge_timeout: float = JUDGE_TIMEOUT_SECONDS_DEFAULT
+
+    @classmethod
+    def from_env(cls) -> "CascadeConfig":
+        # Keywords and term:weight pairs are comma-separated, regular
+        # expressions whitespace-separated (write \s for a space in one).
+        return cls(
+            include_keywords=_split(os.getenv("EVALUATION_INCLUDE_KEYWORDS", ""), ","),
+            exclude_keywords=_split(os.getenv("EVALUATION_EXCLUDE_KEYWORDS", ""), ","),
+            include_patterns=_split(os.getenv("EVALUATION_INCLUDE_PATTERNS", "")),
+            exclude_patterns=_split(os.getenv("EVALUATION_EXCLUDE_PATTERNS", "")),
+            term_weights=tuple(
+                (term.strip(), float(weight))
+                for term, _, weight in (
+                    pair.rpartition(":")
+                    for pair in _split(os.getenv("EVALUATION_TERM_WEIGHTS", ""), ",")
+                )
+            ),
+            term_bias=float(os.getenv("EVALUATION_TERM_BIAS", cls.term_bias)),
+            scorer_include_at=float(
+                os.getenv("EVALUATION_SCORER_INCLUDE_AT", cls.scorer_include_at)
+            ),
+            scorer_exclude_at=float(
+                os.getenv("EVALUATION_SCORER_EXCLUDE_AT", cls.scorer_exclude_at)
+            ),
+            judge_url=os.getenv("EVALUATION_JUDGE_URL") or None,
+            judge_timeout=float(
+                os.getenv("EVALUATION_JUDGE_TIMEOUT_SECONDS", cls.judge_timeout)
+            ),
+        )
+
+    def build(self, content: ArticleContentService | None = None) -> RelevanceEvaluator:
+        """The configured evaluator; every stage reads article text from ``content``.
+
+        Without any stage configured this is a keyword evaluator without
+        keywords, which excludes everything.
+        """
+        stages: list[CascadeStage] = []
+        if self.include_keywords or self.exclude_keywords:
+            keyword = KeywordRelevanceEvaluator(
+                list(self.include_keywords),
+                list(self.exclude_keywords),
+                defer_unmatched=True,
+                content=content,
+            )
+            stages.append(CascadeStage("keyword", keyword))
+        if self.include_patterns or self.exclude_patterns:
+            regex = RegexRelevanceEvaluator(
+                self.include_patterns,
+                self.exclude_patterns,
+                defer_unmatched=True,
+                content=content,
+            )
+            stages.append(CascadeStage("regex", regex))
+        if self.term_weights:
+            scorer = TermWeightScorer(dict(self.term_weights), self.term_bias, content=content)
+            stages.append(
+                CascadeStage(
+                    "scorer",
+                    scorer,
+                    include_at=self.scorer_include_at,
+                    exclude_at=self.scorer_exclude_at,
+                )
+            )
+        if self.judge_url:
+            judge = HttpJudgeEvaluator(
+                self.judge_url, timeout=self.judge_timeout, content=content
+            )
+            stages.append(CascadeStage("judge", judge))
+        if not stages:
+            return KeywordRelevanceEvaluator(content=content)
+        return CascadeEvaluator(stages)
+
+
+def _split(value: str, separator: str | None = None) -> tuple[str, ...]:
+    return tuple(part.strip() for part in value.split(separator) if part.strip())
@@ -0,0 +1,59 @@
+"""Relevance judged by a hosted model behind an HTTP endpoint."""
+
+from __future__ import annotations
+
+from collections.abc import Sequence
+
+import httpx
+
+from rss_digest.services.content.service import ArticleContentService
+from rss_digest.services.evaluation.relevance import EvaluationResult, RelevanceEvaluator
+from rss_digest.services.rss.http_pool import get_pool
+
+JUDGE_TIMEOUT_SECONDS_DEFAULT = 30.0
+
+
+class HttpJudgeEvaluator(RelevanceEvaluator):
+    """Sends each batch to ``endpoint`` in one ``POST`` request.
+
+    The request body is ``{"urls": [...]}``, plus ``"texts"`` with each
+    URL's prefetched article text (or ``null``) when built with
+    ``content``. The endpoint answers ``{"results": [...]}`` with one
+    ``{"score", "decision", "reason"}`` object per URL, in order. Being the
+    most expensive evaluator, it belongs at the end of a
+    ``CascadeEvaluator``. Uses the process's pooled client unless given one.
+    """
+
+    def __init__(
+        self,
+        endpoint: str,
+        *,
+        client: httpx.Client | None = None,
+        timeout: float = JUDGE_TIMEOUT_SECONDS_DEFAULT,
+        content: ArticleContentService | None = None,
+    ) -> None:
+        self._endpoint = endpoint
+        self._client = client
+        self._timeout = timeout
+        self._content = content
+
+    def evaluate(self, url: str) -> EvaluationResult:
+        return self.evaluate_batch([url])[0]
+
+    def evaluate_batch(self, urls: Sequence[str]) -> list[EvaluationResult]:
+        if not urls:
+            return []
+        body: dict[str, list[str | None]] = {"urls": list(urls)}
+        if self._content is not None:
+            body["texts"] = [self._content.text(url) for url in urls]
+        client = self._client or get_pool().client
+        response = client.post(self._endpoint, json=body, timeout=self._timeout)
+        response.raise_for_status()
+        return [
+            EvaluationResult(
+                score=float(result["score"]),
+                decision=result["decision"],
+                reason=result.get("reason", ""),
+            )
+            for result in response.json()["results"]
+        ]
@@ -0,0 +1,80 @@
+"""Single-pass multi-keyword matching (Aho-Corasick)."""
+
+from __future__ import annotations
+
+from collections import deque
+from collections.abc import Iterable
+from functools import lru_cache
+
+AUTOMATON_CACHE_SIZE = 128
+
+
+class KeywordAutomaton:
+    """Finds every keyword occurring in a text in one pass over the text.
+
+    Keywords and texts are compared case-insensitively. The trie's failure
+    links are folded into a full transition table when the automaton is
+    built, so scanning is one dict lookup per character however many
+    keywords there are.
+    """
+
+    def __init__(self, keywords: Iterable[str]) -> None:
+        self.keywords: tuple[str, ...] = tuple(
+            sorted({keyword.lower() for keyword in keywords if keyword})
+        )
+        self._transitions: list[dict[str, int]] = [{}]
+        self._outputs: list[tuple[int, ...]] = [()]
+        for index, keyword in enumerate(self.keywords):
+            self._insert(index, keyword)
+        self._link()
+
+    def __bool__(self) -> bool:
+        return bool(self.keywords)
+
+    def matches(self, text: str) -> set[str]:
+        """Distinct keywords that occur in ``text``."""
+        found: set[int] = set()
+        transitions = self._transitions
+        outputs = self._outputs
+        state = 0
+        for char in text.lower():
+            state = transitions[state].get(char, 0)
+            if outputs[state]:
+                found.update(outputs[state])
+        return {self.keywords[index] for index in found}
+
+    def _insert(self, index: int, keyword: str) -> None:
+        state = 0
+        for char in keyword:
+            next_state = self._transitions[state].get(char)
+            if next_state is None:
+                next_state = len(self._transitions)
+                self._transitions.append({})
+                self._outputs.append(())
+                self._transitions[state][char] = next_state
+            state = next_state
+        self._outputs[state] += (index,)
+
+    def _link(self) -> None:
+        """Resolve failure links breadth-first into direct transitions."""
+        fail = [0] * len(self._transitions)
+        queue = deque(self._transitions[0].values())
+        while queue:
+            state = queue.popleft()
+            fallback = self._transitions[fail[state]]
+            self._outputs[state] += self._outputs[fail[state]]
+            for char, next_state in list(self._transitions[state].items()):
+                fail[next_state] = fallback.get(char, 0)
+                queue.append(next_state)
+            for char, target in fallback.items():
+                self._transitions[state].setdefault(char, target)
+
+
+def compile_keywords(keywords: Iterable[str]) -> KeywordAutomaton:
+    """Automaton for ``keywords``, shared by every caller with the same set."""
+    return _compile(frozenset(keyword.lower() for keyword in keywords if keyword))
+
+
+@lru_cache(maxsize=AUTOMATON_CACHE_SIZE)
+def _compile(keywords: frozenset[str]) -> KeywordAutomaton:
+    return KeywordAutomaton(keywords)
@@ -2,8 +2,17 @@
 
 from __future__ import annotations
 
+import math
+import re
+from collections.abc import Iterable, Mapping, Sequence
 from dataclasses import dataclass
 
+from rss_digest.services.content.service import ArticleContentService
+from rss_digest.services.evaluation.matching import compile_keywords
+
+# Decision for "not sure": a cascade hands the item to its next stage.
+DEFER = "defer"
+
 
 @dataclass
 class EvaluationResult:
@@ -16,14 +25,121 @@ class RelevanceEvaluator:
     def evaluate(self, url: str) -> EvaluationResult:
         raise NotImplementedError
 
+    def evaluate_batch(self, urls: Sequence[str]) -> list[EvaluationResult]:
+        """Results for ``urls`` in order.
+
+        Falls back to one ``evaluate`` call per URL; evaluators backed by a
+        remote model should override it to make one request per batch.
+        """
+        return [self.evaluate(url) for url in urls]
+
 
 class KeywordRelevanceEvaluator(RelevanceEvaluator):
-    def __init__(self, include_keywords: list[str] | None = None) -> None:
-        self._keywords = [keyword.lower() for keyword in (include_keywords or [])]
+    """Includes URLs containing any keyword, scored by how many they contain.
+
+    One matching keyword scores 0.9 and each further distinct keyword moves
+    the score closer to 1 (``1 - 0.1 / matches``). URLs containing an
+    exclude keyword are excluded first. With ``defer_unmatched`` URLs that
+    match neither list are deferred instead of excluded, which makes this a
+    cheap first stage for a ``CascadeEvaluator``.
+
+    With ``content`` the keywords are also looked for in the article text
+    the service prefetched for the URL, when it has any.
+    """
+
+    def __init__(
+        self,
+        include_keywords: list[str] | None = None,
+        exclude_keywords: list[str] | None = None,
+        *,
+        defer_unmatched: bool = False,
+        content: ArticleContentService | None = None,
+    ) -> None:
+        self._matcher = compile_keywords(include_keywords or [])
+        self._excluder = compile_keywords(exclude_keywords or [])
+        self._unmatched = DEFER if defer_unmatched else "exclude"
+        self._content = content
 
     def evaluate(self, url: str) -> EvaluationResult:
-        lowered = url.lower()
-        for keyword in self._keywords:
-            if keyword in lowered:
-                return EvaluationResult(score=0.9, decision="include", reason="keyword")
-        return EvaluationResult(score=0.1, decision="exclude", reason="no_keyword")
+        text = article_text(self._content, url)
+        if self._excluder and self._excluder.matches(text):
+            return EvaluationResult(score=0.0, decision="exclude", reason="exclude_keyword")
+        matches = len(self._matcher.matches(text)) if self._matcher else 0
+        if matches:
+            return EvaluationResult(score=1 - 0.1 / matches, decision="include", reason="keyword")
+        return EvaluationResult(score=0.1, decision=self._unmatched, reason="no_keyword")
+
+
+class RegexRelevanceEvaluator(RelevanceEvaluator):
+    """Includes URLs matching any include pattern, like the keyword evaluator.
+
+    Patterns are case-insensitive regular expressions searched anywhere in
+    the URL, and in the prefetched article text with ``content``. URLs
+    matching an exclude pattern are excluded first; ``defer_unmatched``
+    defers the rest to a cascade's next stage.
+    """
+
+    def __init__(
+        self,
+        include_patterns: Iterable[str] | None = None,
+        exclude_patterns: Iterable[str] | None = None,
+        *,
+        defer_unmatched: bool = False,
+        content: ArticleContentService | None = None,
+    ) -> None:
+        self._include = _compile_patterns(include_patterns or [])
+        self._exclude = _compile_patterns(exclude_patterns or [])
+        self._unmatched = DEFER if defer_unmatched else "exclude"
+        self._content = content
+
+    def evaluate(self, url: str) -> EvaluationResult:
+        text = article_text(self._content, url)
+        if self._exclude is not None and self._exclude.search(text):
+            return EvaluationResult(score=0.0, decision="exclude", reason="exclude_pattern")
+        if self._include is not None and self._include.search(text):
+            return EvaluationResult(score=0.9, decision="include", reason="pattern")
+        return EvaluationResult(score=0.1, decision=self._unmatched, reason="no_pattern")
+
+
+class TermWeightScorer(RelevanceEvaluator):
+    """A local linear scorer over weighted terms, for a cascade's middle stage.
+
+    The score is ``sigmoid(bias + sum of the weights of the distinct terms
+    found)`` in the URL and, with ``content``, the article text; negative
+    weights pull towards exclusion. Scores of 0.5 or more include. Give its
+    ``CascadeStage`` an ``include_at``/``exclude_at`` band so that only
+    confident scores decide and the rest go on to the judge.
+    """
+
+    def __init__(
+        self,
+        weights: Mapping[str, float],
+        bias: float = 0.0,
+        *,
+        content: ArticleContentService | None = None,
+    ) -> None:
+        self._weights = {term.lower(): weight for term, weight in weights.items() if term}
+        self._matcher = compile_keywords(self._weights)
+        self._bias = bias
+        self._content = content
+
+    def evaluate(self, url: str) -> EvaluationResult:
+        found = self._matcher.matches(article_text(self._content, url)) if self._matcher else ()
+        logit = self._bias + sum(self._weights[term] for term in found)
+        # Clamped so that math.exp cannot overflow on extreme weights.
+        score = 1 / (1 + math.exp(-max(min(logit, 50.0), -50.0)))
+        decision = "include" if score >= 0.5 else "exclude"
+        return EvaluationResult(score=score, decision=decision, reason=f"terms:{len(found)}")
+
+
+def _compile_patterns(patterns: Iterable[str]) -> re.Pattern[str] | None:
+    patterns = [pattern for pattern in patterns if pattern]
+    if not patterns:
+        return None
+    return re.compile("|".join(f"(?:{pattern})" for pattern in patterns), re.IGNORECASE)
+
+
+def article_text(content: ArticleContentService | None, url: str) -> str:
+    """``url`` followed by its prefetched article text, if ``content`` has any."""
+    text = content.text(url) if content is not None else None
+    return f"{url}\n{text}" if text else url
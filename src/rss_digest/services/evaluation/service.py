@@ -2,25 +2,42 @@
 
 from __future__ import annotations
 
-from dataclasses import dataclass
+import heapq
+import time
+from collections.abc import Callable
+from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Iterable
+from typing import Sequence
+from uuid import UUID
 
-from rss_digest.db.models import GroupItem, ItemEvaluation, ItemSummary
+from rss_digest.db.models import Item, ItemEvaluation, ItemSummary
 from rss_digest.repository import (
     GroupItemsRepo,
     ItemEvaluationsRepo,
     ItemSummariesRepo,
     ItemsRepo,
+    SummaryCacheRepo,
 )
-from rss_digest.services.evaluation.relevance import RelevanceEvaluator
+from rss_digest.services.content.service import ArticleContentService
+from rss_digest.services.evaluation.budget import BudgetUsage, EvaluationBudget
+from rss_digest.services.evaluation.cascade import CascadeEvaluator, StageStats
+from rss_digest.services.evaluation.relevance import DEFER, RelevanceEvaluator
 from rss_digest.services.evaluation.summarizer import Summarizer
+from rss_digest.services.evaluation.summary_runner import (
+    SummaryBuckets,
+    SummaryLimits,
+    SummaryRunner,
+    SummaryStats,
+)
+
+EVALUATION_BATCH_SIZE_DEFAULT = 20
 
 
 @dataclass
 class EvaluationSummaryResult:
     evaluations: list[ItemEvaluation]
     summaries: list[ItemSummary]
+    budget: BudgetUsage = field(default_factory=BudgetUsage)
 
 
 class EvaluationService:
@@ -32,49 +49,271 @@ class EvaluationService:
         summaries: ItemSummariesRepo,
         evaluator: RelevanceEvaluator,
         summarizer: Summarizer,
+        batch_size: int = EVALUATION_BATCH_SIZE_DEFAULT,
+        summary_limits: SummaryLimits | None = None,
+        summary_cache: SummaryCacheRepo | None = None,
+        budget: EvaluationBudget | None = None,
+        prescorer: RelevanceEvaluator | None = None,
+        content: ArticleContentService | None = None,
+        *,
+        summary_buckets: SummaryBuckets | None = None,
+        clock: Callable[[], float] = time.monotonic,
     ) -> None:
+        if batch_size < 1:
+            raise ValueError("batch_size must be positive")
         self._items = items
         self._group_items = group_items
         self._evaluations = evaluations
         self._summaries = summaries
         self._evaluator = evaluator
         self._summarizer = summarizer
+        self._summary_runner = SummaryRunner(
+            summarizer, summary_limits, buckets=summary_buckets
+        )
+        self._summary_cache = summary_cache
+        self._batch_size = batch_size
+        self._budget = budget or EvaluationBudget()
+        self._prescorer = prescorer
+        self._content = content
+        self._clock = clock
+
+    @property
+    def summary_stats(self) -> SummaryStats:
+        return self._summary_runner.stats
+
+    @property
+    def stage_stats(self) -> dict[str, StageStats]:
+        """Per-stage stats when the evaluator is a cascade, else empty."""
+        if isinstance(self._evaluator, CascadeEvaluator):
+            return self._evaluator.stats
+        return {}
 
     def evaluate_since(self, group_id, since: datetime) -> EvaluationSummaryResult:
-        target_items = self._group_items.list_since(group_id, since)
+        """Evaluate the group's unevaluated items since ``since``; summarize includes.
+
+        Candidates come from one anti-join query. Evaluations and new
+        summaries are written together in one transaction at the end; items
+        another run evaluated in the meantime keep that run's results.
+
+        With a limited budget, candidates are taken best first by pre-score
+        and then recency until a limit is reached; the rest get the budget's
+        overflow decision with a ``budget:<limit>`` reason. Included items
+        the budget cannot summarize are treated as overflow too.
+        """
+        started = self._clock()
+        usage = BudgetUsage()
+        candidates = self._prioritize(self._items.list_unevaluated(group_id, since))
+        overflow: dict[UUID, str] = {}
+        if self._budget.max_items is not None:
+            for item in candidates[self._budget.max_items :]:
+                overflow[item.id] = "max_items"
+            candidates = candidates[: self._budget.max_items]
+        if self._content is not None and candidates:
+            # Evaluators and summarizers built on the same content service
+            # read the article text from here instead of downloading it.
+            self._content.prefetch(candidates)
+
         evaluations: list[ItemEvaluation] = []
-        summaries: list[ItemSummary] = []
-        for group_item in target_items:
-            if self._evaluations.find(group_id, group_item.item_id):
-                continue
-            item = self._items.get(group_item.item_id)
-            if item is None:
+        for start in range(0, len(candidates), self._batch_size):
+            batch = candidates[start : start + self._batch_size]
+            affordable, limit = self._affordable(
+                len(batch), self._budget.tokens_per_evaluation, usage, started
+            )
+            if affordable:
+                evaluations.extend(self._evaluate_batch(group_id, batch[:affordable]))
+                usage.items += affordable
+                usage.tokens += affordable * self._budget.tokens_per_evaluation
+            if limit is not None:
+                for item in candidates[start + affordable :]:
+                    overflow[item.id] = limit
+                break
+
+        items = {item.id: item for item in candidates}
+        included = [
+            evaluation.item_id for evaluation in evaluations if evaluation.decision == "include"
+        ]
+        existing = self._summaries.find_many(group_id, included)
+        texts, failure = self._summarize(
+            [items[item_id] for item_id in included if item_id not in existing],
+            usage,
+            overflow,
+            started,
+        )
+        evaluations = [
+            evaluation for evaluation in evaluations if evaluation.item_id not in overflow
+        ]
+        evaluations += [
+            ItemEvaluation(
+                group_id=group_id,
+                item_id=item_id,
+                relevance_score=0.0,
+                decision=self._budget.overflow,
+                reason=f"budget:{limit}",
+            )
+            for item_id, limit in overflow.items()
+        ]
+        usage.overflow = len(overflow)
+        usage.exhausted = next(iter(overflow.values()), None)
+
+        if evaluations:
+            # Postponed by an earlier run; replaced by this run's decision.
+            self._evaluations.delete_postponed(
+                group_id, [evaluation.item_id for evaluation in evaluations], commit=False
+            )
+        evaluations = self._evaluations.add_many(evaluations, commit=False)
+        stored = {evaluation.item_id for evaluation in evaluations}
+        new_summaries = self._summaries.add_many(
+            ItemSummary(group_id=group_id, item_id=item_id, summary_md=text)
+            for item_id, text in texts.items()
+            if item_id in stored
+        )
+        summaries_by_item = {summary.item_id: summary for summary in new_summaries}
+        summaries_by_item.update(existing)
+        summaries = [
+            summaries_by_item[item_id] for item_id in included if item_id in summaries_by_item
+        ]
+        usage.seconds = self._clock() - started
+        if failure is not None:
+            raise failure
+        return EvaluationSummaryResult(evaluations=evaluations, summaries=summaries, budget=usage)
+
+    def collect_since(self, group_id, since: datetime) -> EvaluationSummaryResult:
+        """Everything a digest for ``since`` should report, evaluating stragglers.
+
+        Items linked since ``since`` that no one has evaluated yet, and
+        items earlier runs postponed, are evaluated now; the result then
+        holds every final evaluation no earlier digest reported, whether it
+        was made here or in the background, with the summaries of the
+        included ones. Call ``mark_reported`` once the digest is out.
+        """
+        stragglers = self.evaluate_since(group_id, since)
+        evaluations = self._evaluations.list_unreported(group_id)
+        included = [
+            evaluation.item_id for evaluation in evaluations if evaluation.decision == "include"
+        ]
+        summaries_by_item = self._summaries.find_many(group_id, included)
+        return EvaluationSummaryResult(
+            evaluations=evaluations,
+            summaries=[
+                summaries_by_item[item_id] for item_id in included if item_id in summaries_by_item
+            ],
+            budget=stragglers.budget,
+        )
+
+    def mark_reported(self, result: EvaluationSummaryResult, reported_at: datetime) -> None:
+        self._evaluations.mark_reported(
+            (evaluation.id for evaluation in result.evaluations), reported_at
+        )
+
+    def _prioritize(self, candidates: list[Item]) -> list[Item]:
+        """Candidates best first: highest pre-score, then most recently linked.
+
+        ``candidates`` come oldest first; without a limited budget their
+        order is kept.
+        """
+        if not self._budget.limited or not candidates:
+            return candidates
+        if self._prescorer is None:
+            scores = [0.0] * len(candidates)
+        else:
+            urls = [item.canonical_url for item in candidates]
+            scores = [result.score for result in self._prescorer.evaluate_batch(urls)]
+        count = min(self._budget.max_items or len(candidates), len(candidates))
+        top = heapq.nlargest(count, range(len(candidates)), key=lambda i: (scores[i], i))
+        chosen = set(top)
+        rest = [index for index in reversed(range(len(candidates))) if index not in chosen]
+        return [candidates[index] for index in top + rest]
+
+    def _affordable(
+        self, wanted: int, tokens_each: int, usage: BudgetUsage, started: float
+    ) -> tuple[int, str | None]:
+        """How many of ``wanted`` calls fit the budget, and the limit if not all."""
+        budget = self._budget
+        if budget.max_seconds is not None and self._clock() - started >= budget.max_seconds:
+            return 0, "max_seconds"
+        if budget.max_tokens is not None and tokens_each > 0:
+            fits = max(budget.max_tokens - usage.tokens, 0) // tokens_each
+            if fits < wanted:
+                return fits, "max_tokens"
+        return wanted, None
+
+    def _summarize(
+        self,
+        items: list[Item],
+        usage: BudgetUsage,
+        overflow: dict[UUID, str],
+        started: float,
+    ) -> tuple[dict[UUID, str], BaseException | None]:
+        """Summary text per item id, concurrently, reusing the shared cache.
+
+        Items whose summarizer call failed are left out; the first failure
+        is returned for the caller to raise once the rest is stored. Items
+        the budget cannot pay a summarizer call for are added to
+        ``overflow``.
+        """
+        texts = self._cached_summaries(items)
+        to_call = [item for item in items if item.id not in texts]
+        affordable, limit = self._affordable(
+            len(to_call), self._budget.tokens_per_summary, usage, started
+        )
+        for item in to_call[affordable:]:
+            overflow[item.id] = limit
+        to_call = to_call[:affordable]
+        usage.summaries += len(to_call)
+        usage.tokens += len(to_call) * self._budget.tokens_per_summary
+        results = self._summary_runner.summarize_all([item.canonical_url for item in to_call])
+        failure: BaseException | None = None
+        fresh: dict[bytes, str] = {}
+        for item, result in zip(to_call, results):
+            if isinstance(result, BaseException):
+                failure = failure or result
                 continue
-            evaluation = self._evaluate_item(group_id, group_item, item.canonical_url)
-            evaluations.append(evaluation)
-            if evaluation.decision == "include":
-                summary = self._summaries.find(group_id, group_item.item_id)
-                if summary is None:
-                    summary_text = self._summarizer.summarize(item.canonical_url)
-                    summary = ItemSummary(
-                        group_id=group_id,
-                        item_id=group_item.item_id,
-                        summary_md=summary_text,
-                    )
-                    self._summaries.add(summary)
-                summaries.append(summary)
-        return EvaluationSummaryResult(evaluations=evaluations, summaries=summaries)
-
-    def _evaluate_item(
-        self, group_id, group_item: GroupItem, url: str
-    ) -> ItemEvaluation:
-        result = self._evaluator.evaluate(url)
-        evaluation = ItemEvaluation(
-            group_id=group_id,
-            item_id=group_item.item_id,
-            relevance_score=result.score,
-            decision=result.decision,
-            reason=result.reason,
+            texts[item.id] = result
+            fresh[item.canonical_url_hash] = result
+        if fresh and self._summary_cache is not None:
+            self._summary_cache.put_many(
+                fresh, self._summarizer.identity, self._summarizer.prompt_hash
+            )
+        return texts, failure
+
+    def _cached_summaries(self, items: list[Item]) -> dict[UUID, str]:
+        if self._summary_cache is None or not items:
+            return {}
+        cached = self._summary_cache.get_many(
+            (item.canonical_url_hash for item in items),
+            self._summarizer.identity,
+            self._summarizer.prompt_hash,
         )
-        self._evaluations.add(evaluation)
-        return evaluation
+        self._summary_runner.stats.cache_hits += len(cached)
+        return {
+            item.id: cached[item.canonical_url_hash]
+            for item in items
+            if item.canonical_url_hash in cached
+        }
+
+    def _evaluate_batch(self, group_id, batch: Sequence[Item]) -> list[ItemEvaluation]:
+        """Evaluate one batch with a single evaluator call.
+
+        There is no later stage to hand a deferred item to, so a top-level
+        "defer" is stored as an exclude, like a cascade's undecided items.
+        """
+        results = self._evaluator.evaluate_batch([item.canonical_url for item in batch])
+        if len(results) != len(batch):
+            raise ValueError(
+                f"evaluator returned {len(results)} results for {len(batch)} items"
+            )
+        evaluations: list[ItemEvaluation] = []
+        for item, result in zip(batch, results):
+            decision, reason = result.decision, result.reason
+            if decision == DEFER:
+                decision, reason = "exclude", f"undecided:{reason}"
+            evaluations.append(
+                ItemEvaluation(
+                    group_id=group_id,
+                    item_id=item.id,
+                    relevance_score=result.score,
+                    decision=decision,
+                    reason=reason,
+                )
+            )
+        return evaluations
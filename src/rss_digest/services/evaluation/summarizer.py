@@ -2,12 +2,74 @@
 
 from __future__ import annotations
 
+from rss_digest.services.content.service import ArticleContentService
+
+# Longest lead paragraph ``SimpleSummarizer`` uses as a summary.
+LEAD_CHARS_DEFAULT = 300
+
 
 class Summarizer:
+    # Bump whenever this summarizer's output would change (model, prompt,
+    # format) so that cached summaries from the old version are not reused.
+    version = "1"
+
+    @property
+    def identity(self) -> str:
+        return f"{type(self).__name__}:{self.version}"
+
+    @property
+    def prompt_hash(self) -> str:
+        """Hash of a configurable prompt, or "" for summarizers without one."""
+        return ""
+
     def summarize(self, url: str) -> str:
         raise NotImplementedError
 
 
 class SimpleSummarizer(Summarizer):
+    """Summarizes an item by its article's lead paragraph.
+
+    The lead is taken from the text ``content`` prefetched for the URL and
+    cut to ``lead_chars``; items without article text get a placeholder
+    naming the URL.
+    """
+
+    version = "2"
+
+    def __init__(
+        self,
+        content: ArticleContentService | None = None,
+        lead_chars: int = LEAD_CHARS_DEFAULT,
+    ) -> None:
+        self._content = content
+        self._lead_chars = lead_chars
+
     def summarize(self, url: str) -> str:
-        return f"Summary for {url}"
+        text = self._content.text(url) if self._content is not None else None
+        if not text:
+            return f"Summary for {url}"
+        return text.split("\n", 1)[0][: self._lead_chars]
+
+
+class SummarizerError(RuntimeError):
+    """Raised by summarizers when the backing service rejects a call.
+
+    ``status_code`` is the upstream HTTP status when there is one; 429 and
+    5xx answers are retried, honouring ``retry_after_seconds`` if given.
+    """
+
+    def __init__(
+        self,
+        message: str,
+        status_code: int | None = None,
+        retry_after_seconds: float | None = None,
+    ) -> None:
+        super().__init__(message)
+        self.status_code = status_code
+        self.retry_after_seconds = retry_after_seconds
+
+    @property
+    def retryable(self) -> bool:
+        return self.status_code is not None and (
+            self.status_code == 429 or self.status_code >= 500
+        )
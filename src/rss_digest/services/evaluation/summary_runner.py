@@ -0,0 +1,164 @@
+"""Concurrent, rate-limited calls to a ``Summarizer``."""
+
+from __future__ import annotations
+
+import os
+import random
+import threading
+import time
+from collections.abc import Callable, Sequence
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+
+from rss_digest.metrics import LatencyHistogram
+from rss_digest.ratelimit import TokenBucket
+from rss_digest.services.evaluation.summarizer import Summarizer, SummarizerError
+
+
+@dataclass(frozen=True)
+class SummaryLimits:
+    max_concurrency: int = 4
+    # Unset limits are not enforced.
+    requests_per_minute: float | None = None
+    tokens_per_minute: float | None = None
+    # Tokens charged against ``tokens_per_minute`` for each call.
+    tokens_per_call: int = 1000
+    max_attempts: int = 4
+    base_delay: float = 1.0
+    max_delay: float = 30.0
+    jitter: float = 0.2
+
+    @classmethod
+    def from_env(cls) -> "SummaryLimits":
+        rpm = os.getenv("SUMMARY_REQUESTS_PER_MINUTE")
+        tpm = os.getenv("SUMMARY_TOKENS_PER_MINUTE")
+        return cls(
+            max_concurrency=int(os.getenv("SUMMARY_CONCURRENCY", cls.max_concurrency)),
+            requests_per_minute=float(rpm) if rpm else None,
+            tokens_per_minute=float(tpm) if tpm else None,
+            tokens_per_call=int(os.getenv("SUMMARY_TOKENS_PER_CALL", cls.tokens_per_call)),
+            max_attempts=int(os.getenv("SUMMARY_MAX_ATTEMPTS", cls.max_attempts)),
+        )
+
+    def retry_delay(self, attempt: int, rng: Callable[[], float] = random.random) -> float:
+        delay = min(self.base_delay * 2 ** (attempt - 1), self.max_delay)
+        return delay * (1 + self.jitter * (2 * rng() - 1))
+
+
+@dataclass(frozen=True)
+class SummaryBuckets:
+    """Per-minute request and token buckets; unset limits have no bucket.
+
+    Build one per process and hand it to every ``SummaryRunner`` so the
+    limits, and 429 pauses, hold across runs instead of per run.
+    """
+
+    requests: TokenBucket | None = None
+    tokens: TokenBucket | None = None
+
+    @classmethod
+    def from_limits(
+        cls, limits: SummaryLimits, clock: Callable[[], float] = time.monotonic
+    ) -> "SummaryBuckets":
+        def bucket(per_minute: float | None, per_call: int) -> TokenBucket | None:
+            if per_minute is None:
+                return None
+            # Lets every worker start at once, then settles to the per-minute rate.
+            return TokenBucket(per_minute / 60.0, per_call * limits.max_concurrency, clock)
+
+        return cls(
+            requests=bucket(limits.requests_per_minute, 1),
+            tokens=bucket(limits.tokens_per_minute, limits.tokens_per_call),
+        )
+
+
+@dataclass
+class SummaryStats:
+    calls: int = 0
+    retries: int = 0
+    failures: int = 0
+    # Summaries reused from the shared cache instead of calling the summarizer.
+    cache_hits: int = 0
+    latency: LatencyHistogram = field(default_factory=LatencyHistogram)
+
+
+class SummaryRunner:
+    """Runs ``Summarizer.summarize`` for many URLs on a bounded thread pool.
+
+    Every attempt first reserves one request and ``tokens_per_call`` tokens
+    from the per-minute buckets. A ``SummarizerError`` with a 429 or 5xx
+    status is retried with exponential backoff (or its ``Retry-After``),
+    and a 429 also pauses the request bucket so the other workers back off
+    with it. Each attempt's latency is recorded in ``stats.latency``.
+    Runners given the same ``buckets`` share those limits.
+    """
+
+    def __init__(
+        self,
+        summarizer: Summarizer,
+        limits: SummaryLimits | None = None,
+        *,
+        buckets: SummaryBuckets | None = None,
+        sleep: Callable[[float], None] = time.sleep,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._summarizer = summarizer
+        self._limits = limits or SummaryLimits()
+        self._sleep = sleep
+        self._clock = clock
+        buckets = buckets or SummaryBuckets.from_limits(self._limits, clock)
+        self._requests = buckets.requests
+        self._tokens = buckets.tokens
+        self._stats_lock = threading.Lock()
+        self.stats = SummaryStats()
+
+    def summarize_all(self, urls: Sequence[str]) -> list[str | BaseException]:
+        """Summaries in the order of ``urls``; failed calls yield their exception."""
+        if not urls:
+            return []
+        workers = min(self._limits.max_concurrency, len(urls))
+        if workers <= 1:
+            return [self._summarize_or_error(url) for url in urls]
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            return list(pool.map(self._summarize_or_error, urls))
+
+    def _summarize_or_error(self, url: str) -> str | BaseException:
+        try:
+            return self._summarize(url)
+        except Exception as exc:  # noqa: BLE001 - reported per item
+            self._count("failures")
+            return exc
+
+    def _summarize(self, url: str) -> str:
+        attempt = 1
+        while True:
+            self._throttle()
+            started = self._clock()
+            self._count("calls")
+            try:
+                return self._summarizer.summarize(url)
+            except SummarizerError as exc:
+                if not exc.retryable or attempt >= self._limits.max_attempts:
+                    raise
+                delay = exc.retry_after_seconds or self._limits.retry_delay(attempt)
+                rate_limited = exc.status_code == 429
+            finally:
+                self.stats.latency.observe(self._clock() - started)
+            if rate_limited and self._requests is not None:
+                self._requests.pause(delay)
+            self._count("retries")
+            self._sleep(delay)
+            attempt += 1
+
+    def _throttle(self) -> None:
+        wait = 0.0
+        if self._requests is not None:
+            wait = max(wait, self._requests.reserve() or 0.0)
+        if self._tokens is not None:
+            wait = max(wait, self._tokens.reserve(self._limits.tokens_per_call) or 0.0)
+        if wait:
+            self._sleep(wait)
+
+    def _count(self, name: str) -> None:
+        with self._stats_lock:
+            setattr(self.stats, name, getattr(self.stats, name) + 1)
@@ -2,49 +2,140 @@
 
 from __future__ import annotations
 
-from dataclasses import dataclass
+from collections.abc import Callable
+from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from typing import Iterable
+from uuid import UUID
 
-from rss_digest.dedup import canonical_url_hash, normalize_url
-from rss_digest.db.models import FeedItem, GroupItem, Item
-from rss_digest.repository import GroupItemsRepo, ItemsRepo
+from rss_digest.bloom import KnownHashes
+from rss_digest.dedup import canonicalize_many
+from rss_digest.db.models import FeedItem
+from rss_digest.repository import GroupFeedsRepo, GroupItemsRepo, ItemsRepo
 
 
 @dataclass
 class MaterializedResult:
-    items: list[Item]
-    group_items: list[GroupItem]
+    item_ids: list[UUID]
+    group_item_ids: list[UUID]
+    # Groups that received at least one new group item.
+    group_ids: set[UUID] = field(default_factory=set)
 
 
 class MaterializeService:
-    def __init__(self, items: ItemsRepo, group_items: GroupItemsRepo) -> None:
+    def __init__(
+        self,
+        items: ItemsRepo,
+        group_items: GroupItemsRepo,
+        known_hashes: KnownHashes | None = None,
+        group_feeds: GroupFeedsRepo | None = None,
+        on_linked: Callable[[set[UUID]], None] | None = None,
+    ) -> None:
         self._items = items
         self._group_items = group_items
+        self._known_hashes = known_hashes
+        self._group_feeds = group_feeds
+        # Called with the groups ``fan_out`` gave new group items, after commit.
+        # A group's own catch-up ``materialize`` runs right before it
+        # evaluates, so it does not notify.
+        self._on_linked = on_linked
 
     def materialize(
         self, group_id, feed_items: Iterable[FeedItem]
     ) -> MaterializedResult:
-        new_items: list[Item] = []
-        new_group_items: list[GroupItem] = []
-        for feed_item in feed_items:
-            canonical_url = normalize_url(feed_item.url)
-            url_hash = canonical_url_hash(canonical_url)
-            item = self._items.find_by_hash(url_hash)
-            if item is None:
-                item = Item(
-                    canonical_url=canonical_url,
-                    canonical_url_hash=url_hash,
-                    first_seen_at=datetime.now(timezone.utc),
-                )
-                item = self._items.add(item)
-                new_items.append(item)
+        """Create missing items and group items for a batch in bulk.
+
+        Existing items are resolved with one ``IN`` query over the canonical
+        hashes; missing items and then all group items are written with
+        multi-row inserts that ignore unique-key conflicts, so concurrent
+        runs cannot fail each other. Both inserts commit together.
+        """
+        url_by_hash = {
+            url_hash: url
+            for url, url_hash in canonicalize_many(feed_item.url for feed_item in feed_items)
+        }
+        if not url_by_hash:
+            return MaterializedResult(item_ids=[], group_item_ids=[])
+        item_ids, new_item_ids = self._ensure_items(url_by_hash)
+        links = self._group_items.add_links(
+            ((group_id, item_ids[url_hash]) for url_hash in url_by_hash),
+            datetime.now(timezone.utc),
+        )
+        return self._result(new_item_ids, links)
+
+    def fan_out(self, feed_items: Iterable[FeedItem]) -> MaterializedResult:
+        """Materialize new feed items into every group subscribed to their feed.
+
+        Subscribers are resolved once per feed source, and each URL is
+        canonicalized and looked up once however many groups share the
+        feed, so the cost follows the number of new items rather than items
+        times subscribers. Requires ``group_feeds``.
+        """
+        if self._group_feeds is None:
+            raise ValueError("fan_out needs a GroupFeedsRepo")
+        feed_items = list(feed_items)
+        subscribers = self._group_feeds.subscribers(
+            {feed_item.feed_source_id for feed_item in feed_items}
+        )
+        feed_items = [
+            feed_item for feed_item in feed_items if feed_item.feed_source_id in subscribers
+        ]
+        canonical = canonicalize_many(feed_item.url for feed_item in feed_items)
+        url_by_hash = {url_hash: url for url, url_hash in canonical}
+        if not url_by_hash:
+            return MaterializedResult(item_ids=[], group_item_ids=[])
+        item_ids, new_item_ids = self._ensure_items(url_by_hash)
+        links = {
+            (group_id, item_ids[url_hash])
+            for feed_item, (_, url_hash) in zip(feed_items, canonical)
+            for group_id in subscribers[feed_item.feed_source_id]
+        }
+        created = self._group_items.add_links(links, datetime.now(timezone.utc))
+        result = self._result(new_item_ids, created)
+        if result.group_ids and self._on_linked is not None:
+            self._on_linked(result.group_ids)
+        return result
 
-            group_item = GroupItem(
-                group_id=group_id,
-                item_id=item.id,
-                first_seen_at=datetime.now(timezone.utc),
+    @staticmethod
+    def _result(new_item_ids: list[UUID], links: dict[UUID, UUID]) -> MaterializedResult:
+        return MaterializedResult(
+            item_ids=new_item_ids, group_item_ids=list(links), group_ids=set(links.values())
+        )
+
+    def _ensure_items(
+        self, url_by_hash: dict[bytes, str]
+    ) -> tuple[dict[bytes, UUID], list[UUID]]:
+        """Item ids for every hash, inserting missing items without committing.
+
+        Returns the full hash -> id mapping and the ids of new items.
+        """
+        item_ids = self._find_item_ids(url_by_hash)
+        missing = {
+            url_hash: url for url_hash, url in url_by_hash.items() if url_hash not in item_ids
+        }
+        if not missing:
+            return item_ids, []
+        new_item_ids = self._items.add_new(
+            missing, datetime.now(timezone.utc), commit=False
+        )
+        item_ids.update(new_item_ids)
+        if len(new_item_ids) < len(missing):
+            # Inserted concurrently by another run since our lookup.
+            item_ids.update(
+                self._items.ids_by_hashes(
+                    url_hash for url_hash in missing if url_hash not in item_ids
+                )
             )
-            if self._group_items.add_if_new(group_item):
-                new_group_items.append(group_item)
-        return MaterializedResult(items=new_items, group_items=new_group_items)
+        if self._known_hashes is not None:
+            self._known_hashes.items.add_many(new_item_ids)
+        return item_ids, list(new_item_ids.values())
+
+    def _find_item_ids(self, url_hashes: Iterable[bytes]) -> dict[bytes, UUID]:
+        """Ids of existing items, skipping hashes the filter rules out."""
+        if self._known_hashes is None:
+            return self._items.ids_by_hashes(url_hashes)
+        bloom = self._known_hashes.items
+        maybe = [url_hash for url_hash in url_hashes if bloom.check(url_hash)]
+        found = self._items.ids_by_hashes(maybe) if maybe else {}
+        bloom.record_false_positives(len(maybe) - len(found))
+        return found
@@ -15,11 +15,14 @@ from rss_digest.repository import (
     GroupFeedsRepo,
     GroupsRepo,
     Repositories,
+    as_utc,
 )
 from rss_digest.services.digest.delivery import DeliveryService
 from rss_digest.services.digest.builder import DigestBuilder
+from rss_digest.services.evaluation.budget import BudgetUsage
 from rss_digest.services.evaluation.service import EvaluationService
 from rss_digest.services.materialize.service import MaterializeService
+from rss_digest.services.rss.coordinator import FetchCoordinator
 from rss_digest.services.rss.fetcher import RssFetcher
 from rss_digest.services.digest.storage import StorageService
 
@@ -30,6 +33,9 @@ LOOKBACK_HOURS_DEFAULT = 24
 @dataclass
 class PipelineResult:
     digest: Digest
+    # Age of the group's most recent feed fetch when the run started.
+    fetch_lag_seconds: float | None = None
+    evaluation_budget: BudgetUsage | None = None
 
 
 class GroupPipeline:
@@ -43,6 +49,7 @@ class GroupPipeline:
         storage: StorageService,
         delivery: DeliveryService,
         lookback_hours: int = LOOKBACK_HOURS_DEFAULT,
+        fetch_coordinator: FetchCoordinator | None = None,
     ) -> None:
         self._repositories = repositories
         self._groups = repositories.groups
@@ -57,6 +64,7 @@ class GroupPipeline:
         self._storage = storage
         self._delivery = delivery
         self._lookback_hours = lookback_hours
+        self._fetch_coordinator = fetch_coordinator
 
     def run(self, group_id: UUID, scheduled_at: datetime) -> PipelineResult:
         group = self._groups.get(group_id)
@@ -65,9 +73,15 @@ class GroupPipeline:
         started_at = datetime.now(timezone.utc)
         since = self._determine_since(group, scheduled_at)
         feed_sources = self._load_feed_sources(group_id)
-        feed_items = self._fetcher.fetch_group(feed_sources)
+        fetch_lag_seconds = _fetch_lag_seconds(feed_sources, started_at)
+        if self._fetch_coordinator is not None:
+            feed_items = self._fetch_coordinator.fetch_group(
+                feed_sources, since, group_id=group_id
+            )
+        else:
+            feed_items = self._fetcher.fetch_group(feed_sources)
         materialized = self._materializer.materialize(group_id, feed_items)
-        evaluation_result = self._evaluator.evaluate_since(group_id, since)
+        evaluation_result = self._evaluator.collect_since(group_id, since)
         digest = self._compose_digest(
             group,
             scheduled_at,
@@ -83,13 +97,16 @@ class GroupPipeline:
         digest = self._digests.add(digest)
         destinations = self._destinations.list_enabled(group_id)
         self._delivery.deliver(digest.id, destinations)
+        self._evaluator.mark_reported(evaluation_result, datetime.now(timezone.utc))
         self._groups.update_run_times(group_id, started_at, datetime.now(timezone.utc))
-        return PipelineResult(digest=digest)
+        return PipelineResult(
+            digest=digest,
+            fetch_lag_seconds=fetch_lag_seconds,
+            evaluation_budget=evaluation_result.budget,
+        )
 
     def _determine_since(self, group: Group, scheduled_at: datetime) -> datetime:
-        if group.last_run_started_at:
-            return group.last_run_started_at
-        return scheduled_at - timedelta(hours=self._lookback_hours)
+        return determine_since(group, scheduled_at, self._lookback_hours)
 
     def _load_feed_sources(self, group_id: UUID) -> list[FeedSource]:
         group_feeds = self._group_feeds.list_enabled(group_id)
@@ -124,3 +141,25 @@ class GroupPipeline:
             scheduled_at=scheduled_at,
             markdown_body=markdown,
         )
+
+
+def determine_since(
+    group: Group, scheduled_at: datetime, lookback_hours: int = LOOKBACK_HOURS_DEFAULT
+) -> datetime:
+    """Start of the window a run at ``scheduled_at`` reports on.
+
+    The previous run's start, or ``lookback_hours`` before ``scheduled_at``
+    for a group's first run.
+    """
+    if group.last_run_started_at:
+        return group.last_run_started_at
+    return scheduled_at - timedelta(hours=lookback_hours)
+
+
+def _fetch_lag_seconds(
+    feed_sources: Iterable[FeedSource], started_at: datetime
+) -> float | None:
+    fetched = [as_utc(source.last_fetch_at) for source in feed_sources if source.last_fetch_at]
+    if not fetched:
+        return None
+    return (started_at - max(fetched)).total_seconds()
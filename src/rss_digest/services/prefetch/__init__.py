@@ -0,0 +1 @@
+"""Background feed prefetching."""
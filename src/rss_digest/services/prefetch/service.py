@@ -0,0 +1,62 @@
+"""Refresh feeds ahead of scheduled pipeline runs."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+
+from rss_digest.repository import FeedSourcesRepo
+from rss_digest.services.rss.coordinator import FetchCoordinator
+from rss_digest.services.scheduler.service import SchedulerService
+
+LEAD_TIME_MINUTES_DEFAULT = 5
+BATCH_SIZE_DEFAULT = 200
+
+
+@dataclass
+class PrefetchResult:
+    upcoming_schedules: int = 0
+    fetched_for_schedules: int = 0
+    fetched_due: int = 0
+
+
+class FeedPrefetcher:
+    """Keeps feed items current so scheduled runs rarely hit the network.
+
+    Each run first fetches the feeds of groups whose schedules fire within
+    ``lead_time``, treating any feed that would become due before the run as
+    due now. It then works through up to ``batch_size`` feeds whose own
+    polling schedule is due. Fetches go through the ``FetchCoordinator``, so
+    they share its freshness window and claims with scheduled runs.
+    """
+
+    def __init__(
+        self,
+        coordinator: FetchCoordinator,
+        feed_sources: FeedSourcesRepo,
+        scheduler: SchedulerService,
+        lead_time: timedelta = timedelta(minutes=LEAD_TIME_MINUTES_DEFAULT),
+        batch_size: int = BATCH_SIZE_DEFAULT,
+    ) -> None:
+        self._coordinator = coordinator
+        self._feed_sources = feed_sources
+        self._scheduler = scheduler
+        self._lead_time = lead_time
+        self._batch_size = batch_size
+
+    def run(self, now: datetime | None = None) -> PrefetchResult:
+        now = now or datetime.now(timezone.utc)
+        result = PrefetchResult()
+        upcoming = self._scheduler.upcoming(now, self._lead_time)
+        result.upcoming_schedules = len(upcoming)
+        if upcoming:
+            group_ids = {due.group.id for due in upcoming}
+            result.fetched_for_schedules = self._coordinator.refresh(
+                self._feed_sources.list_for_groups(group_ids),
+                now,
+                due_by=max(due.scheduled_at for due in upcoming),
+            )
+        result.fetched_due = self._coordinator.refresh(
+            self._feed_sources.list_due(now, self._batch_size), now
+        )
+        return result
@@ -0,0 +1,115 @@
+"""Share feed fetches between the groups that subscribe to the same feed."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Iterable
+from uuid import UUID
+
+from rss_digest.db.models import FeedItem, FeedSource
+from rss_digest.repository import FeedItemsRepo, FeedSourcesRepo, as_utc
+from rss_digest.services.materialize.service import MaterializeService
+from rss_digest.services.rss.fetcher import RssFetcher
+
+FRESHNESS_SECONDS_DEFAULT = 300
+
+
+@dataclass
+class FetchTickStats:
+    # Feeds reused because they were fetched within the freshness window.
+    hits: int = 0
+    misses: int = 0
+    # Stale feeds skipped because their polling interval has not elapsed.
+    not_due: int = 0
+    # Stale feeds another run claimed first.
+    claimed_elsewhere: int = 0
+
+
+class FetchCoordinator:
+    """Fetch each feed source at most once per freshness window.
+
+    Freshness comes from ``FeedSource.last_fetch_at`` and stale feeds are
+    claimed with an atomic update before fetching, so the window holds across
+    groups, ticks and workers; feeds whose adaptive polling schedule says they
+    are not due yet are not claimed either. A fresh feed may have been fetched on behalf of
+    another group, so ``fetch_group`` returns every feed item first seen since
+    ``since`` instead of only the ones its own fetches discovered;
+    materialization is idempotent, so re-offered items are harmless.
+
+    With a ``materializer``, items found by a fetch are fanned out to every
+    subscribing group right away, and ``fetch_group`` given a ``group_id``
+    only returns the items still missing from that group (for example from
+    feeds it subscribed to after they were fetched).
+    """
+
+    def __init__(
+        self,
+        fetcher: RssFetcher,
+        feed_sources: FeedSourcesRepo,
+        feed_items: FeedItemsRepo,
+        freshness: timedelta = timedelta(seconds=FRESHNESS_SECONDS_DEFAULT),
+        materializer: MaterializeService | None = None,
+    ) -> None:
+        self._fetcher = fetcher
+        self._feed_sources = feed_sources
+        self._feed_items = feed_items
+        self._freshness = freshness
+        self._materializer = materializer
+        self.stats = FetchTickStats()
+
+    def fetch_group(
+        self,
+        feed_sources: Iterable[FeedSource],
+        since: datetime,
+        now: datetime | None = None,
+        group_id: UUID | None = None,
+    ) -> list[FeedItem]:
+        sources = list(feed_sources)
+        self.refresh(sources, now)
+        source_ids = [source.id for source in sources]
+        if group_id is not None and self._materializer is not None:
+            return self._feed_items.list_unlinked_since(group_id, source_ids, since)
+        return self._feed_items.list_seen_since(source_ids, since)
+
+    def refresh(
+        self,
+        feed_sources: Iterable[FeedSource],
+        now: datetime | None = None,
+        due_by: datetime | None = None,
+    ) -> int:
+        """Fetch the stale feeds that are due by ``due_by`` (default ``now``).
+
+        Returns how many feeds were fetched.
+        """
+        now = now or datetime.now(timezone.utc)
+        due_by = due_by or now
+        stale_before = now - self._freshness
+        to_fetch: list[FeedSource] = []
+        for source in feed_sources:
+            if self._is_fresh(source, stale_before):
+                self.stats.hits += 1
+                continue
+            if not self._fetcher.is_due(source, due_by):
+                self.stats.not_due += 1
+                continue
+            if not self._feed_sources.claim_fetch(
+                source.id, claimed_at=now, stale_before=stale_before
+            ):
+                self.stats.claimed_elsewhere += 1
+                continue
+            self.stats.misses += 1
+            to_fetch.append(source)
+        if to_fetch:
+            new_items = self._fetcher.fetch_group(to_fetch, due_by)
+            if self._materializer is not None and new_items:
+                self._materializer.fan_out(new_items)
+        return len(to_fetch)
+
+    def reset_stats(self) -> FetchTickStats:
+        stats, self.stats = self.stats, FetchTickStats()
+        return stats
+
+    @staticmethod
+    def _is_fresh(source: FeedSource, stale_before: datetime) -> bool:
+        return source.last_fetch_at is not None and as_utc(source.last_fetch_at) >= stale_before
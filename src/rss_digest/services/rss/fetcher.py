@@ -2,14 +2,22 @@
 
 from __future__ import annotations
 
+import asyncio
 from dataclasses import dataclass
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 import hashlib
-from typing import Callable, Iterable, Optional
+from itertools import islice, zip_longest
+import time
+from typing import Any, Awaitable, Callable, Coroutine, Iterable, Iterator, Optional
+from uuid import UUID
 
-from rss_digest.dedup import canonical_url_hash
+from rss_digest.bloom import KnownHashes, guid_key
+from rss_digest.dedup import canonicalize
 from rss_digest.db.models import FeedItem, FeedSource
-from rss_digest.repository import FeedItemsRepo, FeedSourcesRepo
+from rss_digest.repository import FeedItemsRepo, FeedSourcesRepo, as_utc
+from rss_digest.services.rss.health import BackoffPolicy, HostCircuitBreaker
+from rss_digest.services.rss.politeness import host_key
+from rss_digest.services.rss.polling import PollingPolicy
 
 
 @dataclass
@@ -24,7 +32,10 @@ class FeedFetchResult:
     status_code: int
     etag: str | None = None
     last_modified: str | None = None
-    entries: list[FeedEntry] = None  # type: ignore[assignment]
+    entries: Iterable[FeedEntry] = None  # type: ignore[assignment]
+    refresh_hint_seconds: int | None = None
+    body_sha256: str | None = None
+    retry_after_seconds: int | None = None
 
     def __post_init__(self) -> None:
         if self.entries is None:
@@ -32,83 +43,414 @@ class FeedFetchResult:
 
 
 FetchFunc = Callable[[FeedSource], FeedFetchResult]
+AsyncFetchFunc = Callable[[FeedSource], Awaitable[FeedFetchResult]]
+LoopRunner = Callable[[Coroutine[Any, Any, Any]], Any]
+
+MAX_CONCURRENCY_DEFAULT = 20
+PER_HOST_LIMIT_DEFAULT = 4
+KNOWN_RUN_DEFAULT = 5
+EARLY_STOP_BATCH_DEFAULT = 20
+ORDER_SAMPLE_MIN = 3
 
 
 class FetchError(RuntimeError):
     """Raised when fetching RSS feeds fails."""
 
 
+@dataclass
+class FetchStats:
+    skipped_not_due: int = 0
+    unchanged_body: int = 0
+    skipped_backoff: int = 0
+    skipped_host_open: int = 0
+    failures: int = 0
+    failure_seconds: float = 0.0
+    early_stops: int = 0
+    deferred: int = 0
+
+    def estimated_seconds_saved(self, fallback_seconds: float = 15.0) -> float:
+        """Fetch time avoided by skipping backed-off feeds and open hosts.
+
+        Each skipped fetch is valued at the mean duration of the failed
+        fetches observed so far, or ``fallback_seconds`` (the request timeout)
+        before any failure has been timed.
+        """
+        per_fetch = self.failure_seconds / self.failures if self.failures else fallback_seconds
+        return (self.skipped_backoff + self.skipped_host_open) * per_fetch
+
+
 class RssFetcher:
     def __init__(
         self,
         feed_sources: FeedSourcesRepo,
         feed_items: FeedItemsRepo,
         fetch_func: FetchFunc,
+        async_fetch_func: AsyncFetchFunc | None = None,
+        *,
+        max_concurrency: int = MAX_CONCURRENCY_DEFAULT,
+        per_host_limit: int = PER_HOST_LIMIT_DEFAULT,
+        loop_runner: LoopRunner = asyncio.run,
+        polling: PollingPolicy | None = None,
+        backoff: BackoffPolicy | None = None,
+        host_breaker: HostCircuitBreaker | None = None,
+        known_run: int = KNOWN_RUN_DEFAULT,
+        early_stop_batch: int = EARLY_STOP_BATCH_DEFAULT,
+        known_hashes: KnownHashes | None = None,
     ) -> None:
         self._feed_sources = feed_sources
         self._feed_items = feed_items
         self._fetch_func = fetch_func
+        self._async_fetch_func = async_fetch_func
+        self._max_concurrency = max_concurrency
+        self._per_host_limit = per_host_limit
+        self._loop_runner = loop_runner
+        self._polling = polling or PollingPolicy()
+        self._backoff = backoff or BackoffPolicy()
+        self._host_breaker = host_breaker or HostCircuitBreaker()
+        self._known_run = known_run
+        self._early_stop_batch = early_stop_batch
+        self._known_hashes = known_hashes
+        self.stats = FetchStats()
 
     def fetch(self, feed_source: FeedSource) -> list[FeedItem]:
+        started = time.perf_counter()
         try:
             result = self._fetch_func(feed_source)
         except Exception as exc:  # noqa: BLE001 - surface failure
-            self._mark_failure(feed_source)
+            self._record_failure(feed_source, started, host_failure=True)
+            raise FetchError(str(exc)) from exc
+        return self._apply_result(feed_source, result, started)
+
+    async def fetch_async(self, feed_source: FeedSource) -> list[FeedItem]:
+        started = time.perf_counter()
+        try:
+            if self._async_fetch_func is not None:
+                result = await self._async_fetch_func(feed_source)
+            else:
+                result = await asyncio.to_thread(self._fetch_func, feed_source)
+        except Exception as exc:  # noqa: BLE001 - surface failure
+            self._record_failure(feed_source, started, host_failure=True)
             raise FetchError(str(exc)) from exc
+        return self._apply_result(feed_source, result, started)
 
+    def _apply_result(
+        self, feed_source: FeedSource, result: FeedFetchResult, started: float
+    ) -> list[FeedItem]:
+        if result.status_code == 429:
+            self._mark_deferred(feed_source, result.retry_after_seconds)
+            return []
+        if result.status_code != 304 and not 200 <= result.status_code < 300:
+            self._record_failure(
+                feed_source, started, host_failure=result.status_code >= 500
+            )
+            raise FetchError(f"status={result.status_code}")
+        self._host_breaker.record_success(host_key(feed_source.url))
         if result.status_code == 304:
+            if result.body_sha256 is not None:
+                self.stats.unchanged_body += 1
             self._mark_success(feed_source, result)
             return []
-        if result.status_code >= 400:
-            self._mark_failure(feed_source)
-            raise FetchError(f"status={result.status_code}")
 
+        new_items, published, stopped = self._store_entries(feed_source, result.entries)
+        if stopped:
+            self.stats.early_stops += 1
+        self._mark_success(
+            feed_source,
+            result,
+            len(new_items),
+            published,
+            # Only a full read shows the feed's order; a prefix proves nothing.
+            newest_first=None if stopped else _newest_first(published),
+        )
+        return new_items
+
+    def _store_entries(
+        self, feed_source: FeedSource, entries: Iterable[FeedEntry]
+    ) -> tuple[list[FeedItem], list[datetime], bool]:
+        """Insert unseen entries; returns new items, publish times and early stop.
+
+        Feeds known to list newest entries first are checked in batches and
+        reading stops after ``known_run`` consecutive known GUIDs, closing the
+        entry iterator so a streaming parser stops too. Other feeds are
+        checked with a single query.
+        """
+        ordered = bool(feed_source.entries_newest_first)
+        batch_size = self._early_stop_batch if ordered else None
+        iterator = iter(entries)
+        seen: set[bytes] = set()
+        published: list[datetime] = []
+        new_items: list[FeedItem] = []
+        known_run = 0
+        stopped = False
+        try:
+            for batch in _batches(iterator, batch_size):
+                pending: dict[bytes, FeedEntry] = {}
+                for entry in batch:
+                    guid_hash = self._hash_guid(entry.guid)
+                    if guid_hash in seen:
+                        continue
+                    seen.add(guid_hash)
+                    pending[guid_hash] = entry
+                    if entry.published_at is not None:
+                        published.append(entry.published_at)
+                if not pending:
+                    continue
+                known = self._existing_guids(feed_source.id, pending)
+                candidates = [
+                    FeedItem(
+                        feed_source_id=feed_source.id,
+                        guid_hash=guid_hash,
+                        url=entry.url,
+                        published_at=entry.published_at,
+                        canonical_url_hash=canonicalize(entry.url)[1],
+                    )
+                    for guid_hash, entry in pending.items()
+                    if guid_hash not in known
+                ]
+                if candidates:
+                    inserted = self._feed_items.add_many(candidates)
+                    # Rows skipped on conflict were stored by another worker
+                    # since the filter was warmed; they count as known.
+                    inserted_guids = {item.guid_hash for item in inserted}
+                    conflicted = {
+                        item.guid_hash
+                        for item in candidates
+                        if item.guid_hash not in inserted_guids
+                    }
+                    known |= conflicted
+                    if self._known_hashes is not None:
+                        self._known_hashes.guids.add_many(
+                            guid_key(feed_source.id, guid_hash)
+                            for guid_hash in inserted_guids | conflicted
+                        )
+                    new_items.extend(inserted)
+                for guid_hash in pending:
+                    if guid_hash not in known:
+                        known_run = 0
+                        continue
+                    known_run += 1
+                    if ordered and known_run >= self._known_run:
+                        stopped = True
+                        break
+                if stopped:
+                    break
+        finally:
+            close = getattr(iterator, "close", None)
+            if close is not None:
+                close()
+        return new_items, published, stopped
+
+    def _existing_guids(
+        self, feed_source_id: UUID, guid_hashes: Iterable[bytes]
+    ) -> set[bytes]:
+        """Stored GUID hashes, asking the database only about possible hits."""
+        if self._known_hashes is None:
+            return self._feed_items.existing_guids(feed_source_id, guid_hashes)
+        guids = self._known_hashes.guids
+        maybe = [
+            guid_hash
+            for guid_hash in guid_hashes
+            if guids.check(guid_key(feed_source_id, guid_hash))
+        ]
+        if not maybe:
+            return set()
+        found = self._feed_items.existing_guids(feed_source_id, maybe)
+        guids.record_false_positives(len(maybe) - len(found))
+        return found
+
+    def fetch_group(
+        self, feed_sources: Iterable[FeedSource], due_by: datetime | None = None
+    ) -> list[FeedItem]:
+        """Fetch every feed due by ``due_by``; failures are recorded, not raised."""
+        if self._async_fetch_func is not None:
+            return self._loop_runner(self.fetch_group_async(feed_sources, due_by))
         new_items: list[FeedItem] = []
-        for entry in result.entries:
-            guid_hash = self._hash_guid(entry.guid)
-            if self._feed_items.exists_guid(feed_source.id, guid_hash):
+        for feed_source in _interleave_hosts(self._due(feed_sources, due_by)):
+            if not self._host_allows(feed_source):
+                continue
+            try:
+                new_items.extend(self.fetch(feed_source))
+            except FetchError:
                 continue
-            feed_item = FeedItem(
-                feed_source_id=feed_source.id,
-                guid_hash=guid_hash,
-                url=entry.url,
-                published_at=entry.published_at,
-                canonical_url_hash=canonical_url_hash(entry.url),
+        return new_items
+
+    async def fetch_group_async(
+        self, feed_sources: Iterable[FeedSource], due_by: datetime | None = None
+    ) -> list[FeedItem]:
+        """Fetch all sources concurrently, capped globally and per host.
+
+        Network I/O overlaps; result handling (dedup, fetch metadata) runs on
+        the event loop thread so the repositories' session is never shared
+        across threads. As in ``fetch_group``, failures are recorded on the
+        feed and in ``stats`` rather than raised.
+        """
+        global_limit = asyncio.Semaphore(self._max_concurrency)
+        host_limits: dict[str, asyncio.Semaphore] = {}
+
+        async def fetch_one(feed_source: FeedSource) -> list[FeedItem]:
+            host = host_key(feed_source.url)
+            host_limit = host_limits.setdefault(
+                host, asyncio.Semaphore(self._per_host_limit)
             )
-            feed_item = self._feed_items.add(feed_item)
-            new_items.append(feed_item)
+            async with host_limit:
+                if not self._host_allows(feed_source):
+                    return []
+                async with global_limit:
+                    return await self.fetch_async(feed_source)
 
-        self._mark_success(feed_source, result)
+        results = await asyncio.gather(
+            *(
+                fetch_one(feed_source)
+                for feed_source in _interleave_hosts(self._due(feed_sources, due_by))
+            ),
+            return_exceptions=True,
+        )
+        new_items: list[FeedItem] = []
+        for result in results:
+            if isinstance(result, FetchError):
+                continue
+            if isinstance(result, BaseException):
+                raise result
+            new_items.extend(result)
         return new_items
 
-    def fetch_group(self, feed_sources: Iterable[FeedSource]) -> list[FeedItem]:
-        new_items: list[FeedItem] = []
+    def is_due(self, feed_source: FeedSource, now: datetime | None = None) -> bool:
+        if feed_source.next_fetch_after is None:
+            return True
+        now = now or datetime.now(timezone.utc)
+        return as_utc(feed_source.next_fetch_after) <= now
+
+    def _due(
+        self, feed_sources: Iterable[FeedSource], due_by: datetime | None = None
+    ) -> list[FeedSource]:
+        now = due_by or datetime.now(timezone.utc)
+        due: list[FeedSource] = []
         for feed_source in feed_sources:
-            new_items.extend(self.fetch(feed_source))
-        return new_items
+            if self.is_due(feed_source, now):
+                due.append(feed_source)
+            elif feed_source.consecutive_failures:
+                self.stats.skipped_backoff += 1
+            else:
+                self.stats.skipped_not_due += 1
+        return due
+
+    def _host_allows(self, feed_source: FeedSource) -> bool:
+        if self._host_breaker.allow(host_key(feed_source.url), datetime.now(timezone.utc)):
+            return True
+        self.stats.skipped_host_open += 1
+        return False
+
+    def _record_failure(
+        self, feed_source: FeedSource, started: float, *, host_failure: bool
+    ) -> None:
+        self.stats.failures += 1
+        self.stats.failure_seconds += time.perf_counter() - started
+        if host_failure:
+            self._host_breaker.record_failure(
+                host_key(feed_source.url), datetime.now(timezone.utc)
+            )
+        self._mark_failure(feed_source)
 
-    def _mark_success(self, feed_source: FeedSource, result: FeedFetchResult) -> None:
+    def _mark_success(
+        self,
+        feed_source: FeedSource,
+        result: FeedFetchResult,
+        new_items: int = 0,
+        published: Iterable[datetime] = (),
+        *,
+        newest_first: bool | None = None,
+    ) -> None:
+        fetched_at = datetime.now(timezone.utc)
+        etag, last_modified = result.etag, result.last_modified
+        if result.status_code == 304:
+            # A 304 confirms the validators we sent; keep them unless replaced.
+            etag = etag or feed_source.etag
+            last_modified = last_modified or feed_source.last_modified
+        interval = self._polling.next_interval(
+            feed_source.poll_interval_seconds,
+            new_items=new_items,
+            published=published,
+            hint_seconds=result.refresh_hint_seconds,
+        )
         self._feed_sources.update_fetch_meta(
             feed_source.id,
-            etag=result.etag,
-            last_modified=result.last_modified,
-            fetched_at=datetime.now(timezone.utc),
+            etag=etag,
+            last_modified=last_modified,
+            fetched_at=fetched_at,
             failures=0,
             status="healthy",
+            poll_interval_seconds=interval,
+            next_fetch_after=fetched_at + timedelta(seconds=interval),
+            body_sha256=result.body_sha256,
+            entries_newest_first=newest_first,
+        )
+
+    def _mark_deferred(self, feed_source: FeedSource, retry_after: int | None) -> None:
+        """Rate limited: try again later without counting a failure."""
+        self.stats.deferred += 1
+        fetched_at = datetime.now(timezone.utc)
+        delay = (
+            timedelta(seconds=retry_after)
+            if retry_after is not None
+            else self._backoff.base_delay
+        )
+        self._feed_sources.update_fetch_meta(
+            feed_source.id,
+            etag=feed_source.etag,
+            last_modified=feed_source.last_modified,
+            fetched_at=fetched_at,
+            failures=feed_source.consecutive_failures,
+            status=feed_source.health_status,
+            next_fetch_after=fetched_at + delay,
         )
 
     def _mark_failure(self, feed_source: FeedSource) -> None:
         failures = feed_source.consecutive_failures + 1
-        status = "dead" if failures >= 5 else "degraded"
+        fetched_at = datetime.now(timezone.utc)
         self._feed_sources.update_fetch_meta(
             feed_source.id,
             etag=feed_source.etag,
             last_modified=feed_source.last_modified,
-            fetched_at=datetime.now(timezone.utc),
+            fetched_at=fetched_at,
             failures=failures,
-            status=status,
+            status=self._backoff.status_for(failures),
+            next_fetch_after=fetched_at + self._backoff.retry_delay(failures),
         )
 
     @staticmethod
-    def _hash_guid(guid: str) -> str:
-        return hashlib.sha256(guid.encode("utf-8")).hexdigest()
+    def _hash_guid(guid: str) -> bytes:
+        return hashlib.sha256(guid.encode("utf-8")).digest()
+
+
+def _batches(
+    entries: Iterator[FeedEntry], size: int | None
+) -> Iterator[list[FeedEntry]]:
+    if size is None:
+        yield list(entries)
+        return
+    while batch := list(islice(entries, size)):
+        yield batch
+
+
+def _newest_first(published: list[datetime]) -> bool | None:
+    """Whether publish times (in document order) never increase.
+
+    Returns None when there are too few dated entries to tell.
+    """
+    if len(published) < ORDER_SAMPLE_MIN:
+        return None
+    return all(newer >= older for newer, older in zip(published, published[1:]))
+
+
+def _interleave_hosts(feed_sources: list[FeedSource]) -> list[FeedSource]:
+    """Round-robin feeds across hosts so no host's queue blocks the others."""
+    by_host: dict[str, list[FeedSource]] = {}
+    for feed_source in feed_sources:
+        by_host.setdefault(host_key(feed_source.url), []).append(feed_source)
+    queues = list(by_host.values())
+    return [
+        feed_source
+        for round_ in zip_longest(*queues)
+        for feed_source in round_
+        if feed_source is not None
+    ]
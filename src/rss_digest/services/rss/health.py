@@ -0,0 +1,92 @@
+"""Failure backoff and circuit breaking for feed fetching."""
+
+from __future__ import annotations
+
+import random
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+
+
+@dataclass(frozen=True)
+class BackoffPolicy:
+    """Per-feed retry schedule after consecutive failures.
+
+    Delays double from ``base_delay`` up to ``max_delay``. Once a feed is
+    dead its circuit is open: it is only retried every ``probe_interval``,
+    and a successful probe makes it healthy again.
+    """
+
+    base_delay: timedelta = timedelta(minutes=5)
+    max_delay: timedelta = timedelta(hours=2)
+    dead_after: int = 5
+    probe_interval: timedelta = timedelta(hours=6)
+    jitter: float = 0.2
+
+    def status_for(self, failures: int) -> str:
+        return "dead" if failures >= self.dead_after else "degraded"
+
+    def retry_delay(
+        self, failures: int, rng: Callable[[], float] = random.random
+    ) -> timedelta:
+        if failures >= self.dead_after:
+            delay = self.probe_interval
+        else:
+            delay = min(self.base_delay * 2 ** max(failures - 1, 0), self.max_delay)
+        return delay * (1 + self.jitter * (2 * rng() - 1))
+
+
+@dataclass
+class _HostState:
+    failures: int = 0
+    open_until: datetime | None = None
+    # When the single half-open probe was let through, if one is out.
+    probe_started: datetime | None = None
+
+
+@dataclass
+class HostCircuitBreaker:
+    """Stops fetching from a host after repeated transport or 5xx failures.
+
+    While open, every feed on the host is skipped without a request. After
+    ``cooldown`` the breaker is half-open: it lets a single probe request
+    through and keeps holding the host's other feeds back. A successful
+    probe closes it, a failed one reopens it for another ``cooldown``. A
+    probe that never reports back (deferred, or failed for a feed-level
+    reason) is given up on after ``cooldown`` and another one is allowed.
+    """
+
+    failure_threshold: int = 3
+    cooldown: timedelta = timedelta(minutes=10)
+    _hosts: dict[str, _HostState] = field(default_factory=dict)
+
+    def allow(self, host: str, now: datetime) -> bool:
+        """Whether a request to ``host`` may go out; claims the probe if half-open."""
+        if self.is_open(host, now):
+            return False
+        state = self._hosts.get(host)
+        if state is not None and state.open_until is not None:
+            state.probe_started = now
+        return True
+
+    def is_open(self, host: str, now: datetime) -> bool:
+        state = self._hosts.get(host)
+        if state is None or state.open_until is None:
+            return False
+        if now < state.open_until:
+            return True
+        probe = state.probe_started
+        return probe is not None and now < probe + self.cooldown
+
+    def record_success(self, host: str) -> None:
+        self._hosts.pop(host, None)
+
+    def record_failure(self, host: str, now: datetime) -> None:
+        state = self._hosts.setdefault(host, _HostState())
+        state.failures += 1
+        if state.failures >= self.failure_threshold:
+            state.open_until = now + self.cooldown
+            state.probe_started = None
+
+    def open_hosts(self, now: datetime) -> list[str]:
+        return [host for host in self._hosts if self.is_open(host, now)]
@@ -2,36 +2,255 @@
 
 from __future__ import annotations
 
+import asyncio
+from collections.abc import Callable, Iterator
 from datetime import datetime, timezone
+import hashlib
+import os
+import time
+
 import feedparser
 import httpx
 
 from rss_digest.db.models import FeedSource
 from rss_digest.services.rss.fetcher import FeedEntry, FeedFetchResult
+from rss_digest.services.rss.http_pool import get_pool
+from rss_digest.services.rss.lite_parser import (
+    MAX_BYTES_DEFAULT,
+    LiteEntryParser,
+    LiteParseError,
+)
+from rss_digest.services.rss.politeness import get_host_scheduler, retry_after_seconds
+from rss_digest.services.rss.polling import (
+    combine_hints,
+    feed_refresh_hint,
+    header_refresh_hint,
+)
 
 
 def fetch_feed(feed_source: FeedSource) -> FeedFetchResult:
+    wait = get_host_scheduler().reserve(feed_source.url)
+    if wait is None:
+        return FeedFetchResult(status_code=429)
+    if wait:
+        time.sleep(wait)
+    client = get_pool().client
+    headers = _conditional_headers(feed_source)
+    if not _use_lite_parser():
+        return _to_result(client.get(feed_source.url, headers=headers), feed_source)
+    response = client.send(client.build_request("GET", feed_source.url, headers=headers), stream=True)
+    result = _status_result(response, feed_source)
+    if result is not None:
+        response.close()
+        return result
+    result = _streamed_result(response)
+    result.entries = _stream_entries(
+        response, result, lambda: client.get(feed_source.url).content
+    )
+    return result
+
+
+async def fetch_feed_async(feed_source: FeedSource) -> FeedFetchResult:
+    wait = get_host_scheduler().reserve(feed_source.url)
+    if wait is None:
+        return FeedFetchResult(status_code=429)
+    if wait:
+        await asyncio.sleep(wait)
+    client = get_pool().async_client
+    headers = _conditional_headers(feed_source)
+    if not _use_lite_parser():
+        response = await client.get(feed_source.url, headers=headers)
+        return _to_result(response, feed_source)
+    response = await client.send(
+        client.build_request("GET", feed_source.url, headers=headers), stream=True
+    )
+    try:
+        result = _status_result(response, feed_source)
+        if result is not None:
+            return result
+        # The caller consumes entries synchronously, so they are parsed here
+        # as the bytes arrive; the body itself is never held in memory.
+        result = _streamed_result(response)
+        stream = _LiteStream(result)
+        entries: list[FeedEntry] = []
+        try:
+            async for chunk in response.aiter_bytes():
+                entries.extend(stream.feed(chunk))
+                if stream.done:
+                    break
+            else:
+                stream.close()
+        except LiteParseError:
+            fallback = await client.get(feed_source.url)
+            entries.extend(stream.fall_back(fallback.content))
+        result.entries = entries
+        stream.finish()
+        return result
+    finally:
+        await response.aclose()
+
+
+def _use_lite_parser() -> bool:
+    return os.getenv("RSS_FEED_PARSER", "feedparser").lower() == "lite"
+
+
+def _lite_max_bytes() -> int:
+    return int(os.getenv("RSS_FEED_MAX_BYTES", MAX_BYTES_DEFAULT))
+
+
+def _conditional_headers(feed_source: FeedSource) -> dict[str, str]:
     headers: dict[str, str] = {}
     if feed_source.etag:
         headers["If-None-Match"] = feed_source.etag
     if feed_source.last_modified:
         headers["If-Modified-Since"] = feed_source.last_modified
+    return headers
 
-    response = httpx.get(feed_source.url, headers=headers, timeout=15)
+
+def _status_result(
+    response: httpx.Response, feed_source: FeedSource
+) -> FeedFetchResult | None:
+    """Result for responses without a feed body to read, else None."""
+    now = datetime.now(timezone.utc)
+    retry_after = retry_after_seconds(response.headers, now)
+    if retry_after is not None and response.status_code in (429, 503):
+        get_host_scheduler().pause(feed_source.url, retry_after)
+    if response.status_code == 429:
+        return FeedFetchResult(status_code=429, retry_after_seconds=retry_after)
     if response.status_code == 304:
-        return FeedFetchResult(status_code=304)
+        return FeedFetchResult(
+            status_code=304, refresh_hint_seconds=header_refresh_hint(response.headers, now)
+        )
+    if not response.is_success:
+        # Redirects are not followed, so a moved feed fails like a 4xx.
+        # Left to the fetcher, which only blames the host for 5xx.
+        return FeedFetchResult(
+            status_code=response.status_code, retry_after_seconds=retry_after
+        )
+    return None
+
 
-    response.raise_for_status()
+def _to_result(response: httpx.Response, feed_source: FeedSource) -> FeedFetchResult:
+    result = _status_result(response, feed_source)
+    if result is not None:
+        return result
+    header_hint = header_refresh_hint(response.headers, datetime.now(timezone.utc))
+    body_sha256 = hashlib.sha256(response.content).hexdigest()
+    if body_sha256 == feed_source.body_sha256:
+        # Same bytes as last time: report an effective 304 and skip parsing.
+        return FeedFetchResult(
+            status_code=304,
+            etag=response.headers.get("ETag"),
+            last_modified=response.headers.get("Last-Modified"),
+            refresh_hint_seconds=header_hint,
+            body_sha256=body_sha256,
+        )
     parsed = feedparser.parse(response.text)
-    entries = [_to_entry(entry) for entry in parsed.entries]
+    feed_hint = feed_refresh_hint(
+        parsed.feed.get("ttl"),
+        parsed.feed.get("sy_updateperiod"),
+        parsed.feed.get("sy_updatefrequency"),
+    )
     return FeedFetchResult(
         status_code=response.status_code,
         etag=response.headers.get("ETag"),
         last_modified=response.headers.get("Last-Modified"),
-        entries=entries,
+        entries=[_to_entry(entry) for entry in parsed.entries],
+        refresh_hint_seconds=combine_hints(header_hint, feed_hint),
+        body_sha256=body_sha256,
     )
 
 
+def _streamed_result(response: httpx.Response) -> FeedFetchResult:
+    """Result for a 2xx response whose body is parsed as it is read.
+
+    The body hash and feed-level refresh hints are only known once the body
+    has been read, so they are filled in then. Unlike ``_to_result`` an
+    unchanged body cannot skip parsing; the fetcher's early stop on known
+    GUIDs saves that work instead.
+    """
+    return FeedFetchResult(
+        status_code=response.status_code,
+        etag=response.headers.get("ETag"),
+        last_modified=response.headers.get("Last-Modified"),
+        refresh_hint_seconds=header_refresh_hint(
+            response.headers, datetime.now(timezone.utc)
+        ),
+    )
+
+
+class _LiteStream:
+    """Lite parsing and hashing of a feed body read in chunks."""
+
+    def __init__(self, result: FeedFetchResult) -> None:
+        self._result = result
+        self._header_hint = result.refresh_hint_seconds
+        self._parser = LiteEntryParser(max_bytes=_lite_max_bytes())
+        self._digest = hashlib.sha256()
+        self._complete = False
+        self._emitted = 0
+
+    @property
+    def done(self) -> bool:
+        return self._parser.done
+
+    def feed(self, chunk: bytes) -> list[FeedEntry]:
+        self._digest.update(chunk)
+        entries = self._parser.feed(chunk)
+        self._emitted += len(entries)
+        return entries
+
+    def close(self) -> None:
+        self._parser.close()
+        self._complete = True
+
+    def fall_back(self, body: bytes) -> list[FeedEntry]:
+        """Entries after the ones already emitted, parsed by feedparser."""
+        parsed = feedparser.parse(body)
+        meta = self._parser.meta
+        meta.ttl = meta.ttl or parsed.feed.get("ttl")
+        meta.update_period = meta.update_period or parsed.feed.get("sy_updateperiod")
+        meta.update_frequency = meta.update_frequency or parsed.feed.get(
+            "sy_updatefrequency"
+        )
+        self._digest = hashlib.sha256(body)
+        self._complete = True
+        return [_to_entry(entry) for entry in parsed.entries[self._emitted :]]
+
+    def finish(self) -> None:
+        meta = self._parser.meta
+        self._result.refresh_hint_seconds = combine_hints(
+            self._header_hint,
+            feed_refresh_hint(meta.ttl, meta.update_period, meta.update_frequency),
+        )
+        if self._complete:
+            self._result.body_sha256 = self._digest.hexdigest()
+
+
+def _stream_entries(
+    response: httpx.Response, result: FeedFetchResult, refetch: Callable[[], bytes]
+) -> Iterator[FeedEntry]:
+    """Entries read from the network only as far as the caller iterates.
+
+    Stopping early, or reaching the lite parser's size or entry cap, closes
+    the response without downloading the rest. A malformed feed is fetched
+    again in full and finished with feedparser.
+    """
+    stream = _LiteStream(result)
+    try:
+        try:
+            for chunk in response.iter_bytes():
+                yield from stream.feed(chunk)
+                if stream.done:
+                    return
+            stream.close()
+        except LiteParseError:
+            yield from stream.fall_back(refetch())
+    finally:
+        response.close()
+        stream.finish()
+
+
 def _to_entry(entry) -> FeedEntry:
     guid = entry.get("id") or entry.get("guid") or entry.get("link") or ""
     url = entry.get("link") or ""
@@ -0,0 +1,153 @@
+"""Process-wide pooled HTTP clients for feed fetching."""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import weakref
+from collections.abc import Coroutine
+from dataclasses import dataclass
+from typing import Any, TypeVar
+
+import httpx
+
+T = TypeVar("T")
+
+
+@dataclass(frozen=True)
+class HttpPoolConfig:
+    timeout: float = 15.0
+    max_connections: int = 100
+    max_keepalive_connections: int = 20
+    keepalive_expiry: float = 30.0
+    http2: bool = False
+
+    @classmethod
+    def from_env(cls) -> "HttpPoolConfig":
+        return cls(
+            timeout=float(os.getenv("RSS_HTTP_TIMEOUT", cls.timeout)),
+            max_connections=int(os.getenv("RSS_HTTP_MAX_CONNECTIONS", cls.max_connections)),
+            max_keepalive_connections=int(
+                os.getenv("RSS_HTTP_MAX_KEEPALIVE", cls.max_keepalive_connections)
+            ),
+            keepalive_expiry=float(
+                os.getenv("RSS_HTTP_KEEPALIVE_EXPIRY", cls.keepalive_expiry)
+            ),
+            http2=os.getenv("RSS_HTTP2", "").lower() in {"1", "true", "yes"},
+        )
+
+    def limits(self) -> httpx.Limits:
+        return httpx.Limits(
+            max_connections=self.max_connections,
+            max_keepalive_connections=self.max_keepalive_connections,
+            keepalive_expiry=self.keepalive_expiry,
+        )
+
+
+@dataclass
+class PoolStats:
+    requests: int = 0
+    connections_opened: int = 0
+    connections_reused: int = 0
+
+
+class HttpClientPool:
+    """Long-lived sync and async ``httpx`` clients sharing one configuration.
+
+    Async clients are bound to an event loop, so one is kept per loop; use
+    ``run`` to execute coroutines on the pool's own persistent loop and get
+    connection reuse across calls. HTTP/2 requires ``httpx[http2]``.
+    """
+
+    def __init__(self, config: HttpPoolConfig | None = None) -> None:
+        self._config = config or HttpPoolConfig()
+        self.stats = PoolStats()
+        self._streams: weakref.WeakSet[object] = weakref.WeakSet()
+        self._client: httpx.Client | None = None
+        self._async_clients: weakref.WeakKeyDictionary[
+            asyncio.AbstractEventLoop, httpx.AsyncClient
+        ] = weakref.WeakKeyDictionary()
+        self._loop: asyncio.AbstractEventLoop | None = None
+
+    @property
+    def config(self) -> HttpPoolConfig:
+        return self._config
+
+    @property
+    def client(self) -> httpx.Client:
+        if self._client is None:
+            self._client = httpx.Client(
+                timeout=self._config.timeout,
+                limits=self._config.limits(),
+                http2=self._config.http2,
+                event_hooks={"response": [self._record]},
+            )
+        return self._client
+
+    @property
+    def async_client(self) -> httpx.AsyncClient:
+        loop = asyncio.get_running_loop()
+        client = self._async_clients.get(loop)
+        if client is None:
+            client = httpx.AsyncClient(
+                timeout=self._config.timeout,
+                limits=self._config.limits(),
+                http2=self._config.http2,
+                event_hooks={"response": [self._record_async]},
+            )
+            self._async_clients[loop] = client
+        return client
+
+    def run(self, coroutine: Coroutine[Any, Any, T]) -> T:
+        if self._loop is None or self._loop.is_closed():
+            self._loop = asyncio.new_event_loop()
+        return self._loop.run_until_complete(coroutine)
+
+    def close(self) -> None:
+        if self._client is not None:
+            self._client.close()
+            self._client = None
+        if self._loop is not None and not self._loop.is_closed():
+            client = self._async_clients.pop(self._loop, None)
+            if client is not None:
+                self._loop.run_until_complete(client.aclose())
+            self._loop.close()
+        self._loop = None
+
+    def _record(self, response: httpx.Response) -> None:
+        self.stats.requests += 1
+        stream = response.extensions.get("network_stream")
+        if stream is None:
+            return
+        if stream in self._streams:
+            self.stats.connections_reused += 1
+        else:
+            self._streams.add(stream)
+            self.stats.connections_opened += 1
+
+    async def _record_async(self, response: httpx.Response) -> None:
+        self._record(response)
+
+
+_pool: HttpClientPool | None = None
+
+
+def get_pool() -> HttpClientPool:
+    global _pool
+    if _pool is None:
+        _pool = HttpClientPool(HttpPoolConfig.from_env())
+    return _pool
+
+
+def configure_pool(config: HttpPoolConfig) -> HttpClientPool:
+    global _pool
+    close_pool()
+    _pool = HttpClientPool(config)
+    return _pool
+
+
+def close_pool() -> None:
+    global _pool
+    if _pool is not None:
+        _pool.close()
+        _pool = None
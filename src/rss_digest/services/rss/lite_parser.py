@@ -0,0 +1,230 @@
+"""Streaming feed parser that extracts only what ``FeedEntry`` needs.
+
+Handles RSS 2.0, RSS 1.0 (RDF) and Atom with an incremental expat parser,
+discarding every entry element as soon as it is read. Anything else about
+the feed (content, sanitization, encodings beyond what expat handles) is
+left to feedparser, which callers fall back to on ``LiteParseError``.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from xml.etree import ElementTree
+
+from rss_digest.services.rss.fetcher import FeedEntry
+
+MAX_ENTRIES_DEFAULT = 1000
+MAX_BYTES_DEFAULT = 16 * 1024 * 1024
+CHUNK_SIZE = 64 * 1024
+
+_ENTRY_TAGS = {"item", "entry"}
+_GUID_TAGS = {"guid", "id"}
+_PUBLISHED_TAGS = {"pubDate", "published", "date", "issued"}
+_UPDATED_TAGS = {"updated", "modified"}
+_META_TAGS = {"ttl", "updatePeriod", "updateFrequency"}
+_RDF_ABOUT = "{http://www.w3.org/1999/02/22-rdf-syntax-ns#}about"
+
+
+class LiteParseError(ValueError):
+    """Raised when the lite parser cannot read a feed."""
+
+
+@dataclass
+class LiteFeedMeta:
+    ttl: str | None = None
+    update_period: str | None = None
+    update_frequency: str | None = None
+    truncated: bool = False
+
+
+@dataclass
+class LiteFeed:
+    entries: list[FeedEntry] = field(default_factory=list)
+    meta: LiteFeedMeta = field(default_factory=LiteFeedMeta)
+
+
+def iter_chunks(body: bytes, size: int = CHUNK_SIZE) -> Iterator[bytes]:
+    for start in range(0, len(body), size):
+        yield body[start : start + size]
+
+
+class LiteEntryParser:
+    """Push parser behind ``iter_entries`` for callers that receive chunks.
+
+    ``feed`` returns the entries completed by a chunk. Once ``max_entries``
+    entries or ``max_bytes`` bytes are reached ``done`` is set (with
+    ``meta.truncated``) and further chunks are ignored, so the caller can
+    stop reading. Channel-level meta is picked up wherever it appears
+    outside an entry, also after the first one. Raises ``LiteParseError`` on
+    malformed XML.
+    """
+
+    def __init__(
+        self,
+        meta: LiteFeedMeta | None = None,
+        *,
+        max_entries: int = MAX_ENTRIES_DEFAULT,
+        max_bytes: int = MAX_BYTES_DEFAULT,
+    ) -> None:
+        self.meta = meta if meta is not None else LiteFeedMeta()
+        self.done = False
+        self._max_entries = max_entries
+        self._max_bytes = max_bytes
+        self._parser = ElementTree.XMLPullParser(events=("start", "end"))
+        self._stack: list[ElementTree.Element] = []
+        self._fields: dict[str, str] | None = None
+        # Depth of the open entry; only its direct children are read, so an
+        # Atom <source> block cannot overwrite the entry's own id or link.
+        self._entry_depth = 0
+        self._emitted = 0
+        self._consumed = 0
+
+    def feed(self, chunk: bytes) -> list[FeedEntry]:
+        if self.done:
+            return []
+        self._consumed += len(chunk)
+        if self._consumed > self._max_bytes:
+            self._truncate()
+            return []
+        try:
+            self._parser.feed(chunk)
+            events = list(self._parser.read_events())
+        except ElementTree.ParseError as exc:
+            raise LiteParseError(str(exc)) from exc
+        entries: list[FeedEntry] = []
+        stack = self._stack
+        for event, element in events:
+            name = _local_name(element.tag)
+            if event == "start":
+                stack.append(element)
+                if name in _ENTRY_TAGS:
+                    self._fields = {}
+                    self._entry_depth = len(stack)
+                    about = element.get(_RDF_ABOUT)
+                    if about:
+                        self._fields["guid"] = about
+                continue
+            stack.pop()
+            if self._fields is None:
+                if name in _META_TAGS:
+                    _set_meta(self.meta, name, (element.text or "").strip())
+                continue
+            if name in _ENTRY_TAGS:
+                entries.append(_to_entry(self._fields))
+                self._emitted += 1
+                if stack:
+                    stack[-1].remove(element)
+                self._fields = None
+                if self._emitted >= self._max_entries:
+                    self._truncate()
+                    break
+                continue
+            if len(stack) == self._entry_depth:
+                _collect(self._fields, name, element)
+        return entries
+
+    def close(self) -> None:
+        """Check that the document ended properly; a no-op once ``done``."""
+        if self.done:
+            return
+        self.done = True
+        try:
+            self._parser.close()
+        except ElementTree.ParseError as exc:
+            raise LiteParseError(str(exc)) from exc
+
+    def _truncate(self) -> None:
+        self.meta.truncated = True
+        self.done = True
+
+
+def iter_entries(
+    chunks: Iterable[bytes],
+    meta: LiteFeedMeta | None = None,
+    *,
+    max_entries: int = MAX_ENTRIES_DEFAULT,
+    max_bytes: int = MAX_BYTES_DEFAULT,
+) -> Iterator[FeedEntry]:
+    """Yield entries as soon as their closing tag has been read.
+
+    Stops quietly (setting ``meta.truncated``) after ``max_entries`` entries
+    or ``max_bytes`` bytes, without pulling further chunks; raises
+    ``LiteParseError`` on malformed XML.
+    """
+    parser = LiteEntryParser(meta, max_entries=max_entries, max_bytes=max_bytes)
+    for chunk in chunks:
+        yield from parser.feed(chunk)
+        if parser.done:
+            return
+    parser.close()
+
+
+def parse_lite(
+    body: bytes,
+    *,
+    max_entries: int = MAX_ENTRIES_DEFAULT,
+    max_bytes: int = MAX_BYTES_DEFAULT,
+) -> LiteFeed:
+    feed = LiteFeed()
+    feed.entries = list(
+        iter_entries(
+            iter_chunks(body), feed.meta, max_entries=max_entries, max_bytes=max_bytes
+        )
+    )
+    return feed
+
+
+def _local_name(tag: str) -> str:
+    return tag.rsplit("}", 1)[-1]
+
+
+def _collect(fields: dict[str, str], name: str, element: ElementTree.Element) -> None:
+    text = (element.text or "").strip()
+    if name in _GUID_TAGS:
+        if text:
+            fields["guid"] = text
+    elif name == "link":
+        href = element.get("href")
+        if href is not None:
+            if element.get("rel", "alternate") == "alternate" and "link" not in fields:
+                fields["link"] = href.strip()
+        elif text:
+            fields["link"] = text
+    elif name in _PUBLISHED_TAGS:
+        fields.setdefault("published", text)
+    elif name in _UPDATED_TAGS:
+        fields.setdefault("updated", text)
+
+
+def _set_meta(meta: LiteFeedMeta, name: str, text: str) -> None:
+    if name == "ttl":
+        meta.ttl = text
+    elif name == "updatePeriod":
+        meta.update_period = text
+    else:
+        meta.update_frequency = text
+
+
+def _to_entry(fields: dict[str, str]) -> FeedEntry:
+    url = fields.get("link", "")
+    guid = fields.get("guid") or url
+    published = fields.get("published") or fields.get("updated")
+    return FeedEntry(guid=guid, url=url, published_at=_parse_date(published))
+
+
+def _parse_date(value: str | None) -> datetime | None:
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(value)
+    except ValueError:
+        try:
+            parsed = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+    if parsed.tzinfo is None:
+        return parsed.replace(tzinfo=timezone.utc)
+    return parsed.astimezone(timezone.utc)
@@ -0,0 +1,96 @@
+"""Per-host request spacing for outbound feed requests."""
+
+from __future__ import annotations
+
+import os
+from collections.abc import Callable, Mapping
+from dataclasses import dataclass, field
+from datetime import datetime
+from email.utils import parsedate_to_datetime
+import time
+from urllib.parse import urlsplit
+
+from rss_digest.ratelimit import TokenBucket
+
+
+@dataclass(frozen=True)
+class PolitenessConfig:
+    # Sustained requests per second and burst size allowed per host.
+    rate: float = 1.0
+    burst: int = 4
+    # Requests that would wait longer than this are deferred, not sent.
+    max_wait: float = 30.0
+
+    @classmethod
+    def from_env(cls) -> "PolitenessConfig":
+        return cls(
+            rate=float(os.getenv("RSS_HOST_RATE", cls.rate)),
+            burst=int(os.getenv("RSS_HOST_BURST", cls.burst)),
+            max_wait=float(os.getenv("RSS_HOST_MAX_WAIT", cls.max_wait)),
+        )
+
+
+@dataclass
+class HostScheduler:
+    """Spaces requests to each host with its own token bucket.
+
+    ``reserve`` returns how long a request must wait for its host, or None
+    when the wait is longer than ``max_wait``; the caller should then defer
+    the feed instead of sending. ``Retry-After`` answers pause the host's
+    bucket. Requests to different hosts never wait on each other.
+    """
+
+    config: PolitenessConfig = field(default_factory=PolitenessConfig)
+    clock: Callable[[], float] = time.monotonic
+    _buckets: dict[str, TokenBucket] = field(default_factory=dict)
+
+    def reserve(self, url: str) -> float | None:
+        return self._bucket(url).reserve(max_wait=self.config.max_wait)
+
+    def pause(self, url: str, seconds: float) -> None:
+        self._bucket(url).pause(seconds)
+
+    def _bucket(self, url: str) -> TokenBucket:
+        host = host_key(url)
+        bucket = self._buckets.get(host)
+        if bucket is None:
+            bucket = TokenBucket(self.config.rate, self.config.burst, self.clock)
+            self._buckets[host] = bucket
+        return bucket
+
+
+def host_key(url: str) -> str:
+    parts = urlsplit(url)
+    return (parts.netloc or parts.path).lower()
+
+
+def retry_after_seconds(headers: Mapping[str, str], now: datetime) -> int | None:
+    value = headers.get("Retry-After")
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return int(value)
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        return None
+    return max(int((retry_at - now).total_seconds()), 0)
+
+
+_scheduler: HostScheduler | None = None
+
+
+def get_host_scheduler() -> HostScheduler:
+    global _scheduler
+    if _scheduler is None:
+        _scheduler = HostScheduler(PolitenessConfig.from_env())
+    return _scheduler
+
+
+def configure_host_scheduler(config: PolitenessConfig) -> HostScheduler:
+    global _scheduler
+    _scheduler = HostScheduler(config)
+    return _scheduler
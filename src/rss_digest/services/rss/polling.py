@@ -0,0 +1,111 @@
+"""Adaptive per-feed polling intervals."""
+
+from __future__ import annotations
+
+import re
+import statistics
+from collections.abc import Iterable, Mapping
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from email.utils import parsedate_to_datetime
+
+SY_PERIOD_SECONDS = {
+    "hourly": 3600,
+    "daily": 86400,
+    "weekly": 7 * 86400,
+    "monthly": 30 * 86400,
+    "yearly": 365 * 86400,
+}
+
+_MAX_AGE = re.compile(r"(?:^|[,\s])(?:s-)?max-age\s*=\s*(\d+)", re.IGNORECASE)
+_CADENCE_SAMPLE = 20
+
+
+@dataclass(frozen=True)
+class PollingPolicy:
+    """Learns how often a feed should be polled.
+
+    Feeds that produced new items move toward the publishing cadence seen in
+    their entries' timestamps; feeds without news back off geometrically.
+    Server and feed hints (Cache-Control, Expires, ``<ttl>``, ``sy:``) act as
+    a floor, and the result is clamped to ``[min_interval, max_interval]``.
+    """
+
+    min_interval: timedelta = timedelta(minutes=10)
+    default_interval: timedelta = timedelta(minutes=30)
+    max_interval: timedelta = timedelta(hours=3)
+    growth: float = 1.5
+    smoothing: float = 0.5
+
+    def next_interval(
+        self,
+        current_seconds: int | None,
+        *,
+        new_items: int,
+        published: Iterable[datetime] = (),
+        hint_seconds: int | None = None,
+    ) -> int:
+        current = float(current_seconds or self.default_interval.total_seconds())
+        if new_items:
+            cadence = publishing_cadence(published)
+            target = cadence if cadence is not None else current / self.growth
+            interval = self.smoothing * current + (1 - self.smoothing) * target
+        else:
+            interval = current * self.growth
+        if hint_seconds is not None:
+            interval = max(interval, hint_seconds)
+        low = self.min_interval.total_seconds()
+        high = self.max_interval.total_seconds()
+        return int(min(max(interval, low), high))
+
+
+def publishing_cadence(published: Iterable[datetime]) -> float | None:
+    """Median gap in seconds between the most recent distinct publish times."""
+    timestamps = sorted({value for value in published if value is not None}, reverse=True)
+    timestamps = timestamps[:_CADENCE_SAMPLE]
+    if len(timestamps) < 2:
+        return None
+    gaps = [
+        (newer - older).total_seconds()
+        for newer, older in zip(timestamps, timestamps[1:])
+    ]
+    return statistics.median(gaps)
+
+
+def header_refresh_hint(headers: Mapping[str, str], now: datetime) -> int | None:
+    cache_control = headers.get("Cache-Control")
+    if cache_control:
+        match = _MAX_AGE.search(cache_control)
+        if match:
+            return int(match.group(1))
+    expires = headers.get("Expires")
+    if expires:
+        try:
+            expires_at = parsedate_to_datetime(expires)
+        except (TypeError, ValueError):
+            return None
+        if expires_at.tzinfo is None:
+            return None
+        return max(int((expires_at - now).total_seconds()), 0)
+    return None
+
+
+def feed_refresh_hint(
+    ttl_minutes: str | None,
+    update_period: str | None,
+    update_frequency: str | None,
+) -> int | None:
+    hints: list[int] = []
+    if ttl_minutes and ttl_minutes.strip().isdigit():
+        hints.append(int(ttl_minutes) * 60)
+    if update_period:
+        period = SY_PERIOD_SECONDS.get(update_period.strip().lower())
+        frequency = update_frequency.strip() if update_frequency else "1"
+        if period and frequency.isdigit() and int(frequency) > 0:
+            hints.append(period // int(frequency))
+    return max(hints) if hints else None
+
+
+def combine_hints(*hints: int | None) -> int | None:
+    present = [hint for hint in hints if hint is not None]
+    return max(present) if present else None
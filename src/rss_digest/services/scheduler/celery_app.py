@@ -22,5 +22,13 @@ app.conf.beat_schedule = {
     "tick_due_schedules": {
         "task": "rss_digest.services.scheduler.tasks.tick_due_schedules",
         "schedule": crontab(minute="*"),
-    }
+    },
+    "prefetch_feeds": {
+        "task": "rss_digest.services.scheduler.tasks.prefetch_feeds",
+        "schedule": crontab(minute="*"),
+    },
+}
+app.conf.task_routes = {
+    "rss_digest.services.scheduler.tasks.prefetch_feeds": {"queue": "prefetch"},
+    "rss_digest.services.scheduler.tasks.evaluate_new_items": {"queue": "evaluation"},
 }
@@ -2,8 +2,9 @@
 
 from __future__ import annotations
 
+from collections.abc import Iterator
 from dataclasses import dataclass
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 from zoneinfo import ZoneInfo
 
 from rss_digest.db.models import Group, GroupSchedule, User
@@ -28,6 +29,18 @@ def same_minute(left: datetime, right: datetime) -> bool:
     return floor_minute(left) == floor_minute(right)
 
 
+def next_fire_time(time_hhmm: str, tz: ZoneInfo, after: datetime) -> datetime:
+    """First UTC minute strictly after ``after`` that is ``time_hhmm`` in ``tz``."""
+    hour, minute = parse_time_hhmm(time_hhmm)
+    local = after.astimezone(tz)
+    candidate = local.replace(hour=hour, minute=minute, second=0, microsecond=0)
+    if candidate <= local:
+        candidate = (local + timedelta(days=1)).replace(
+            hour=hour, minute=minute, second=0, microsecond=0
+        )
+    return candidate.astimezone(timezone.utc)
+
+
 @dataclass
 class DueSchedule:
     schedule: GroupSchedule
@@ -50,13 +63,7 @@ class SchedulerService:
     def tick(self, now: datetime) -> list[DueSchedule]:
         now_utc = now.astimezone(timezone.utc)
         due: list[DueSchedule] = []
-        for schedule in self._schedules.list_enabled():
-            group = self._groups.get(schedule.group_id)
-            if group is None or not group.is_enabled:
-                continue
-            user = self._users.get(group.user_id)
-            if user is None:
-                continue
+        for schedule, group, user in self._active():
             if schedule.last_fired_at and same_minute(
                 schedule.last_fired_at, now_utc
             ):
@@ -76,3 +83,34 @@ class SchedulerService:
                     )
                 )
         return due
+
+    def upcoming(self, now: datetime, horizon: timedelta) -> list[DueSchedule]:
+        """Schedules that will fire after ``now`` and within ``horizon``.
+
+        Read-only: unlike ``tick`` it does not mark anything as fired.
+        """
+        now_utc = floor_minute(now.astimezone(timezone.utc))
+        until = now_utc + horizon
+        upcoming: list[DueSchedule] = []
+        for schedule, group, user in self._active():
+            fires_at = next_fire_time(schedule.time_hhmm, ZoneInfo(user.timezone), now_utc)
+            if fires_at <= until:
+                upcoming.append(
+                    DueSchedule(
+                        schedule=schedule,
+                        group=group,
+                        user=user,
+                        scheduled_at=fires_at,
+                    )
+                )
+        return upcoming
+
+    def _active(self) -> Iterator[tuple[GroupSchedule, Group, User]]:
+        for schedule in self._schedules.list_enabled():
+            group = self._groups.get(schedule.group_id)
+            if group is None or not group.is_enabled:
+                continue
+            user = self._users.get(group.user_id)
+            if user is None:
+                continue
+            yield schedule, group, user
@@ -2,41 +2,253 @@
 
 from __future__ import annotations
 
+import logging
 import os
-from datetime import datetime, timezone
+import threading
+from datetime import datetime, timedelta, timezone
+from functools import partial
 from pathlib import Path
+from uuid import UUID
 
+from celery.signals import worker_process_init, worker_process_shutdown
+from sqlalchemy.exc import SQLAlchemyError
+
+from rss_digest.bloom import ERROR_RATE_DEFAULT, HEADROOM_DEFAULT, KnownHashes
 from rss_digest.db.session import build_session_factory
-from rss_digest.repository import Repositories
+from rss_digest.repository import GroupsRepo, Repositories
+from rss_digest.services.content.service import ArticleContentConfig, ArticleContentService
 from rss_digest.services.digest.builder import DigestBuilder
 from rss_digest.services.digest.delivery import DeliveryService
 from rss_digest.services.digest.storage import StorageService
-from rss_digest.services.evaluation.relevance import KeywordRelevanceEvaluator
-from rss_digest.services.evaluation.service import EvaluationService
+from rss_digest.services.evaluation.budget import EvaluationBudget
+from rss_digest.services.evaluation.cascade import CascadeConfig
+from rss_digest.services.evaluation.service import (
+    EVALUATION_BATCH_SIZE_DEFAULT,
+    EvaluationService,
+)
 from rss_digest.services.evaluation.summarizer import SimpleSummarizer
+from rss_digest.services.evaluation.summary_runner import SummaryBuckets, SummaryLimits
 from rss_digest.services.materialize.service import MaterializeService
-from rss_digest.services.pipeline.service import GroupPipeline
+from rss_digest.services.pipeline.service import GroupPipeline, determine_since
+from rss_digest.services.prefetch.service import LEAD_TIME_MINUTES_DEFAULT, FeedPrefetcher
+from rss_digest.services.rss.coordinator import FRESHNESS_SECONDS_DEFAULT, FetchCoordinator
 from rss_digest.services.rss.fetcher import RssFetcher
-from rss_digest.services.rss.http_client import fetch_feed
+from rss_digest.services.rss.health import HostCircuitBreaker
+from rss_digest.services.rss.http_client import fetch_feed, fetch_feed_async
+from rss_digest.services.rss.http_pool import HttpPoolConfig, close_pool, configure_pool, get_pool
+from rss_digest.services.rss.politeness import PolitenessConfig, configure_host_scheduler
 from rss_digest.services.scheduler.celery_app import app
 from rss_digest.services.scheduler.service import SchedulerService
 
+logger = logging.getLogger(__name__)
+
+# Background evaluations start this long after the first new link, so links
+# from the fetches in between are evaluated by the same task.
+EVALUATION_DELAY_SECONDS_DEFAULT = 60
+# A queued evaluation that has not started after this long is presumed lost.
+EVALUATION_CLAIM_SECONDS_DEFAULT = 900
+
+# Host failures are remembered across ticks for the life of the worker process.
+_host_breaker = HostCircuitBreaker()
+# Summarizer rate limits are per process, shared by every run it executes.
+_summary_limits = SummaryLimits.from_env()
+_summary_buckets = SummaryBuckets.from_limits(_summary_limits)
+# Set once a background thread has loaded the stored hashes; until then
+# lookups go to the database.
+_known_hashes: KnownHashes | None = None
+
+
+@worker_process_init.connect
+def _init_http_pool(**_kwargs) -> None:
+    configure_pool(HttpPoolConfig.from_env())
+    configure_host_scheduler(PolitenessConfig.from_env())
+
+
+@worker_process_init.connect
+def _start_warming_known_hashes(**_kwargs) -> None:
+    # Scanning large tables here would hold up the child's startup past
+    # worker_proc_alive_timeout, so the filters are built in the background.
+    threading.Thread(target=_warm_known_hashes, name="warm-known-hashes", daemon=True).start()
+
+
+def _warm_known_hashes() -> None:
+    global _known_hashes
+    session = build_session_factory()()
+    try:
+        repositories = Repositories.build(session=session)
+        known = KnownHashes.for_counts(
+            repositories.items.count(),
+            repositories.feed_items.count(),
+            float(os.getenv("BLOOM_ERROR_RATE", ERROR_RATE_DEFAULT)),
+            float(os.getenv("BLOOM_HEADROOM", HEADROOM_DEFAULT)),
+        )
+        known.warm(
+            repositories.items.iter_hashes(), repositories.feed_items.iter_guid_hashes()
+        )
+        _known_hashes = known
+    except SQLAlchemyError:
+        logger.exception("could not warm hash filters; lookups will use the database")
+    finally:
+        session.close()
+
+
+@worker_process_shutdown.connect
+def _close_http_pool(**_kwargs) -> None:
+    close_pool()
+
 
 def _storage_dir() -> Path:
     return Path(os.getenv("DIGEST_STORAGE_DIR", "./data/digests"))
 
 
-def _build_pipeline(repositories: Repositories) -> GroupPipeline:
-    fetcher = RssFetcher(repositories.feed_sources, repositories.feed_items, fetch_feed)
-    materializer = MaterializeService(repositories.items, repositories.group_items)
-    evaluator = EvaluationService(
+def _fetch_freshness() -> timedelta:
+    return timedelta(
+        seconds=int(os.getenv("FETCH_FRESHNESS_SECONDS", FRESHNESS_SECONDS_DEFAULT))
+    )
+
+
+def _prefetch_lead_time() -> timedelta:
+    return timedelta(
+        minutes=int(os.getenv("PREFETCH_LEAD_MINUTES", LEAD_TIME_MINUTES_DEFAULT))
+    )
+
+
+def _evaluation_batch_size() -> int:
+    return int(os.getenv("EVALUATION_BATCH_SIZE", EVALUATION_BATCH_SIZE_DEFAULT))
+
+
+def _incremental_evaluation() -> bool:
+    return os.getenv("EVALUATION_INCREMENTAL", "").lower() in {"1", "true", "yes"}
+
+
+def _article_fetch_enabled() -> bool:
+    return os.getenv("ARTICLE_FETCH", "").lower() in {"1", "true", "yes"}
+
+
+def _ready_known_hashes() -> KnownHashes | None:
+    return _known_hashes if _known_hashes is not None and _known_hashes.ready else None
+
+
+def _log_filter_stats(known: KnownHashes) -> None:
+    for name, bloom in (("items", known.items), ("guids", known.guids)):
+        logger.info(
+            "hash filter %s: keys=%d memory_kb=%d expected_fp=%.4f observed_fp=%.4f",
+            name,
+            bloom.count,
+            bloom.memory_bytes // 1024,
+            bloom.expected_false_positive_rate(),
+            bloom.stats.observed_false_positive_rate,
+        )
+
+
+def _build_fetcher(repositories: Repositories) -> RssFetcher:
+    return RssFetcher(
+        repositories.feed_sources,
+        repositories.feed_items,
+        fetch_feed,
+        fetch_feed_async,
+        loop_runner=get_pool().run,
+        host_breaker=_host_breaker,
+        known_hashes=_ready_known_hashes(),
+    )
+
+
+def _evaluation_delay() -> int:
+    return int(os.getenv("EVALUATION_DELAY_SECONDS", EVALUATION_DELAY_SECONDS_DEFAULT))
+
+
+def _evaluation_claim_timeout() -> timedelta:
+    return timedelta(
+        seconds=int(os.getenv("EVALUATION_CLAIM_SECONDS", EVALUATION_CLAIM_SECONDS_DEFAULT))
+    )
+
+
+def _enqueue_evaluations(groups: GroupsRepo, group_ids: set[UUID]) -> None:
+    """Queue one delayed background evaluation per group not already queued."""
+    now = datetime.now(timezone.utc)
+    stale_before = now - _evaluation_claim_timeout()
+    for group_id in group_ids:
+        if groups.claim_evaluation(group_id, claimed_at=now, stale_before=stale_before):
+            evaluate_new_items.apply_async((str(group_id),), countdown=_evaluation_delay())
+
+
+def _build_materializer(repositories: Repositories) -> MaterializeService:
+    return MaterializeService(
+        repositories.items,
+        repositories.group_items,
+        _ready_known_hashes(),
+        repositories.group_feeds,
+        on_linked=(
+            partial(_enqueue_evaluations, repositories.groups)
+            if _incremental_evaluation()
+            else None
+        ),
+    )
+
+
+def _build_coordinator(
+    repositories: Repositories, fetcher: RssFetcher, materializer: MaterializeService
+) -> FetchCoordinator:
+    return FetchCoordinator(
+        fetcher,
+        repositories.feed_sources,
+        repositories.feed_items,
+        freshness=_fetch_freshness(),
+        materializer=materializer,
+    )
+
+
+def _build_content(repositories: Repositories) -> ArticleContentService | None:
+    if not _article_fetch_enabled():
+        return None
+    return ArticleContentService(
+        repositories.article_contents,
+        config=ArticleContentConfig.from_env(),
+        loop_runner=get_pool().run,
+    )
+
+
+def _build_evaluator(
+    repositories: Repositories, content: ArticleContentService | None
+) -> EvaluationService:
+    return EvaluationService(
         repositories.items,
         repositories.group_items,
         repositories.evaluations,
         repositories.summaries,
-        KeywordRelevanceEvaluator(),
-        SimpleSummarizer(),
+        CascadeConfig.from_env().build(content),
+        SimpleSummarizer(content),
+        batch_size=_evaluation_batch_size(),
+        summary_limits=_summary_limits,
+        summary_cache=repositories.summary_cache,
+        budget=EvaluationBudget.from_env(),
+        content=content,
+        summary_buckets=_summary_buckets,
     )
+
+
+def _log_stage_stats(evaluator: EvaluationService) -> None:
+    for name, stats in evaluator.stage_stats.items():
+        logger.info(
+            "evaluation stage %s: seen=%d decided=%d passed_on=%d hit_rate=%.2f"
+            " latency_p50_s=%.2f latency_p95_s=%.2f",
+            name,
+            stats.seen,
+            stats.decided,
+            stats.passed_on,
+            stats.hit_rate,
+            stats.latency.percentile(0.5),
+            stats.latency.percentile(0.95),
+        )
+
+
+def _build_pipeline(
+    repositories: Repositories,
+    fetcher: RssFetcher,
+    coordinator: FetchCoordinator,
+    materializer: MaterializeService,
+    evaluator: EvaluationService,
+) -> GroupPipeline:
     builder = DigestBuilder()
     storage = StorageService(_storage_dir())
     delivery = DeliveryService(repositories.deliveries)
@@ -48,6 +260,7 @@ def _build_pipeline(repositories: Repositories) -> GroupPipeline:
         builder,
         storage,
         delivery,
+        fetch_coordinator=coordinator,
     )
 
 
@@ -65,9 +278,146 @@ def tick_due_schedules() -> int:
         due = scheduler.tick(datetime.now(timezone.utc))
         if not due:
             return 0
-        pipeline = _build_pipeline(repositories)
+        fetcher = _build_fetcher(repositories)
+        materializer = _build_materializer(repositories)
+        coordinator = _build_coordinator(repositories, fetcher, materializer)
+        content = _build_content(repositories)
+        evaluator = _build_evaluator(repositories, content)
+        pipeline = _build_pipeline(repositories, fetcher, coordinator, materializer, evaluator)
         for schedule in due:
-            pipeline.run(schedule.group.id, schedule.scheduled_at)
+            result = pipeline.run(schedule.group.id, schedule.scheduled_at)
+            if result.fetch_lag_seconds is not None:
+                logger.info(
+                    "pipeline %s: fetch_lag_s=%.0f",
+                    schedule.group.id,
+                    result.fetch_lag_seconds,
+                )
+            budget = result.evaluation_budget
+            if budget is not None:
+                logger.info(
+                    "evaluation budget %s: items=%d summaries=%d tokens=%d elapsed_s=%.1f"
+                    " overflow=%d exhausted=%s",
+                    schedule.group.id,
+                    budget.items,
+                    budget.summaries,
+                    budget.tokens,
+                    budget.seconds,
+                    budget.overflow,
+                    budget.exhausted or "-",
+                )
+        tick_stats = coordinator.reset_stats()
+        logger.info(
+            "feed fetch: hits=%d misses=%d not_due=%d claimed_elsewhere=%d",
+            tick_stats.hits,
+            tick_stats.misses,
+            tick_stats.not_due,
+            tick_stats.claimed_elsewhere,
+        )
+        fetch_stats = fetcher.stats
+        logger.info(
+            "feed health: failures=%d deferred=%d skipped_backoff=%d"
+            " skipped_host_open=%d saved_s=%.1f",
+            fetch_stats.failures,
+            fetch_stats.deferred,
+            fetch_stats.skipped_backoff,
+            fetch_stats.skipped_host_open,
+            fetch_stats.estimated_seconds_saved(get_pool().config.timeout),
+        )
+        stats = get_pool().stats
+        logger.info(
+            "http pool: requests=%d opened=%d reused=%d",
+            stats.requests,
+            stats.connections_opened,
+            stats.connections_reused,
+        )
+        summary_stats = evaluator.summary_stats
+        logger.info(
+            "summaries: calls=%d cache_hits=%d retries=%d failures=%d"
+            " latency_p50_s=%.2f latency_p95_s=%.2f latency_max_s=%.2f",
+            summary_stats.calls,
+            summary_stats.cache_hits,
+            summary_stats.retries,
+            summary_stats.failures,
+            summary_stats.latency.percentile(0.5),
+            summary_stats.latency.percentile(0.95),
+            summary_stats.latency.max,
+        )
+        _log_stage_stats(evaluator)
+        if content is not None:
+            logger.info(
+                "article content: hits=%d revalidated=%d fetched=%d failures=%d hit_rate=%.2f",
+                content.stats.hits,
+                content.stats.revalidated,
+                content.stats.fetched,
+                content.stats.failures,
+                content.stats.hit_rate,
+            )
+        known = _ready_known_hashes()
+        if known is not None:
+            _log_filter_stats(known)
         return len(due)
     finally:
         session.close()
+
+
+@app.task(name="rss_digest.services.scheduler.tasks.prefetch_feeds")
+def prefetch_feeds() -> int:
+    session_factory = build_session_factory()
+    session = session_factory()
+    try:
+        repositories = Repositories.build(session=session)
+        scheduler = SchedulerService(
+            repositories.schedules,
+            repositories.groups,
+            repositories.users,
+        )
+        fetcher = _build_fetcher(repositories)
+        prefetcher = FeedPrefetcher(
+            _build_coordinator(repositories, fetcher, _build_materializer(repositories)),
+            repositories.feed_sources,
+            scheduler,
+            lead_time=_prefetch_lead_time(),
+        )
+        result = prefetcher.run()
+        logger.info(
+            "prefetch: upcoming=%d fetched_for_schedules=%d fetched_due=%d",
+            result.upcoming_schedules,
+            result.fetched_for_schedules,
+            result.fetched_due,
+        )
+        return result.fetched_for_schedules + result.fetched_due
+    finally:
+        session.close()
+
+
+@app.task(name="rss_digest.services.scheduler.tasks.evaluate_new_items")
+def evaluate_new_items(group_id: str) -> int:
+    """Evaluate and summarize a group's new items ahead of its next digest.
+
+    Queued, at most once at a time per group, when a fetch fans new items
+    out to the group with EVALUATION_INCREMENTAL on; the scheduled run then
+    only reports the finished rows and evaluates whatever is still missing.
+    """
+    session_factory = build_session_factory()
+    session = session_factory()
+    try:
+        repositories = Repositories.build(session=session)
+        # Links made from here on need another evaluation, so let them queue one.
+        repositories.groups.release_evaluation(UUID(group_id))
+        group = repositories.groups.get(UUID(group_id))
+        if group is None or not group.is_enabled:
+            return 0
+        evaluator = _build_evaluator(repositories, _build_content(repositories))
+        since = determine_since(group, datetime.now(timezone.utc))
+        result = evaluator.evaluate_since(group.id, since)
+        logger.info(
+            "background evaluation %s: items=%d summaries=%d overflow=%d",
+            group.id,
+            result.budget.items,
+            result.budget.summaries,
+            result.budget.overflow,
+        )
+        _log_stage_stats(evaluator)
+        return len(result.evaluations)
+    finally:
+        session.close()
@@ -0,0 +1,86 @@
+import hashlib
+
+from rss_digest.bloom import CAPACITY_MIN, BloomFilter, KnownHashes, capacity_for
+from rss_digest.db.models import FeedItem, FeedSource, Group, Item, User
+from rss_digest.dedup import canonical_url_digest
+from rss_digest.services.materialize.service import MaterializeService
+
+
+def _digest(value: int) -> bytes:
+    return hashlib.sha256(str(value).encode()).digest()
+
+
+def test_bloom_filter_has_no_false_negatives_and_tracks_error_rate():
+    bloom = BloomFilter(capacity=10_000, error_rate=0.01)
+    bloom.add_many(_digest(value) for value in range(10_000))
+
+    assert all(_digest(value) in bloom for value in range(10_000))
+    for value in range(10_000, 30_000):
+        if bloom.check(_digest(value)):
+            bloom.record_false_positives()
+    assert bloom.stats.observed_false_positive_rate < 0.02
+    assert 0.005 < bloom.expected_false_positive_rate() < 0.015
+    assert bloom.memory_bytes < 12_000
+
+
+def test_known_hashes_are_sized_from_row_counts_with_headroom(repositories):
+    repos = repositories
+    for index in range(3):
+        repos.items.add(
+            Item(
+                canonical_url=f"https://example.com/{index}",
+                canonical_url_hash=_digest(index),
+            )
+        )
+
+    assert repos.items.count() == 3
+    assert repos.feed_items.count() == 0
+    assert capacity_for(3) == CAPACITY_MIN
+    assert capacity_for(1_000_000, headroom=1.5) == 1_500_000
+    small = KnownHashes.for_counts(repos.items.count(), repos.feed_items.count())
+    large = KnownHashes.for_counts(1_000_000, 0)
+    assert small.items.memory_bytes == small.guids.memory_bytes
+    assert large.items.memory_bytes == BloomFilter(2_000_000).memory_bytes
+
+
+def test_materialize_skips_lookups_for_definite_misses_and_tolerates_stale_filter(
+    repositories,
+):
+    repos = repositories
+    user = repos.users.add(User(email="user@example.com", timezone="UTC"))
+    group = repos.groups.add(Group(user_id=user.id, name="Tech"))
+    source = repos.feed_sources.add(FeedSource(url="https://example.com/rss"))
+    known = KnownHashes.with_capacity(1000)
+    known.warm(repos.items.iter_hashes(), repos.feed_items.iter_guid_hashes())
+    # Inserted by another worker after this one warmed its filter.
+    other_worker = repos.items.add(
+        Item(
+            canonical_url="https://example.com/b",
+            canonical_url_hash=canonical_url_digest("https://example.com/b"),
+        )
+    )
+    lookups: list[bytes] = []
+    ids_by_hashes = repos.items.ids_by_hashes
+
+    def counting_find(url_hashes):
+        url_hashes = list(url_hashes)
+        lookups.extend(url_hashes)
+        return ids_by_hashes(url_hashes)
+
+    repos.items.ids_by_hashes = counting_find
+    feed_items = [
+        FeedItem(feed_source_id=source.id, guid_hash=b"", url=url, canonical_url_hash=b"")
+        for url in ("https://example.com/a", "https://example.com/b")
+    ]
+    result = MaterializeService(repos.items, repos.group_items, known).materialize(
+        group.id, feed_items
+    )
+
+    assert len(result.item_ids) == 1
+    assert {group_item.item_id for group_item in repos.group_items.list_by_group(group.id)} == {
+        result.item_ids[0],
+        other_worker.id,
+    }
+    # Only the conflicting insert had to read the existing row back.
+    assert lookups == [other_worker.canonical_url_hash]
+    assert known.items.stats.definite_misses == 2
@@ -0,0 +1,124 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+from rss_digest.db.models import Item
+from rss_digest.dedup import canonicalize
+from rss_digest.services.content.extract import extract_main_text
+from rss_digest.services.content.http_client import ArticleResponse
+from rss_digest.services.content.service import ArticleContentConfig, ArticleContentService
+
+PAGE = """
+<html><head><title>t</title><script>var tracking = "a very long script line";</script></head>
+<body>
+  <nav>Home | World | Business | Technology | Sport</nav>
+  <p>A teaser paragraph outside the article body text.</p>
+  <article>
+    <h1>Rust 2.0 released with async closures</h1>
+    <p>The release &amp; its notes <b>cover</b> the new closure syntax in detail.</p>
+    <p>Share</p>
+    <aside>Related: ten other stories you might like to read</aside>
+  </article>
+  <footer>Copyright 2024 Example News, all rights reserved</footer>
+</body></html>
+"""
+
+
+def test_extract_main_text_keeps_article_paragraphs():
+    assert extract_main_text(PAGE) == (
+        "Rust 2.0 released with async closures\n"
+        "The release & its notes cover the new closure syntax in detail."
+    )
+    assert extract_main_text(PAGE, max_chars=4) == "Rust"
+
+
+def test_extract_main_text_applies_implied_end_tags():
+    html = (
+        "<nav><ul><li>Home<li>World news section and more links</ul></nav>"
+        "<article><p>The first paragraph is never closed by the page."
+        "<p>Neither is the second paragraph of this article.</article>"
+        "<p>A trailing paragraph outside of the article.</p>"
+    )
+
+    assert extract_main_text(html) == (
+        "The first paragraph is never closed by the page.\n"
+        "Neither is the second paragraph of this article."
+    )
+
+
+class _StubSite:
+    def __init__(self) -> None:
+        self.requests: list[tuple[str, str | None]] = []
+        self.active = 0
+        self.max_active = 0
+
+    async def fetch(self, url, etag, last_modified, max_bytes):
+        self.requests.append((url, etag))
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        try:
+            await asyncio.sleep(0.01)
+        finally:
+            self.active -= 1
+        if url.endswith("/empty"):
+            return ArticleResponse(status_code=200, html="<nav>Only a menu here</nav>")
+        if url.endswith("/huge"):
+            return ArticleResponse(status_code=200, too_large=True)
+        if etag == f'"{url}"':
+            return ArticleResponse(status_code=304)
+        return ArticleResponse(status_code=200, html=PAGE, etag=f'"{url}"')
+
+
+def _items(repos, paths):
+    items = []
+    for path in paths:
+        url, url_hash = canonicalize(f"https://news.example.com/{path}")
+        items.append(repos.items.add(Item(canonical_url=url, canonical_url_hash=url_hash)))
+    return items
+
+
+def test_prefetch_caches_text_once_and_revalidates_stale_entries(repositories):
+    repos = repositories
+    items = _items(repos, ["a", "b", "c", "huge"])
+    site = _StubSite()
+    now = [datetime(2024, 1, 1, tzinfo=timezone.utc)]
+
+    def service():
+        return ArticleContentService(
+            repos.article_contents,
+            site.fetch,
+            ArticleContentConfig(max_concurrency=2, max_age=timedelta(hours=1)),
+            clock=lambda: now[0],
+        )
+
+    first = service()
+    first.prefetch(items)
+    other_group = service()
+    other_group.prefetch(items[:3])
+    now[0] += timedelta(hours=2)
+    stale = service()
+    stale.prefetch(items[:1])
+
+    assert first.text(items[0].canonical_url).startswith("Rust 2.0 released")
+    assert first.text(items[3].canonical_url) is None
+    assert site.max_active == 2
+    assert (first.stats.fetched, first.stats.failures, first.stats.hit_rate) == (3, 1, 0.0)
+    assert (other_group.stats.hits, other_group.stats.hit_rate) == (3, 1.0)
+    assert stale.stats.revalidated == 1
+    assert stale.text(items[0].canonical_url) == first.text(items[0].canonical_url)
+    assert site.requests[-1] == (items[0].canonical_url, f'"{items[0].canonical_url}"')
+    stored = repos.article_contents.get_many([items[0].canonical_url_hash])
+    entry = stored[items[0].canonical_url_hash]
+    assert len(entry.text_zlib) < len(first.text(items[0].canonical_url).encode())
+    assert entry.fetched_at.replace(tzinfo=timezone.utc) == now[0]
+
+
+def test_prefetch_does_not_cache_pages_without_text(repositories):
+    repos = repositories
+    items = _items(repos, ["empty"])
+    service = ArticleContentService(repos.article_contents, _StubSite().fetch)
+
+    service.prefetch(items)
+
+    assert service.text(items[0].canonical_url) is None
+    assert service.stats.failures == 1
+    assert repos.article_contents.get_many([items[0].canonical_url_hash]) == {}
@@ -1,6 +1,12 @@
 import hashlib
 
-from rss_digest.dedup import canonical_url_hash, normalize_url
+from rss_digest.dedup import (
+    canonical_url_digest,
+    canonical_url_hash,
+    canonicalize,
+    canonicalize_many,
+    normalize_url,
+)
 
 
 def test_normalize_url_removes_fragment_and_tracking_params():
@@ -30,3 +36,17 @@ def test_canonical_url_hash_is_sha256_of_normalized_url():
     normalized = "https://example.com/a"
     expected_hash = hashlib.sha256(normalized.encode("utf-8")).hexdigest()
     assert canonical_url_hash(url) == expected_hash
+    assert canonical_url_digest(url) == bytes.fromhex(expected_hash)
+
+
+def test_canonicalize_many_returns_pairs_and_memoizes():
+    canonicalize.cache_clear()
+    urls = ["https://Example.com/a/?utm_source=x", "https://example.com/a", "https://b.com"]
+
+    pairs = canonicalize_many(urls + urls)
+
+    digest = hashlib.sha256(b"https://example.com/a").digest()
+    assert pairs[0] == ("https://example.com/a", digest)
+    assert pairs[0] == pairs[1]
+    assert pairs[:3] == pairs[3:]
+    assert canonicalize.cache_info().misses == 3
@@ -0,0 +1,623 @@
+import json
+import threading
+import time
+from datetime import datetime, timezone
+
+import httpx
+import pytest
+
+from rss_digest.db.models import FeedItem, FeedSource, Group, ItemEvaluation, ItemSummary, User
+from rss_digest.services.content.http_client import ArticleResponse
+from rss_digest.services.content.service import ArticleContentService
+from rss_digest.services.evaluation.budget import EvaluationBudget
+from rss_digest.services.evaluation.cascade import CascadeConfig, CascadeEvaluator, CascadeStage
+from rss_digest.services.evaluation.judge import HttpJudgeEvaluator
+from rss_digest.services.evaluation.matching import compile_keywords
+from rss_digest.services.evaluation.relevance import (
+    EvaluationResult,
+    KeywordRelevanceEvaluator,
+    RelevanceEvaluator,
+)
+from rss_digest.services.evaluation.service import EvaluationService
+from rss_digest.services.evaluation.summarizer import (
+    SimpleSummarizer,
+    Summarizer,
+    SummarizerError,
+)
+from rss_digest.services.evaluation.summary_runner import (
+    SummaryBuckets,
+    SummaryLimits,
+    SummaryRunner,
+)
+from rss_digest.services.materialize.service import MaterializeService
+
+SINCE = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+def _group_with_items(repos, urls):
+    user = repos.users.add(User(email="user@example.com", timezone="UTC"))
+    group = repos.groups.add(Group(user_id=user.id, name="Tech"))
+    source = repos.feed_sources.add(FeedSource(url="https://example.com/rss"))
+    MaterializeService(repos.items, repos.group_items).materialize(
+        group.id,
+        [
+            FeedItem(feed_source_id=source.id, guid_hash=b"", url=url, canonical_url_hash=b"")
+            for url in urls
+        ],
+    )
+    return group
+
+
+class _RecordingEvaluator(KeywordRelevanceEvaluator):
+    def __init__(self) -> None:
+        super().__init__(include_keywords=["important"])
+        self.batches: list[list[str]] = []
+
+    def evaluate_batch(self, urls):
+        self.batches.append(list(urls))
+        return super().evaluate_batch(urls)
+
+
+def test_evaluate_since_evaluates_in_batches_and_skips_evaluated_items(repositories):
+    repos = repositories
+    urls = [f"https://example.com/{name}" for name in ("a", "important-b", "c", "d", "e")]
+    group = _group_with_items(repos, urls)
+    evaluator = _RecordingEvaluator()
+    service = EvaluationService(
+        repos.items,
+        repos.group_items,
+        repos.evaluations,
+        repos.summaries,
+        evaluator,
+        SimpleSummarizer(),
+        batch_size=2,
+    )
+
+    result = service.evaluate_since(group.id, SINCE)
+    again = service.evaluate_since(group.id, SINCE)
+
+    assert [len(batch) for batch in evaluator.batches] == [2, 2, 1]
+    assert sorted(url for batch in evaluator.batches for url in batch) == sorted(urls)
+    assert len(result.evaluations) == 5
+    assert len(repos.evaluations.list_by_group(group.id)) == 5
+    assert [summary.summary_md for summary in result.summaries] == [
+        "Summary for https://example.com/important-b"
+    ]
+    assert again.evaluations == [] and again.summaries == []
+
+
+def test_default_evaluate_batch_falls_back_to_evaluate():
+    evaluator = KeywordRelevanceEvaluator(include_keywords=["rust"])
+
+    assert evaluator.evaluate_batch(["https://a.example/rust", "https://b.example/go"]) == [
+        EvaluationResult(score=0.9, decision="include", reason="keyword"),
+        EvaluationResult(score=0.1, decision="exclude", reason="no_keyword"),
+    ]
+
+
+class _LengthScorer(RelevanceEvaluator):
+    """Scores by path length, standing in for a cheap local model."""
+
+    def evaluate(self, url: str) -> EvaluationResult:
+        return EvaluationResult(score=min(len(url) / 40, 1.0), decision="include", reason="length")
+
+
+def test_cascade_sends_only_deferred_urls_to_later_stages():
+    judge = _RecordingEvaluator()
+    ticks = iter(range(100))
+    cascade = CascadeEvaluator(
+        [
+            CascadeStage(
+                "keyword",
+                KeywordRelevanceEvaluator(
+                    include_keywords=["rust"], exclude_keywords=["/tag/"], defer_unmatched=True
+                ),
+            ),
+            CascadeStage("local", _LengthScorer(), include_at=0.9, exclude_at=0.5),
+            CascadeStage("judge", judge),
+        ],
+        clock=lambda: next(ticks) / 1000,
+    )
+    urls = [
+        "https://a.example/rust",
+        "https://a.example/tag/go",
+        "https://a.example/x",
+        "https://a.example/a-very-long-article-title",
+        "https://a.example/important-go",
+        "https://a.example/medium-title",
+    ]
+
+    results = cascade.evaluate_batch(urls)
+
+    assert [result.decision for result in results] == [
+        "include",
+        "exclude",
+        "exclude",
+        "include",
+        "include",
+        "exclude",
+    ]
+    assert judge.batches == [["https://a.example/important-go", "https://a.example/medium-title"]]
+    assert results[0].reason == "keyword:keyword [keyword=include/0.2ms]"
+    assert results[4].reason == (
+        "judge:keyword [keyword=defer/0.2ms, local=defer/0.2ms, judge=include/0.5ms]"
+    )
+    assert {name: (stats.seen, stats.decided) for name, stats in cascade.stats.items()} == {
+        "keyword": (6, 2),
+        "local": (4, 2),
+        "judge": (2, 2),
+    }
+    assert cascade.stats["local"].hit_rate == 0.5
+
+
+def test_cascade_gives_items_no_stage_decided_the_undecided_decision():
+    cascade = CascadeEvaluator(
+        [CascadeStage("local", _LengthScorer(), include_at=0.99, exclude_at=0.01)],
+        clock=lambda: 0.0,
+    )
+
+    (result,) = cascade.evaluate_batch(["https://a.example/x"])
+
+    assert result.decision == "exclude"
+    assert result.reason == "undecided [local=defer/0.0ms]"
+
+
+def test_cascade_config_from_env_decides_cheaply_before_the_judge(monkeypatch):
+    monkeypatch.setenv("EVALUATION_INCLUDE_KEYWORDS", "rust, zig")
+    monkeypatch.setenv("EVALUATION_EXCLUDE_KEYWORDS", "sponsored")
+    monkeypatch.setenv("EVALUATION_INCLUDE_PATTERNS", r"release-\d+")
+    monkeypatch.setenv("EVALUATION_EXCLUDE_PATTERNS", "/tag/ /page/\\d+")
+    monkeypatch.setenv("EVALUATION_TERM_WEIGHTS", "python:3,gardening:-3")
+    monkeypatch.setenv("EVALUATION_JUDGE_URL", "http://judge.invalid/evaluate")
+    evaluator = CascadeConfig.from_env().build()
+    urls = [
+        "https://example.com/rust-news",
+        "https://example.com/tag/news",
+        "https://example.com/release-12",
+        "https://example.com/python-tips",
+        "https://example.com/gardening",
+    ]
+
+    results = evaluator.evaluate_batch(urls)
+
+    assert [result.decision for result in results] == [
+        "include",
+        "exclude",
+        "include",
+        "include",
+        "exclude",
+    ]
+    assert [result.reason.split(" ")[0] for result in results] == [
+        "keyword:keyword",
+        "regex:exclude_pattern",
+        "regex:pattern",
+        "scorer:terms:1",
+        "scorer:terms:1",
+    ]
+    assert {name: (stats.seen, stats.passed_on) for name, stats in evaluator.stats.items()} == {
+        "keyword": (5, 4),
+        "regex": (4, 2),
+        "scorer": (2, 0),
+        "judge": (0, 0),
+    }
+
+
+def test_cascade_config_without_stages_excludes_everything():
+    evaluator = CascadeConfig().build()
+
+    assert isinstance(evaluator, KeywordRelevanceEvaluator)
+    assert evaluator.evaluate("https://example.com/a").decision == "exclude"
+
+
+def test_http_judge_sends_each_batch_in_one_request():
+    bodies = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        urls = json.loads(request.content)["urls"]
+        bodies.append(urls)
+        return httpx.Response(
+            200,
+            json={
+                "results": [
+                    {"score": 0.9, "decision": "include", "reason": "on-topic"} for _ in urls
+                ]
+            },
+        )
+
+    with httpx.Client(transport=httpx.MockTransport(handler)) as client:
+        judge = HttpJudgeEvaluator("http://judge.invalid/evaluate", client=client)
+        cascade = CascadeEvaluator(
+            [
+                CascadeStage("keyword", KeywordRelevanceEvaluator(defer_unmatched=True)),
+                CascadeStage("judge", judge),
+            ]
+        )
+        results = cascade.evaluate_batch(["https://example.com/a", "https://example.com/b"])
+
+    assert bodies == [["https://example.com/a", "https://example.com/b"]]
+    assert [result.reason.split(" ")[0] for result in results] == ["judge:on-topic"] * 2
+
+
+def test_keyword_automaton_finds_overlapping_keywords_and_is_shared_per_set():
+    automaton = compile_keywords(["he", "She", "his", "hers"])
+
+    assert automaton.matches("https://example.com/USHERS") == {"he", "she", "hers"}
+    assert automaton.matches("https://example.com/") == set()
+    assert compile_keywords(["hers", "his", "she", "HE"]) is automaton
+
+
+def test_keyword_score_grows_with_distinct_matches():
+    evaluator = KeywordRelevanceEvaluator(include_keywords=["rust", "async", "tokio"])
+
+    scores = [
+        evaluator.evaluate(url).score
+        for url in (
+            "https://a.example/rust",
+            "https://a.example/rust-async",
+            "https://a.example/rust-async-tokio-rust",
+        )
+    ]
+
+    assert scores == pytest.approx([0.9, 0.95, 1 - 0.1 / 3])
+
+
+class _FlakySummarizer(Summarizer):
+    """Answers 429 then 503 for URLs containing "flaky" and 400 for "bad"."""
+
+    def __init__(self) -> None:
+        self.calls: list[str] = []
+        self._lock = threading.Lock()
+        self.active = 0
+        self.max_active = 0
+
+    def summarize(self, url: str) -> str:
+        with self._lock:
+            self.calls.append(url)
+            attempt = self.calls.count(url)
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        try:
+            time.sleep(0.01)
+            if "bad" in url:
+                raise SummarizerError("bad request", status_code=400)
+            if "flaky" in url and attempt == 1:
+                raise SummarizerError("slow down", status_code=429, retry_after_seconds=7)
+            if "flaky" in url and attempt == 2:
+                raise SummarizerError("unavailable", status_code=503)
+            return f"summary of {url}"
+        finally:
+            with self._lock:
+                self.active -= 1
+
+
+def test_summary_runner_retries_throttled_calls_with_bounded_concurrency():
+    summarizer = _FlakySummarizer()
+    sleeps: list[float] = []
+    runner = SummaryRunner(
+        summarizer,
+        SummaryLimits(max_concurrency=3, base_delay=2.0, jitter=0.0),
+        sleep=sleeps.append,
+    )
+    urls = [f"https://example.com/{index}" for index in range(8)]
+    urls += ["https://example.com/flaky", "https://example.com/bad"]
+
+    results = runner.summarize_all(urls)
+
+    assert results[:9] == [f"summary of {url}" for url in urls[:9]]
+    assert isinstance(results[9], SummarizerError)
+    assert summarizer.calls.count("https://example.com/flaky") == 3
+    assert summarizer.calls.count("https://example.com/bad") == 1
+    # Retry-After first, then exponential backoff for the second attempt.
+    assert sorted(sleeps) == [4.0, 7.0]
+    assert 1 < summarizer.max_active <= 3
+    assert (runner.stats.calls, runner.stats.retries, runner.stats.failures) == (12, 2, 1)
+    assert runner.stats.latency.count == 12
+
+
+def test_summary_runner_spaces_calls_to_requests_per_minute():
+    sleeps: list[float] = []
+    runner = SummaryRunner(
+        SimpleSummarizer(),
+        SummaryLimits(max_concurrency=1, requests_per_minute=30),
+        sleep=sleeps.append,
+        clock=lambda: 0.0,
+    )
+
+    runner.summarize_all(["https://example.com/a", "https://example.com/b", "https://example.com/c"])
+
+    assert sleeps == [2.0, 4.0]
+
+
+def test_summary_runners_sharing_buckets_share_rate_limit():
+    sleeps: list[float] = []
+    limits = SummaryLimits(max_concurrency=1, requests_per_minute=30)
+    buckets = SummaryBuckets.from_limits(limits, clock=lambda: 0.0)
+
+    for url in ("https://example.com/a", "https://example.com/b"):
+        runner = SummaryRunner(
+            SimpleSummarizer(), limits, buckets=buckets, sleep=sleeps.append, clock=lambda: 0.0
+        )
+        runner.summarize_all([url])
+
+    # The second run waits behind the first instead of starting a fresh burst.
+    assert sleeps == [2.0]
+
+
+def test_evaluate_since_never_resends_summarized_items_and_keeps_successes(repositories):
+    repos = repositories
+    urls = [
+        "https://example.com/important-a",
+        "https://example.com/important-b",
+        "https://example.com/important-bad",
+    ]
+    group = _group_with_items(repos, urls)
+    summarized = next(
+        item for item in repos.items.list_all() if item.canonical_url.endswith("/important-a")
+    )
+    repos.summaries.add(ItemSummary(group_id=group.id, item_id=summarized.id, summary_md="cached"))
+    summarizer = _FlakySummarizer()
+    service = EvaluationService(
+        repos.items,
+        repos.group_items,
+        repos.evaluations,
+        repos.summaries,
+        KeywordRelevanceEvaluator(include_keywords=["important"]),
+        summarizer,
+    )
+
+    with pytest.raises(SummarizerError):
+        service.evaluate_since(group.id, SINCE)
+
+    assert sorted(summarizer.calls) == [
+        "https://example.com/important-b",
+        "https://example.com/important-bad",
+    ]
+    assert sorted(summary.summary_md for summary in repos.summaries.list_by_group(group.id)) == [
+        "cached",
+        "summary of https://example.com/important-b",
+    ]
+
+
+class _CountingSummarizer(SimpleSummarizer):
+    def __init__(self) -> None:
+        super().__init__()
+        self.calls: list[str] = []
+
+    def summarize(self, url: str) -> str:
+        self.calls.append(url)
+        return super().summarize(url)
+
+
+def test_summary_cache_is_shared_across_groups_per_summarizer_version(repositories):
+    repos = repositories
+    urls = ["https://example.com/important-a", "https://example.com/b"]
+    first = _group_with_items(repos, urls)
+    second = repos.groups.add(Group(user_id=first.user_id, name="Other"))
+    third = repos.groups.add(Group(user_id=first.user_id, name="Third"))
+    for group in (second, third):
+        MaterializeService(repos.items, repos.group_items).materialize(
+            group.id, [FeedItem(guid_hash=b"", url=urls[0], canonical_url_hash=b"")]
+        )
+
+    def service(summarizer):
+        return EvaluationService(
+            repos.items,
+            repos.group_items,
+            repos.evaluations,
+            repos.summaries,
+            KeywordRelevanceEvaluator(include_keywords=["important"]),
+            summarizer,
+            summary_cache=repos.summary_cache,
+        )
+
+    summarizer = _CountingSummarizer()
+    first_service = service(summarizer)
+    first_result = first_service.evaluate_since(first.id, SINCE)
+    second_service = service(summarizer)
+    second_result = second_service.evaluate_since(second.id, SINCE)
+    upgraded = _CountingSummarizer()
+    upgraded.version = "3"
+    service(upgraded).evaluate_since(third.id, SINCE)
+
+    assert summarizer.calls == ["https://example.com/important-a"]
+    assert [summary.summary_md for summary in second_result.summaries] == [
+        summary.summary_md for summary in first_result.summaries
+    ]
+    assert first_service.summary_stats.cache_hits == 0
+    assert second_service.summary_stats.cache_hits == 1
+    assert upgraded.calls == ["https://example.com/important-a"]
+
+
+def test_evaluate_since_keeps_results_of_a_concurrent_run(repositories):
+    repos = repositories
+    urls = ["https://example.com/important-a", "https://example.com/important-b"]
+    group = _group_with_items(repos, urls)
+    service = EvaluationService(
+        repos.items,
+        repos.group_items,
+        repos.evaluations,
+        repos.summaries,
+        KeywordRelevanceEvaluator(include_keywords=["important"]),
+        SimpleSummarizer(),
+    )
+    candidates = repos.items.list_unevaluated(group.id, SINCE)
+    # Another run evaluates the first item after this run loaded its candidates.
+    repos.items.list_unevaluated = lambda group_id, since: candidates
+    repos.evaluations.add_many(
+        [
+            ItemEvaluation(
+                group_id=group.id,
+                item_id=candidates[0].id,
+                relevance_score=0.0,
+                decision="exclude",
+                reason="other_run",
+            )
+        ]
+    )
+
+    result = service.evaluate_since(group.id, SINCE)
+
+    assert [evaluation.item_id for evaluation in result.evaluations] == [candidates[1].id]
+    assert [summary.item_id for summary in result.summaries] == [candidates[1].id]
+    assert sorted(e.reason for e in repos.evaluations.list_by_group(group.id)) == [
+        "keyword",
+        "other_run",
+    ]
+    assert len(repos.summaries.list_by_group(group.id)) == 1
+
+
+def test_budget_takes_best_candidates_first_and_postpones_the_rest(repositories):
+    repos = repositories
+    urls = [f"https://example.com/{name}" for name in ("a", "hot-b", "c", "hot-d", "e")]
+    group = _group_with_items(repos, urls[:1])
+    for url in urls[1:]:
+        # One materialization per item so that recency orders them.
+        MaterializeService(repos.items, repos.group_items).materialize(
+            group.id, [FeedItem(guid_hash=b"", url=url, canonical_url_hash=b"")]
+        )
+
+    def service(budget):
+        return EvaluationService(
+            repos.items,
+            repos.group_items,
+            repos.evaluations,
+            repos.summaries,
+            KeywordRelevanceEvaluator(include_keywords=["hot"]),
+            SimpleSummarizer(),
+            budget=budget,
+            prescorer=KeywordRelevanceEvaluator(include_keywords=["hot"]),
+        )
+
+    result = service(EvaluationBudget(max_items=3)).evaluate_since(group.id, SINCE)
+
+    decisions = {
+        repos.items.get(evaluation.item_id).canonical_url.rsplit("/", 1)[1]: evaluation.reason
+        for evaluation in result.evaluations
+    }
+    # Both pre-scored items, then the most recent of the rest.
+    assert decisions == {
+        "hot-b": "keyword",
+        "hot-d": "keyword",
+        "e": "no_keyword",
+        "a": "budget:max_items",
+        "c": "budget:max_items",
+    }
+    assert sorted(
+        evaluation.decision
+        for evaluation in result.evaluations
+        if evaluation.reason.startswith("budget:")
+    ) == ["postponed", "postponed"]
+    assert (result.budget.items, result.budget.overflow, result.budget.exhausted) == (
+        3,
+        2,
+        "max_items",
+    )
+
+    later = datetime(2100, 1, 1, tzinfo=timezone.utc)
+    again = service(EvaluationBudget()).evaluate_since(group.id, later)
+
+    assert sorted(evaluation.reason for evaluation in again.evaluations) == [
+        "no_keyword",
+        "no_keyword",
+    ]
+    assert sorted(e.decision for e in repos.evaluations.list_by_group(group.id)) == [
+        "exclude",
+        "exclude",
+        "exclude",
+        "include",
+        "include",
+    ]
+
+
+def test_top_level_defer_is_stored_as_exclude_and_not_retried(repositories):
+    repos = repositories
+    group = _group_with_items(repos, ["https://example.com/a", "https://example.com/b"])
+    service = EvaluationService(
+        repos.items,
+        repos.group_items,
+        repos.evaluations,
+        repos.summaries,
+        KeywordRelevanceEvaluator(defer_unmatched=True),
+        SimpleSummarizer(),
+        budget=EvaluationBudget(max_items=1),
+    )
+
+    first = service.evaluate_since(group.id, SINCE)
+    later = datetime(2100, 1, 1, tzinfo=timezone.utc)
+    second = service.evaluate_since(group.id, later)
+
+    assert sorted((e.decision, e.reason) for e in first.evaluations) == [
+        ("exclude", "undecided:no_keyword"),
+        ("postponed", "budget:max_items"),
+    ]
+    # Only the postponed item comes back; the undecided one stays excluded.
+    assert [(e.decision, e.reason) for e in second.evaluations] == [
+        ("exclude", "undecided:no_keyword"),
+    ]
+    assert service.evaluate_since(group.id, later).evaluations == []
+
+
+def test_token_budget_postpones_included_items_it_cannot_summarize(repositories):
+    repos = repositories
+    urls = ["https://example.com/hot-a", "https://example.com/hot-b", "https://example.com/c"]
+    group = _group_with_items(repos, urls)
+    summarizer = _CountingSummarizer()
+    service = EvaluationService(
+        repos.items,
+        repos.group_items,
+        repos.evaluations,
+        repos.summaries,
+        KeywordRelevanceEvaluator(include_keywords=["hot"]),
+        summarizer,
+        budget=EvaluationBudget(
+            max_tokens=1400, tokens_per_evaluation=100, tokens_per_summary=1000
+        ),
+    )
+
+    result = service.evaluate_since(group.id, SINCE)
+
+    assert len(summarizer.calls) == 1
+    assert len(result.summaries) == 1
+    assert sorted((e.decision, e.reason) for e in result.evaluations) == [
+        ("exclude", "no_keyword"),
+        ("include", "keyword"),
+        ("postponed", "budget:max_tokens"),
+    ]
+    assert (result.budget.items, result.budget.summaries, result.budget.tokens) == (3, 1, 1300)
+
+
+def test_evaluator_and_summarizer_read_prefetched_article_text(repositories):
+    repos = repositories
+    pages = {
+        "https://example.com/a": (
+            "<article><p>Rust 2.0 ships async closures and a new edition.</p>"
+            "<p>The second paragraph goes into the details.</p></article>"
+        ),
+        "https://example.com/b": "<article><p>Gardening tips for the coming spring.</p></article>",
+    }
+    group = _group_with_items(repos, list(pages))
+
+    async def fetch(url, etag, last_modified, max_bytes):
+        return ArticleResponse(status_code=200, html=pages[url])
+
+    content = ArticleContentService(repos.article_contents, fetch)
+    service = EvaluationService(
+        repos.items,
+        repos.group_items,
+        repos.evaluations,
+        repos.summaries,
+        KeywordRelevanceEvaluator(include_keywords=["rust"], content=content),
+        SimpleSummarizer(content),
+        content=content,
+    )
+
+    result = service.evaluate_since(group.id, SINCE)
+
+    decisions = {
+        repos.items.get(evaluation.item_id).canonical_url: evaluation.decision
+        for evaluation in result.evaluations
+    }
+    assert decisions == {"https://example.com/a": "include", "https://example.com/b": "exclude"}
+    assert [summary.summary_md for summary in result.summaries] == [
+        "Rust 2.0 ships async closures and a new edition."
+    ]
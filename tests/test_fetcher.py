@@ -0,0 +1,316 @@
+import asyncio
+import hashlib
+from datetime import datetime, timedelta, timezone
+
+from rss_digest.bloom import KnownHashes, guid_key
+from rss_digest.db.models import FeedItem, FeedSource
+from rss_digest.services.rss.coordinator import FetchCoordinator, FetchTickStats
+from rss_digest.services.rss.fetcher import FeedEntry, FeedFetchResult, RssFetcher
+from rss_digest.services.rss.health import HostCircuitBreaker
+from rss_digest.services.rss.polling import PollingPolicy
+
+
+def test_fetch_group_async_caps_per_host_concurrency(repositories):
+    repos = repositories
+    sources = [
+        repos.feed_sources.add(FeedSource(url=f"https://{host}.example.com/rss/{index}"))
+        for host in ("a", "b")
+        for index in range(6)
+    ]
+    not_modified = sources[0]
+    in_flight: dict[str, int] = {}
+    peak: dict[str, int] = {}
+
+    async def fetch_func(source: FeedSource) -> FeedFetchResult:
+        host = source.url.split("/")[2]
+        in_flight[host] = in_flight.get(host, 0) + 1
+        peak[host] = max(peak.get(host, 0), in_flight[host])
+        await asyncio.sleep(0.01)
+        in_flight[host] -= 1
+        if source.id == not_modified.id:
+            return FeedFetchResult(status_code=304)
+        return FeedFetchResult(
+            status_code=200,
+            etag=f"etag-{source.id}",
+            entries=[
+                FeedEntry(
+                    guid=f"{source.url}#1",
+                    url=f"{source.url}/story",
+                    published_at=datetime(2024, 1, 1, tzinfo=timezone.utc),
+                )
+            ],
+        )
+
+    fetcher = RssFetcher(
+        repos.feed_sources,
+        repos.feed_items,
+        fetch_func=lambda source: FeedFetchResult(status_code=304),
+        async_fetch_func=fetch_func,
+        per_host_limit=2,
+    )
+    new_items = fetcher.fetch_group(sources)
+
+    assert len(new_items) == len(sources) - 1
+    assert peak == {"a.example.com": 2, "b.example.com": 2}
+    assert repos.feed_sources.get(sources[1].id).etag == f"etag-{sources[1].id}"
+    assert repos.feed_sources.get(not_modified.id).last_fetch_at is not None
+
+
+def test_fetch_inserts_only_unknown_guids_in_bulk(repositories):
+    repos = repositories
+    source = repos.feed_sources.add(FeedSource(url="https://example.com/rss"))
+    batches = [
+        ["guid-1", "guid-2", "guid-2"],
+        ["guid-3", "guid-2", "guid-1"],
+    ]
+
+    def fetch_func(feed_source: FeedSource) -> FeedFetchResult:
+        guids = batches.pop(0)
+        return FeedFetchResult(
+            status_code=200,
+            entries=[
+                FeedEntry(guid=guid, url=f"https://example.com/{guid}") for guid in guids
+            ],
+        )
+
+    fetcher = RssFetcher(repos.feed_sources, repos.feed_items, fetch_func)
+    first = fetcher.fetch(source)
+    second = fetcher.fetch(source)
+
+    assert [item.url for item in first] == [
+        "https://example.com/guid-1",
+        "https://example.com/guid-2",
+    ]
+    assert [item.url for item in second] == ["https://example.com/guid-3"]
+    assert len(repos.feed_items.list_by_feed(source.id)) == 3
+
+    racing_duplicate = FeedItem(
+        feed_source_id=source.id,
+        guid_hash=first[0].guid_hash,
+        url=first[0].url,
+        canonical_url_hash=first[0].canonical_url_hash,
+    )
+    assert repos.feed_items.add_many([racing_duplicate]) == []
+
+
+def test_fetch_coordinator_fetches_shared_feed_once_and_fans_out(repositories):
+    repos = repositories
+    source = repos.feed_sources.add(FeedSource(url="https://example.com/rss"))
+    calls: list[FeedSource] = []
+
+    def fetch_func(feed_source: FeedSource) -> FeedFetchResult:
+        calls.append(feed_source)
+        return FeedFetchResult(
+            status_code=200,
+            entries=[FeedEntry(guid="guid-1", url="https://example.com/a")],
+        )
+
+    fetcher = RssFetcher(repos.feed_sources, repos.feed_items, fetch_func)
+    coordinator = FetchCoordinator(fetcher, repos.feed_sources, repos.feed_items)
+    since = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+    first_group_items = coordinator.fetch_group([source], since)
+    second_group_items = coordinator.fetch_group([source], since)
+
+    assert len(calls) == 1
+    assert [item.url for item in first_group_items] == ["https://example.com/a"]
+    assert [item.url for item in second_group_items] == ["https://example.com/a"]
+    assert coordinator.reset_stats() == FetchTickStats(hits=1, misses=1)
+
+
+def test_fetch_coordinator_counts_skipped_feeds_apart_from_fresh_hits(repositories):
+    repos = repositories
+    now = datetime(2024, 1, 1, 12, tzinfo=timezone.utc)
+    resting = repos.feed_sources.add(
+        FeedSource(url="https://example.com/resting", next_fetch_after=now + timedelta(hours=1))
+    )
+    racing = repos.feed_sources.add(FeedSource(url="https://example.com/racing"))
+    # Another run claims the feed after this one loaded it.
+    repos.feed_sources.claim_fetch(racing.id, claimed_at=now, stale_before=now)
+    fetcher = RssFetcher(repos.feed_sources, repos.feed_items, lambda source: None)
+    coordinator = FetchCoordinator(fetcher, repos.feed_sources, repos.feed_items)
+
+    assert coordinator.refresh([resting, racing], now) == 0
+    assert coordinator.reset_stats() == FetchTickStats(not_due=1, claimed_elsewhere=1)
+
+
+def test_fetch_group_learns_poll_interval_and_skips_feeds_not_due(repositories):
+    repos = repositories
+    busy = repos.feed_sources.add(FeedSource(url="https://example.com/busy"))
+    quiet = repos.feed_sources.add(FeedSource(url="https://example.com/quiet"))
+    published = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    calls: list[str] = []
+
+    def fetch_func(feed_source: FeedSource) -> FeedFetchResult:
+        calls.append(feed_source.url)
+        if feed_source.id == quiet.id:
+            return FeedFetchResult(status_code=304, refresh_hint_seconds=7200)
+        return FeedFetchResult(
+            status_code=200,
+            entries=[
+                FeedEntry(
+                    guid=f"guid-{minute}",
+                    url=f"https://example.com/{minute}",
+                    published_at=published.replace(minute=minute),
+                )
+                for minute in (0, 20, 40)
+            ],
+        )
+
+    policy = PollingPolicy(
+        min_interval=timedelta(minutes=10),
+        default_interval=timedelta(hours=1),
+        max_interval=timedelta(hours=6),
+    )
+    fetcher = RssFetcher(repos.feed_sources, repos.feed_items, fetch_func, polling=policy)
+    fetcher.fetch_group([busy, quiet])
+
+    # Busy: halfway between the 1h default and the 20 min publishing cadence.
+    assert repos.feed_sources.get(busy.id).poll_interval_seconds == 2400
+    # Quiet: backs off by 1.5x, floored by the 2h server hint.
+    assert repos.feed_sources.get(quiet.id).poll_interval_seconds == 7200
+
+    fetcher.fetch_group([busy, quiet])
+    assert len(calls) == 2
+    assert fetcher.stats.skipped_not_due == 2
+
+
+def test_failing_host_opens_breaker_and_failed_feeds_back_off(repositories):
+    repos = repositories
+    down = [
+        repos.feed_sources.add(FeedSource(url=f"https://down.example.com/{index}"))
+        for index in range(5)
+    ]
+    up = repos.feed_sources.add(FeedSource(url="https://up.example.com/rss"))
+    calls: list[str] = []
+
+    def fetch_func(feed_source: FeedSource) -> FeedFetchResult:
+        calls.append(feed_source.url)
+        if "down" in feed_source.url:
+            raise ConnectionError("unreachable")
+        return FeedFetchResult(status_code=304)
+
+    fetcher = RssFetcher(
+        repos.feed_sources,
+        repos.feed_items,
+        fetch_func,
+        host_breaker=HostCircuitBreaker(failure_threshold=3),
+    )
+    assert fetcher.fetch_group([*down, up]) == []
+
+    # Hosts are interleaved, so the healthy host is not queued behind the failing one.
+    assert calls == [down[0].url, up.url, down[1].url, down[2].url]
+    assert fetcher.stats.failures == 3
+    assert fetcher.stats.skipped_host_open == 2
+    failed = repos.feed_sources.get(down[0].id)
+    assert failed.health_status == "degraded"
+    assert failed.next_fetch_after is not None
+
+    fetcher.fetch_group(down[:3])
+    assert len(calls) == 4
+    assert fetcher.stats.skipped_backoff == 3
+    assert fetcher.stats.estimated_seconds_saved() > 0
+
+
+def test_host_breaker_lets_one_probe_through_after_cooldown():
+    breaker = HostCircuitBreaker(failure_threshold=2, cooldown=timedelta(minutes=10))
+    now = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    for _ in range(2):
+        breaker.record_failure("example.com", now)
+    assert not breaker.allow("example.com", now)
+
+    now += timedelta(minutes=10)
+    assert breaker.allow("example.com", now)
+    assert not breaker.allow("example.com", now)
+    assert breaker.open_hosts(now) == ["example.com"]
+
+    breaker.record_failure("example.com", now)
+    assert not breaker.allow("example.com", now + timedelta(minutes=5))
+
+    now += timedelta(minutes=10)
+    assert breaker.allow("example.com", now)
+    breaker.record_success("example.com")
+    assert breaker.allow("example.com", now)
+    assert breaker.allow("example.com", now)
+    assert breaker.open_hosts(now) == []
+
+
+def test_fetch_stops_early_on_known_guids_once_feed_is_newest_first(repositories):
+    repos = repositories
+    source = repos.feed_sources.add(FeedSource(url="https://example.com/archive"))
+    latest = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    guids = [f"guid-{index}" for index in range(100)]
+    backdated: dict[str, datetime] = {}
+    pulled: list[str] = []
+
+    def entries():
+        for index, guid in enumerate(guids):
+            pulled.append(guid)
+            yield FeedEntry(
+                guid=guid,
+                url=f"https://example.com/{guid}",
+                published_at=backdated.get(guid, latest - timedelta(hours=index)),
+            )
+
+    def fetch_func(feed_source: FeedSource) -> FeedFetchResult:
+        return FeedFetchResult(status_code=200, entries=entries())
+
+    fetcher = RssFetcher(
+        repos.feed_sources, repos.feed_items, fetch_func, known_run=3, early_stop_batch=5
+    )
+    assert len(fetcher.fetch(source)) == 100
+    assert len(pulled) == 100
+    source = repos.feed_sources.get(source.id)
+    assert source.entries_newest_first is True
+
+    guids.insert(0, "guid-new")
+    pulled.clear()
+    assert [item.url for item in fetcher.fetch(source)] == ["https://example.com/guid-new"]
+    assert len(pulled) == 5
+    assert fetcher.stats.early_stops == 1
+
+    # An out-of-order entry in a partial read does not decide the feed's order.
+    guids.insert(0, "guid-backdated")
+    backdated["guid-backdated"] = latest - timedelta(days=30)
+    fetcher.fetch(repos.feed_sources.get(source.id))
+    assert fetcher.stats.early_stops == 2
+    assert repos.feed_sources.get(source.id).entries_newest_first is True
+
+
+def test_early_stop_counts_guids_another_worker_stored_as_known(repositories):
+    repos = repositories
+    source = repos.feed_sources.add(
+        FeedSource(url="https://example.com/archive", entries_newest_first=True)
+    )
+    guids = [f"guid-{index}" for index in range(50)]
+    pulled: list[str] = []
+
+    def entries():
+        for guid in guids:
+            pulled.append(guid)
+            yield FeedEntry(guid=guid, url=f"https://example.com/{guid}")
+
+    def fetch_func(feed_source: FeedSource) -> FeedFetchResult:
+        return FeedFetchResult(status_code=200, entries=entries())
+
+    other_worker = RssFetcher(repos.feed_sources, repos.feed_items, fetch_func)
+    other_worker.fetch(source)
+    # Warmed before the other worker stored anything, so every GUID misses.
+    known = KnownHashes.with_capacity(1000)
+    fetcher = RssFetcher(
+        repos.feed_sources,
+        repos.feed_items,
+        fetch_func,
+        known_hashes=known,
+        known_run=3,
+        early_stop_batch=5,
+    )
+    guids.insert(0, "guid-new")
+    pulled.clear()
+
+    source = repos.feed_sources.get(source.id)
+    assert [item.url for item in fetcher.fetch(source)] == ["https://example.com/guid-new"]
+    assert len(pulled) == 5
+    assert fetcher.stats.early_stops == 1
+    # The conflicting GUIDs are learned, so later fetches skip them outright.
+    assert known.guids.check(guid_key(source.id, hashlib.sha256(b"guid-1").digest()))
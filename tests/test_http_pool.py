@@ -0,0 +1,75 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from rss_digest.db.models import FeedSource
+from rss_digest.services.rss.fetcher import RssFetcher
+from rss_digest.services.rss.http_client import fetch_feed
+from rss_digest.services.rss.http_pool import HttpClientPool, HttpPoolConfig, close_pool, configure_pool
+
+RSS_BODY = (
+    b'<?xml version="1.0"?><rss version="2.0"><channel><title>t</title>'
+    b"<item><guid>guid-1</guid><link>https://example.com/a</link></item>"
+    b"</channel></rss>"
+)
+
+
+class _OkHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self) -> None:  # noqa: N802 - http.server API
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(RSS_BODY)))
+        self.end_headers()
+        self.wfile.write(RSS_BODY)
+
+    def log_message(self, format: str, *args) -> None:  # noqa: A002
+        return
+
+
+def test_pool_reuses_keepalive_connections_across_sync_and_async_runs():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _OkHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}/feed"
+    pool = HttpClientPool()
+
+    async def fetch() -> int:
+        response = await pool.async_client.get(url)
+        return response.status_code
+
+    try:
+        for _ in range(3):
+            assert pool.client.get(url).status_code == 200
+        for _ in range(3):
+            assert pool.run(fetch()) == 200
+    finally:
+        pool.close()
+        server.shutdown()
+        server.server_close()
+
+    assert pool.stats.requests == 6
+    assert pool.stats.connections_opened == 2
+    assert pool.stats.connections_reused == 4
+
+
+def test_unchanged_body_without_validators_is_an_effective_304(repositories):
+    repos = repositories
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _OkHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    source = repos.feed_sources.add(
+        FeedSource(url=f"http://127.0.0.1:{server.server_address[1]}/feed")
+    )
+    configure_pool(HttpPoolConfig())
+    try:
+        first = fetch_feed(source)
+        RssFetcher(repos.feed_sources, repos.feed_items, fetch_feed).fetch(source)
+        second = fetch_feed(repos.feed_sources.get(source.id))
+    finally:
+        close_pool()
+        server.shutdown()
+        server.server_close()
+
+    assert first.status_code == 200
+    assert [entry.guid for entry in first.entries] == ["guid-1"]
+    assert second.status_code == 304
+    assert second.entries == []
+    assert second.body_sha256 == first.body_sha256
@@ -0,0 +1,152 @@
+import threading
+import time
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from rss_digest.db.models import FeedSource
+from rss_digest.services.rss.http_client import fetch_feed, fetch_feed_async
+from rss_digest.services.rss.http_pool import HttpPoolConfig, close_pool, configure_pool, get_pool
+from rss_digest.services.rss.lite_parser import LiteParseError, parse_lite
+
+RSS = b"""<?xml version="1.0"?>
+<rss version="2.0" xmlns:sy="http://purl.org/rss/1.0/modules/syndication/">
+  <channel>
+    <title>News</title><link>https://example.com/</link><ttl>30</ttl>
+    <sy:updatePeriod>hourly</sy:updatePeriod>
+    <item>
+      <title>A</title><guid isPermaLink="false">guid-a</guid>
+      <link>https://example.com/a</link>
+      <pubDate>Mon, 01 Jan 2024 09:30:00 +0900</pubDate>
+    </item>
+    <item><link>https://example.com/b</link></item>
+  </channel>
+</rss>"""
+
+ATOM = b"""<?xml version="1.0" encoding="utf-8"?>
+<feed xmlns="http://www.w3.org/2005/Atom">
+  <id>urn:feed</id><link href="https://example.com/"/>
+  <entry>
+    <id>urn:entry:1</id>
+    <link rel="enclosure" href="https://example.com/a.mp3"/>
+    <link href="https://example.com/a"/>
+    <source>
+      <id>urn:feed:origin</id><link href="https://origin.example.com/"/>
+      <updated>2023-12-31T00:00:00Z</updated>
+    </source>
+    <updated>2024-01-01T00:30:00Z</updated>
+  </entry>
+</feed>"""
+
+RDF = b"""<?xml version="1.0"?>
+<rdf:RDF xmlns:rdf="http://www.w3.org/1999/02/22-rdf-syntax-ns#"
+         xmlns="http://purl.org/rss/1.0/" xmlns:dc="http://purl.org/dc/elements/1.1/">
+  <channel rdf:about="https://example.com/"><title>News</title></channel>
+  <item rdf:about="https://example.com/a">
+    <link>https://example.com/a</link><dc:date>2024-01-01T00:30:00+00:00</dc:date>
+  </item>
+</rdf:RDF>"""
+
+HALF_PAST_MIDNIGHT = datetime(2024, 1, 1, 0, 30, tzinfo=timezone.utc)
+
+
+@pytest.mark.parametrize(
+    ("body", "expected"),
+    [
+        (RSS, [("guid-a", "https://example.com/a"), ("https://example.com/b", "https://example.com/b")]),
+        (ATOM, [("urn:entry:1", "https://example.com/a")]),
+        (RDF, [("https://example.com/a", "https://example.com/a")]),
+    ],
+)
+def test_parse_lite_extracts_entry_fields(body, expected):
+    feed = parse_lite(body)
+
+    assert [(entry.guid, entry.url) for entry in feed.entries] == expected
+    assert feed.entries[0].published_at == HALF_PAST_MIDNIGHT
+
+
+def test_parse_lite_caps_entries_and_rejects_malformed_xml():
+    feed = parse_lite(RSS, max_entries=1)
+
+    assert len(feed.entries) == 1
+    assert feed.meta.truncated is True
+    assert (feed.meta.ttl, feed.meta.update_period) == ("30", "hourly")
+    with pytest.raises(LiteParseError):
+        parse_lite(b"<rss><channel><item></channel></rss>")
+
+
+class _FeedHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    chunks: list[bytes] = []
+    sent: list[int] = []
+
+    def do_GET(self) -> None:  # noqa: N802 - http.server API
+        self.send_response(200)
+        self.send_header("Content-Type", "application/rss+xml")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        try:
+            for chunk in self.chunks:
+                self.wfile.write(b"%x\r\n%s\r\n" % (len(chunk), chunk))
+                self.sent.append(len(chunk))
+            self.wfile.write(b"0\r\n\r\n")
+        except (BrokenPipeError, ConnectionResetError):
+            self.close_connection = True
+
+    def log_message(self, format: str, *args) -> None:  # noqa: A002
+        return
+
+
+@pytest.fixture()
+def feed_server(monkeypatch):
+    monkeypatch.setenv("RSS_FEED_PARSER", "lite")
+    _FeedHandler.sent = []
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _FeedHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    configure_pool(HttpPoolConfig())
+    try:
+        yield FeedSource(url=f"http://127.0.0.1:{server.server_address[1]}/rss")
+    finally:
+        close_pool()
+        server.shutdown()
+        server.server_close()
+
+
+def _items(count: int) -> bytes:
+    return b"".join(
+        b"<item><guid>%d</guid><description>%s</description></item>" % (n, b"x" * 200)
+        for n in range(count)
+    )
+
+
+@pytest.mark.parametrize("use_async", [False, True])
+def test_lite_stream_reads_late_meta_and_finishes_with_feedparser(feed_server, use_async):
+    # Channel meta after the entries, and a malformed last entry.
+    _FeedHandler.chunks = [
+        b"<rss><channel>" + _items(300),
+        b"<item><guid>last</guid><link>https://example.com/&nbsp;</link></item>"
+        b"<ttl>60</ttl></channel></rss>",
+    ]
+    if use_async:
+        result = get_pool().run(fetch_feed_async(feed_server))
+    else:
+        result = fetch_feed(feed_server)
+    guids = [entry.guid for entry in result.entries]
+
+    assert guids == [str(n) for n in range(300)] + ["last"]
+    assert result.refresh_hint_seconds == 3600
+    assert result.body_sha256 is not None
+
+
+def test_lite_stream_stops_downloading_at_max_bytes(feed_server, monkeypatch):
+    monkeypatch.setenv("RSS_FEED_MAX_BYTES", str(256 * 1024))
+    chunk = _items(300)
+    _FeedHandler.chunks = [b"<rss><channel>"] + [chunk] * 2000
+
+    entries = list(fetch_feed(feed_server).entries)
+
+    assert 0 < len(entries) < 2000
+    # The rest of the ~130 MB body is never sent: the response is closed.
+    time.sleep(0.2)
+    assert sum(_FeedHandler.sent) < 32 * 1024 * 1024
@@ -0,0 +1,102 @@
+from datetime import datetime, timezone
+from uuid import UUID
+
+from rss_digest.db.models import FeedItem, FeedSource, Group, GroupFeed, User
+from rss_digest.repository import items as items_module
+from rss_digest.services.materialize.service import MaterializeService
+from rss_digest.services.rss.coordinator import FetchCoordinator
+from rss_digest.services.rss.fetcher import FeedEntry, FeedFetchResult, RssFetcher
+
+
+def test_materialize_batch_dedups_urls_and_is_idempotent_per_group(repositories):
+    repos = repositories
+    user = repos.users.add(User(email="user@example.com", timezone="UTC"))
+    first = repos.groups.add(Group(user_id=user.id, name="First"))
+    second = repos.groups.add(Group(user_id=user.id, name="Second"))
+    source = repos.feed_sources.add(FeedSource(url="https://example.com/rss"))
+    feed_items = [
+        FeedItem(feed_source_id=source.id, guid_hash=b"", url=url, canonical_url_hash=b"")
+        for url in (
+            "https://example.com/a",
+            "https://Example.com/a/?utm_source=rss",
+            "https://example.com/b",
+        )
+    ]
+    service = MaterializeService(repos.items, repos.group_items)
+
+    created = service.materialize(first.id, feed_items)
+    shared = service.materialize(second.id, feed_items)
+    repeated = service.materialize(first.id, feed_items)
+
+    assert len(created.item_ids) == 2 and len(created.group_item_ids) == 2
+    assert shared.item_ids == [] and len(shared.group_item_ids) == 2
+    assert repeated.item_ids == [] and repeated.group_item_ids == []
+    assert (created.group_ids, repeated.group_ids) == ({first.id}, set())
+    assert sorted(item.canonical_url for item in repos.items.list_all()) == [
+        "https://example.com/a",
+        "https://example.com/b",
+    ]
+    assert len(repos.group_items.list_all()) == 4
+
+
+def test_fetch_fans_out_to_enabled_subscribers_and_groups_only_catch_up(repositories):
+    repos = repositories
+    user = repos.users.add(User(email="user@example.com", timezone="UTC"))
+    first, second, disabled, unsubscribed = (
+        repos.groups.add(Group(user_id=user.id, name=name, is_enabled=enabled))
+        for name, enabled in (("A", True), ("B", True), ("C", False), ("D", True))
+    )
+    source = repos.feed_sources.add(FeedSource(url="https://example.com/rss"))
+    for group in (first, second, disabled):
+        repos.group_feeds.add(GroupFeed(group_id=group.id, feed_source_id=source.id))
+    repos.group_feeds.add(
+        GroupFeed(group_id=unsubscribed.id, feed_source_id=source.id, enabled=False)
+    )
+
+    def fetch_func(feed_source: FeedSource) -> FeedFetchResult:
+        return FeedFetchResult(
+            status_code=200,
+            entries=[
+                FeedEntry(guid="guid-1", url="https://example.com/a"),
+                FeedEntry(guid="guid-2", url="https://example.com/a?utm_source=rss"),
+                FeedEntry(guid="guid-3", url="https://example.com/b"),
+            ],
+        )
+
+    materializer = MaterializeService(
+        repos.items, repos.group_items, group_feeds=repos.group_feeds
+    )
+    coordinator = FetchCoordinator(
+        RssFetcher(repos.feed_sources, repos.feed_items, fetch_func),
+        repos.feed_sources,
+        repos.feed_items,
+        materializer=materializer,
+    )
+    since = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+    assert coordinator.fetch_group([source], since, group_id=first.id) == []
+    assert len(repos.items.list_all()) == 2
+    assert [
+        len(repos.group_items.list_by_group(group.id))
+        for group in (first, second, disabled, unsubscribed)
+    ] == [2, 2, 0, 0]
+    # Groups that were not subscribed at fetch time get what they are missing.
+    missing = coordinator.fetch_group([source], since, group_id=unsubscribed.id)
+    assert sorted(item.url for item in missing) == [
+        "https://example.com/a",
+        "https://example.com/a?utm_source=rss",
+        "https://example.com/b",
+    ]
+
+
+def test_bulk_insert_keeps_ids_that_look_like_numbers(repositories, monkeypatch):
+    # All digits and one "e": numeric affinity would store this as a REAL.
+    numeric_looking = UUID("12345678901234e67890123456789012")
+    monkeypatch.setattr(items_module, "uuid4", lambda: numeric_looking)
+
+    inserted = repositories.items.add_new(
+        {b"h" * 32: "https://example.com/a"}, datetime(2024, 1, 1, tzinfo=timezone.utc)
+    )
+
+    assert inserted == {b"h" * 32: numeric_looking}
+    assert repositories.items.get(numeric_looking).canonical_url == "https://example.com/a"
@@ -1,12 +1,13 @@
 from datetime import datetime, timezone
 from pathlib import Path
 
-from rss_digest.db.models import FeedSource, Group, GroupDestination, GroupFeed, User
+from rss_digest.db.models import FeedItem, FeedSource, Group, GroupDestination, GroupFeed, User
 from rss_digest.services.digest.delivery import DeliveryService
 from rss_digest.services.digest.builder import DigestBuilder
+from rss_digest.services.evaluation.budget import EvaluationBudget
 from rss_digest.services.evaluation.service import EvaluationService
 from rss_digest.services.materialize.service import MaterializeService
-from rss_digest.services.pipeline.service import GroupPipeline
+from rss_digest.services.pipeline.service import GroupPipeline, determine_since
 from rss_digest.services.evaluation.relevance import KeywordRelevanceEvaluator
 from rss_digest.services.rss.fetcher import FeedEntry, FeedFetchResult, RssFetcher
 from rss_digest.services.digest.storage import StorageService
@@ -65,3 +66,123 @@ def test_group_pipeline_runs_and_persists_digest(tmp_path, repositories):
     path = Path(result.digest.storage_path)
     assert path.exists()
     assert str(path).startswith(str(tmp_path))
+
+
+def test_scheduled_run_reports_background_evaluations_once_and_evaluates_stragglers(
+    tmp_path, repositories
+):
+    repos = repositories
+    user = repos.users.add(User(email="user@example.com", timezone="UTC"))
+    group = repos.groups.add(Group(user_id=user.id, name="Tech"))
+    feed_source = repos.feed_sources.add(FeedSource(url="https://example.com/rss"))
+    repos.group_feeds.add(GroupFeed(group_id=group.id, feed_source_id=feed_source.id))
+    entries: list[FeedEntry] = []
+
+    def fetch_func(source: FeedSource) -> FeedFetchResult:
+        return FeedFetchResult(status_code=200, entries=list(entries))
+
+    queued: list[set] = []
+    materializer = MaterializeService(
+        repos.items, repos.group_items, group_feeds=repos.group_feeds, on_linked=queued.append
+    )
+    summarized: list[str] = []
+
+    class _Summarizer(SimpleSummarizer):
+        def summarize(self, url: str) -> str:
+            summarized.append(url)
+            return super().summarize(url)
+
+    evaluator = EvaluationService(
+        repos.items,
+        repos.group_items,
+        repos.evaluations,
+        repos.summaries,
+        KeywordRelevanceEvaluator(include_keywords=["important"]),
+        _Summarizer(),
+    )
+    pipeline = GroupPipeline(
+        repos,
+        RssFetcher(repos.feed_sources, repos.feed_items, fetch_func),
+        materializer,
+        evaluator,
+        DigestBuilder(),
+        StorageService(tmp_path),
+        DeliveryService(repos.deliveries),
+    )
+    now = datetime.now(timezone.utc)
+
+    # Fanned out by a fetch before the run and evaluated by the background task.
+    materializer.fan_out(
+        [
+            FeedItem(
+                feed_source_id=feed_source.id,
+                guid_hash=b"",
+                url="https://example.com/important-a",
+                canonical_url_hash=b"",
+            )
+        ]
+    )
+    evaluator.evaluate_since(group.id, determine_since(group, now))
+    # Only found by the run itself.
+    entries.append(FeedEntry(guid="b", url="https://example.com/important-b"))
+
+    first = pipeline.run(group.id, now)
+    second = pipeline.run(group.id, datetime.now(timezone.utc))
+
+    # The run's own catch-up materialization queues no background work.
+    assert queued == [{group.id}]
+    assert summarized == ["https://example.com/important-a", "https://example.com/important-b"]
+    assert "Summary for https://example.com/important-a" in first.digest.markdown_body
+    assert "Summary for https://example.com/important-b" in first.digest.markdown_body
+    assert "important" not in second.digest.markdown_body
+    assert all(e.reported_at is not None for e in repos.evaluations.list_by_group(group.id))
+
+
+def test_item_postponed_by_budget_is_reported_by_the_run_that_evaluates_it(
+    tmp_path, repositories
+):
+    repos = repositories
+    user = repos.users.add(User(email="user@example.com", timezone="UTC"))
+    group = repos.groups.add(Group(user_id=user.id, name="Tech"))
+    feed_source = repos.feed_sources.add(FeedSource(url="https://example.com/rss"))
+    repos.group_feeds.add(GroupFeed(group_id=group.id, feed_source_id=feed_source.id))
+    urls = ["https://example.com/important-a", "https://example.com/important-b"]
+
+    def fetch_func(source: FeedSource) -> FeedFetchResult:
+        return FeedFetchResult(
+            status_code=200, entries=[FeedEntry(guid=url, url=url) for url in urls]
+        )
+
+    pipeline = GroupPipeline(
+        repos,
+        RssFetcher(repos.feed_sources, repos.feed_items, fetch_func),
+        MaterializeService(repos.items, repos.group_items),
+        EvaluationService(
+            repos.items,
+            repos.group_items,
+            repos.evaluations,
+            repos.summaries,
+            KeywordRelevanceEvaluator(include_keywords=["important"]),
+            SimpleSummarizer(),
+            budget=EvaluationBudget(max_items=1),
+        ),
+        DigestBuilder(),
+        StorageService(tmp_path),
+        DeliveryService(repos.deliveries),
+    )
+
+    first = pipeline.run(group.id, datetime.now(timezone.utc))
+    postponed = [
+        e for e in repos.evaluations.list_by_group(group.id) if e.decision == "postponed"
+    ]
+    second = pipeline.run(group.id, datetime.now(timezone.utc))
+
+    assert len(postponed) == 1 and postponed[0].reported_at is None
+    reported = [
+        [url for url in urls if f"Summary for {url}" in run.digest.markdown_body]
+        for run in (first, second)
+    ]
+    assert sorted(reported) == [[urls[0]], [urls[1]]]
+    evaluations = repos.evaluations.list_by_group(group.id)
+    assert sorted(e.decision for e in evaluations) == ["include", "include"]
+    assert all(e.reported_at is not None for e in evaluations)
@@ -0,0 +1,150 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from rss_digest.db.models import FeedSource
+from rss_digest.ratelimit import TokenBucket
+from rss_digest.services.rss.fetcher import RssFetcher
+from rss_digest.services.rss.http_client import fetch_feed
+from rss_digest.services.rss.http_pool import HttpPoolConfig, close_pool, configure_pool
+from rss_digest.services.rss.politeness import PolitenessConfig, configure_host_scheduler
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_token_bucket_spaces_reservations_after_burst_and_pauses():
+    clock = _Clock()
+    bucket = TokenBucket(rate=2.0, capacity=2, clock=clock)
+
+    assert [bucket.reserve() for _ in range(4)] == [0.0, 0.0, 0.5, 1.0]
+    assert bucket.reserve(max_wait=1.0) is None
+
+    clock.now = 10.0
+    bucket.pause(30)
+    assert bucket.reserve(max_wait=60) == 30.5
+
+
+def test_rate_limited_feed_is_deferred_not_failed(repositories):
+    repos = repositories
+    requests: list[str] = []
+
+    class _TooManyHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self) -> None:  # noqa: N802 - http.server API
+            requests.append(self.path)
+            self.send_response(429)
+            self.send_header("Retry-After", "120")
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+
+        def log_message(self, format: str, *args) -> None:  # noqa: A002
+            return
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _TooManyHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+    first = repos.feed_sources.add(FeedSource(url=f"{base}/a"))
+    second = repos.feed_sources.add(FeedSource(url=f"{base}/b"))
+    configure_pool(HttpPoolConfig())
+    configure_host_scheduler(PolitenessConfig(max_wait=30))
+    fetcher = RssFetcher(repos.feed_sources, repos.feed_items, fetch_feed)
+    try:
+        assert fetcher.fetch_group([first, second]) == []
+    finally:
+        configure_host_scheduler(PolitenessConfig())
+        close_pool()
+        server.shutdown()
+        server.server_close()
+
+    # The Retry-After pause holds the second feed back without a request.
+    assert requests == ["/a"]
+    assert fetcher.stats.deferred == 2
+    assert fetcher.stats.failures == 0
+    deferred = repos.feed_sources.get(first.id)
+    assert deferred.consecutive_failures == 0
+    assert deferred.health_status == "healthy"
+    assert (deferred.next_fetch_after - deferred.last_fetch_at).total_seconds() == 120
+
+
+def test_dead_feeds_fail_alone_without_opening_host_breaker(repositories):
+    repos = repositories
+    requests: list[str] = []
+
+    class _GoneHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self) -> None:  # noqa: N802 - http.server API
+            requests.append(self.path)
+            self.send_response(410 if self.path.startswith("/gone") else 304)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+
+        def log_message(self, format: str, *args) -> None:  # noqa: A002
+            return
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _GoneHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+    gone = [repos.feed_sources.add(FeedSource(url=f"{base}/gone/{index}")) for index in range(3)]
+    alive = repos.feed_sources.add(FeedSource(url=f"{base}/alive"))
+    configure_pool(HttpPoolConfig())
+    configure_host_scheduler(PolitenessConfig(rate=100, burst=10))
+    fetcher = RssFetcher(repos.feed_sources, repos.feed_items, fetch_feed, max_concurrency=1)
+    try:
+        assert fetcher.fetch_group([*gone, alive]) == []
+    finally:
+        configure_host_scheduler(PolitenessConfig())
+        close_pool()
+        server.shutdown()
+        server.server_close()
+
+    # 4xx is the feed's problem: the host stays open for its other feeds.
+    assert sorted(requests) == ["/alive", "/gone/0", "/gone/1", "/gone/2"]
+    assert fetcher.stats.failures == 3
+    assert fetcher.stats.skipped_host_open == 0
+    assert repos.feed_sources.get(gone[0].id).health_status == "degraded"
+    assert repos.feed_sources.get(alive.id).health_status == "healthy"
+
+
+def test_moved_feed_fails_instead_of_reading_as_empty(repositories):
+    repos = repositories
+
+    class _MovedHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self) -> None:  # noqa: N802 - http.server API
+            body = b"<html>Moved</html>"
+            self.send_response(301)
+            self.send_header("Location", "/new")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format: str, *args) -> None:  # noqa: A002
+            return
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _MovedHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    moved = repos.feed_sources.add(
+        FeedSource(url=f"http://127.0.0.1:{server.server_address[1]}/old")
+    )
+    configure_pool(HttpPoolConfig())
+    fetcher = RssFetcher(repos.feed_sources, repos.feed_items, fetch_feed)
+    try:
+        assert fetcher.fetch_group([moved]) == []
+    finally:
+        close_pool()
+        server.shutdown()
+        server.server_close()
+
+    assert fetcher.stats.failures == 1
+    stored = repos.feed_sources.get(moved.id)
+    assert stored.health_status == "degraded"
+    assert stored.consecutive_failures == 1
+    assert stored.body_sha256 is None
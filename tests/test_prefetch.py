@@ -0,0 +1,55 @@
+from datetime import datetime, timedelta, timezone
+
+from rss_digest.db.models import FeedSource, Group, GroupFeed, GroupSchedule, User
+from rss_digest.services.prefetch.service import FeedPrefetcher, PrefetchResult
+from rss_digest.services.rss.coordinator import FetchCoordinator
+from rss_digest.services.rss.fetcher import FeedEntry, FeedFetchResult, RssFetcher
+from rss_digest.services.scheduler.service import SchedulerService
+
+
+def test_prefetcher_fetches_feeds_for_upcoming_schedules_and_due_feeds(repositories):
+    repos = repositories
+    now = datetime.now(timezone.utc).replace(second=0, microsecond=0)
+    fires_at = now + timedelta(minutes=3)
+    user = repos.users.add(User(email="user@example.com", timezone="UTC"))
+    group = repos.groups.add(Group(user_id=user.id, name="Morning"))
+    repos.schedules.add(
+        GroupSchedule(group_id=group.id, time_hhmm=fires_at.strftime("%H:%M"))
+    )
+    # Becomes due just before the run, so it is pulled forward.
+    scheduled = repos.feed_sources.add(
+        FeedSource(
+            url="https://example.com/scheduled",
+            last_fetch_at=now - timedelta(hours=1),
+            next_fetch_after=now + timedelta(minutes=2),
+        )
+    )
+    polled = repos.feed_sources.add(FeedSource(url="https://example.com/polled"))
+    unsubscribed = repos.feed_sources.add(FeedSource(url="https://example.com/orphan"))
+    other = repos.groups.add(Group(user_id=user.id, name="Unscheduled"))
+    repos.group_feeds.add(GroupFeed(group_id=group.id, feed_source_id=scheduled.id))
+    repos.group_feeds.add(GroupFeed(group_id=other.id, feed_source_id=polled.id))
+    calls: list[str] = []
+
+    def fetch_func(feed_source: FeedSource) -> FeedFetchResult:
+        calls.append(feed_source.url)
+        return FeedFetchResult(
+            status_code=200,
+            entries=[FeedEntry(guid=feed_source.url, url=f"{feed_source.url}/1")],
+        )
+
+    fetcher = RssFetcher(repos.feed_sources, repos.feed_items, fetch_func)
+    coordinator = FetchCoordinator(fetcher, repos.feed_sources, repos.feed_items)
+    scheduler = SchedulerService(repos.schedules, repos.groups, repos.users)
+    prefetcher = FeedPrefetcher(coordinator, repos.feed_sources, scheduler)
+
+    assert prefetcher.run(now) == PrefetchResult(
+        upcoming_schedules=1, fetched_for_schedules=1, fetched_due=1
+    )
+    assert calls == [scheduled.url, polled.url]
+    assert unsubscribed.url not in calls
+
+    # At the scheduled minute the pipeline finds everything fresh.
+    items = coordinator.fetch_group([scheduled], since=now - timedelta(hours=1), now=fires_at)
+    assert [item.url for item in items] == ["https://example.com/scheduled/1"]
+    assert len(calls) == 2
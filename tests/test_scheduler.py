@@ -1,6 +1,7 @@
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 
 from rss_digest.db.models import Group, GroupSchedule, User
+from rss_digest.services.scheduler import tasks
 from rss_digest.services.scheduler.service import SchedulerService
 
 
@@ -20,3 +21,45 @@ def test_scheduler_ticks_due_schedule_and_prevents_double_fire(repositories):
 
     due_again = service.tick(now)
     assert due_again == []
+
+
+def test_scheduler_lists_upcoming_schedules_without_firing(repositories):
+    repos = repositories
+    user = repos.users.add(User(email="user@example.com", timezone="Asia/Tokyo"))
+    group = repos.groups.add(Group(user_id=user.id, name="Morning"))
+    repos.schedules.add(GroupSchedule(group_id=group.id, time_hhmm="07:00"))
+
+    service = SchedulerService(repos.schedules, repos.groups, repos.users)
+    now = datetime(2024, 1, 1, 21, 57, tzinfo=timezone.utc)
+
+    upcoming = service.upcoming(now, timedelta(minutes=5))
+    assert [due.scheduled_at for due in upcoming] == [
+        datetime(2024, 1, 1, 22, 0, tzinfo=timezone.utc)
+    ]
+    assert service.upcoming(now, timedelta(minutes=2)) == []
+    assert service.tick(now) == []
+
+
+def test_background_evaluation_is_queued_once_per_group_until_it_starts(
+    repositories, monkeypatch
+):
+    repos = repositories
+    user = repos.users.add(User(email="user@example.com", timezone="UTC"))
+    group = repos.groups.add(Group(user_id=user.id, name="Daily"))
+    queued: list[tuple] = []
+    monkeypatch.setattr(
+        tasks.evaluate_new_items,
+        "apply_async",
+        lambda args, countdown: queued.append((args, countdown)),
+    )
+
+    tasks._enqueue_evaluations(repos.groups, {group.id})
+    tasks._enqueue_evaluations(repos.groups, {group.id})
+    assert queued == [((str(group.id),), tasks.EVALUATION_DELAY_SECONDS_DEFAULT)]
+
+    repos.groups.release_evaluation(group.id)
+    tasks._enqueue_evaluations(repos.groups, {group.id})
+    assert len(queued) == 2
+
+    stale = datetime.now(timezone.utc) + timedelta(hours=1)
+    assert repos.groups.claim_evaluation(group.id, claimed_at=stale, stale_before=stale)